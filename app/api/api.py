@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 
-from app.api.endpoints.accounting import account, categories, income_sources, locations, transactions
+from app.api.endpoints.accounting import (account, bootstrap, categories, income_sources, locations, reports,
+                                          transactions)
 from app.api.endpoints.user import auth
 from app.schemas.error_response import responses
 
@@ -13,6 +14,8 @@ accounting_router.include_router(categories.router, prefix='/categories', tags=[
 accounting_router.include_router(income_sources.router, prefix='/income_sources', tags=['Income Sources'])
 accounting_router.include_router(locations.router, prefix='/locations', tags=['Locations'])
 accounting_router.include_router(transactions.router, prefix='/transactions', tags=['Transactions'])
+accounting_router.include_router(reports.router, prefix='/reports', tags=['Reports'])
+accounting_router.include_router(bootstrap.router, prefix='/bootstrap', tags=['Bootstrap'])
 
 api_router.include_router(accounting_router)
 
@@ -1,12 +1,13 @@
+from datetime import date
 from uuid import UUID
 
-from fastapi import Depends, Header
+from fastapi import Depends, Header, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
 
 from app.configs.logging_settings import get_logger
 from app.db.postgres import session_maker
-from app.exceptions.unauthorized_401 import SessionExpiredException
-from app.models.user.session import Session as SessionModel
+from app.services.user import change_version_service, session_service
 
 logger = get_logger(__name__)
 
@@ -31,13 +32,29 @@ async def get_db_transaction() -> AsyncSession:
         await session.close()
 
 
-async def get_user_id(x_auth_token: UUID = Header(...),
-                      db: AsyncSession = Depends(get_db), session_crud=None) -> UUID:
-    session_db: SessionModel | None = await session_crud.get_active_session(db=db, session_id=x_auth_token)
-    if session_db is None:
-        raise SessionExpiredException(token=x_auth_token, logger=logger)
+async def get_user_id(x_auth_token: UUID = Header(...), db: AsyncSession = Depends(get_db)) -> UUID:
+    user_id: UUID = await session_service.get_user_id(db=db, token=x_auth_token)
+    return user_id
 
-    return session_db.user_id
+
+async def check_etag(request: Request,
+                     response: Response,
+                     if_none_match: str | None = Header(None),
+                     user_id: UUID = Depends(get_user_id),
+                     db: AsyncSession = Depends(get_db)) -> None:
+    """
+    Answers 304 before the endpoint runs its queries when the client has the response
+    for the current change version of the user data. Otherwise sets the ETag of the response.
+    """
+    version: int = await change_version_service.get_version(db=db, user_id=user_id)
+    # filters default to dates relative to today
+    key: str = f'{request.url.path}?{sorted(request.query_params.multi_items())}@{date.today()}'
+    etag: str = change_version_service.build_etag(user_id=user_id, version=version, key=key)
+
+    if change_version_service.etag_matches(etag=etag, if_none_match=if_none_match):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+    response.headers['ETag'] = etag
 
 
 def get_token(x_auth_token: UUID = Header(...)) -> UUID:
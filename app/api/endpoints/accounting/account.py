@@ -3,11 +3,13 @@ from uuid import UUID
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_db_transaction, get_user_id
+from app.api.deps import check_etag, get_db, get_db_transaction, get_user_id
+from app.api.routes import ModelRoute
 from app.schemas.accounting.account import Account, AccountCreateRequest, AccountUpdate
-from app.services.accounting import account_service
+from app.schemas.accounting.account_ledger import BalanceHistoryRequest, BalancePoint, BalanceRequest
+from app.services.accounting import account_service, ledger_service
 
-router = APIRouter()
+router = APIRouter(route_class=ModelRoute)
 
 
 @router.post('')
@@ -18,14 +20,14 @@ async def create_account(create_data: AccountCreateRequest,
     return account
 
 
-@router.get('')
+@router.get('', dependencies=[Depends(check_etag)])
 async def get_accounts(user_id: UUID = Depends(get_user_id),
                        db: AsyncSession = Depends(get_db)) -> list[Account]:
     accounts: list[Account] = await account_service.get_accounts(db=db, user_id=user_id)
     return accounts
 
 
-@router.get('/{account_id}')
+@router.get('/{account_id}', dependencies=[Depends(check_etag)])
 async def get_account(account_id: UUID,
                       user_id: UUID = Depends(get_user_id),
                       db: AsyncSession = Depends(get_db)) -> Account:
@@ -33,6 +35,37 @@ async def get_account(account_id: UUID,
     return account
 
 
+@router.get('/{account_id}/balance', dependencies=[Depends(check_etag)])
+async def get_account_balance(account_id: UUID,
+                              request: BalanceRequest = Depends(),
+                              user_id: UUID = Depends(get_user_id),
+                              db: AsyncSession = Depends(get_db)) -> BalancePoint:
+    """
+    Account balance at the end of the day by transaction dates, read from the ledger
+    """
+    balance: BalancePoint = await ledger_service.get_balance(db=db,
+                                                             user_id=user_id,
+                                                             account_id=account_id,
+                                                             on_date=request.on_date)
+    return balance
+
+
+@router.get('/{account_id}/balance_history', dependencies=[Depends(check_etag)])
+async def get_account_balance_history(account_id: UUID,
+                                      request: BalanceHistoryRequest = Depends(),
+                                      user_id: UUID = Depends(get_user_id),
+                                      db: AsyncSession = Depends(get_db)) -> list[BalancePoint]:
+    """
+    Account balance at the end of every day of the dates range
+    """
+    history: list[BalancePoint] = await ledger_service.get_balance_history(db=db,
+                                                                           user_id=user_id,
+                                                                           account_id=account_id,
+                                                                           date_from=request.date_from,
+                                                                           date_to=request.date_to)
+    return history
+
+
 @router.put('/{account_id}')
 async def update_account(account_id: UUID,
                          update_data: AccountUpdate,
@@ -0,0 +1,31 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from app.api.deps import check_etag, get_db, get_user_id
+from app.api.routes import ModelRoute
+from app.schemas.accounting.bootstrap import Bootstrap
+from app.services.accounting import bootstrap_service
+
+router = APIRouter(route_class=ModelRoute)
+
+
+@router.get('',
+            response_model=Bootstrap,
+            responses={status.HTTP_304_NOT_MODIFIED: {'description': 'Not changed'}},
+            dependencies=[Depends(check_etag)])
+async def get_bootstrap(content_hash: str | None = Query(None, description='Hash of the payload the client has'),
+                        user_id: UUID = Depends(get_user_id),
+                        db: AsyncSession = Depends(get_db)) -> Bootstrap | Response:
+    """
+    Accounts, categories, locations and income sources in one payload.
+    Unchanged user data is answered with 304 by the ETag check before any query runs.
+    A matching `content_hash` only saves the body, the payload is still read to compute it.
+    """
+    bootstrap: Bootstrap = await bootstrap_service.get_bootstrap(db=db, user_id=user_id)
+    if bootstrap.content_hash == content_hash:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED)
+
+    return bootstrap
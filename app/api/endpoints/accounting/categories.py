@@ -4,11 +4,12 @@ from fastapi import APIRouter, Depends
 from fastapi_pagination import Page
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_db_transaction, get_user_id
+from app.api.deps import check_etag, get_db, get_db_transaction, get_user_id
+from app.api.routes import ModelRoute
 from app.schemas.accounting.category import Category, CategoryCreateRequest, CategoryRequest, CategoryUpdate
 from app.services.accounting import category_service
 
-router = APIRouter()
+router = APIRouter(route_class=ModelRoute)
 
 
 @router.post('')
@@ -21,7 +22,7 @@ async def create_category(create_data: CategoryCreateRequest,
     return category
 
 
-@router.get('')
+@router.get('', dependencies=[Depends(check_etag)])
 async def get_categories(request: CategoryRequest = Depends(),
                          user_id: UUID = Depends(get_user_id),
                          db: AsyncSession = Depends(get_db)) -> Page[Category]:
@@ -31,7 +32,7 @@ async def get_categories(request: CategoryRequest = Depends(),
     return categories
 
 
-@router.get('/{category_id}')
+@router.get('/{category_id}', dependencies=[Depends(check_etag)])
 async def get_category_by_id(category_id: UUID,
                              user_id: UUID = Depends(get_user_id),
                              db: AsyncSession = Depends(get_db)) -> Category:
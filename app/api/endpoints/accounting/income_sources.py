@@ -4,12 +4,13 @@ from fastapi import APIRouter, Depends
 from fastapi_pagination import Page
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_db_transaction, get_user_id
+from app.api.deps import check_etag, get_db, get_db_transaction, get_user_id
+from app.api.routes import ModelRoute
 from app.schemas.accounting.income_source import (IncomeSource, IncomeSourceCreateRequest, IncomeSourceRequest,
                                                   IncomeSourceUpdate)
 from app.services.accounting import income_service
 
-router = APIRouter()
+router = APIRouter(route_class=ModelRoute)
 
 
 @router.post('')
@@ -22,7 +23,7 @@ async def create_income_source(create_data: IncomeSourceCreateRequest,
     return income_source
 
 
-@router.get('')
+@router.get('', dependencies=[Depends(check_etag)])
 async def get_income_sources(request: IncomeSourceRequest = Depends(),
                              user_id: UUID = Depends(get_user_id),
                              db: AsyncSession = Depends(get_db)) -> Page[IncomeSource]:
@@ -32,7 +33,7 @@ async def get_income_sources(request: IncomeSourceRequest = Depends(),
     return income_sources
 
 
-@router.get('/{income_source_id}')
+@router.get('/{income_source_id}', dependencies=[Depends(check_etag)])
 async def get_income_source(income_source_id: UUID,
                             user_id: UUID = Depends(get_user_id),
                             db: AsyncSession = Depends(get_db)) -> IncomeSource:
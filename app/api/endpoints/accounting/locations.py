@@ -4,11 +4,12 @@ from fastapi import APIRouter, Depends
 from fastapi_pagination import Page
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_db_transaction, get_user_id
+from app.api.deps import check_etag, get_db, get_db_transaction, get_user_id
+from app.api.routes import ModelRoute
 from app.schemas.accounting.location import Location, LocationCreateRequest, LocationRequest, LocationUpdate
 from app.services.accounting import location_service
 
-router = APIRouter()
+router = APIRouter(route_class=ModelRoute)
 
 
 @router.post('')
@@ -19,7 +20,7 @@ async def create_location(create_data: LocationCreateRequest,
     return location
 
 
-@router.get('')
+@router.get('', dependencies=[Depends(check_etag)])
 async def get_locations(request: LocationRequest = Depends(),
                         user_id: UUID = Depends(get_user_id),
                         db: AsyncSession = Depends(get_db)) -> Page[Location]:
@@ -27,7 +28,7 @@ async def get_locations(request: LocationRequest = Depends(),
     return locations
 
 
-@router.get('/{location_id}')
+@router.get('/{location_id}', dependencies=[Depends(check_etag)])
 async def get_location_by_id(location_id: UUID,
                              user_id: UUID = Depends(get_user_id),
                              db: AsyncSession = Depends(get_db)) -> Location:
@@ -0,0 +1,50 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import check_etag, get_db, get_user_id
+from app.api.routes import ModelRoute
+from app.schemas.accounting.report import (CategoryExpenses, ExpenseReportRequest, MonthExpenses, NetWorthPoint,
+                                           NetWorthRequest)
+from app.services.accounting import report_service
+
+router = APIRouter(route_class=ModelRoute)
+
+
+@router.get('/expenses/by_category', dependencies=[Depends(check_etag)])
+async def get_expenses_by_category(request: ExpenseReportRequest = Depends(),
+                                   user_id: UUID = Depends(get_user_id),
+                                   db: AsyncSession = Depends(get_db)) -> list[CategoryExpenses]:
+    """
+    Active expenses for the months range grouped by category, the biggest first
+    """
+    expenses: list[CategoryExpenses] = await report_service.get_expenses_by_category(db=db,
+                                                                                     request=request,
+                                                                                     user_id=user_id)
+    return expenses
+
+
+@router.get('/expenses/by_month', dependencies=[Depends(check_etag)])
+async def get_expenses_by_month(request: ExpenseReportRequest = Depends(),
+                                user_id: UUID = Depends(get_user_id),
+                                db: AsyncSession = Depends(get_db)) -> list[MonthExpenses]:
+    """
+    Active expenses for the months range grouped by month
+    """
+    expenses: list[MonthExpenses] = await report_service.get_expenses_by_month(db=db,
+                                                                               request=request,
+                                                                               user_id=user_id)
+    return expenses
+
+
+@router.get('/net_worth', dependencies=[Depends(check_etag)])
+async def get_net_worth(request: NetWorthRequest = Depends(),
+                        user_id: UUID = Depends(get_user_id),
+                        db: AsyncSession = Depends(get_db)) -> list[NetWorthPoint]:
+    """
+    Running total of incomes minus expenses in the base currency at the end of every day or month
+    of the dates range. Account balances before the first transaction and exchange rate changes are not included.
+    """
+    net_worth: list[NetWorthPoint] = await report_service.get_net_worth(db=db, request=request, user_id=user_id)
+    return net_worth
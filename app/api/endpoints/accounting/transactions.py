@@ -1,20 +1,27 @@
+from typing import AsyncIterator
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import StreamingResponse
 from fastapi_pagination import Page
+from fastapi_pagination.cursor import CursorPage
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_db_transaction, get_user_id
-from app.schemas.accounting.transaction import (Transaction, TransactionCreateRequest, TransactionRequest,
+from app.api.deps import check_etag, get_db, get_db_transaction, get_user_id
+from app.api.routes import ModelRoute
+from app.db.postgres import session_maker
+from app.schemas.accounting.transaction import (ExportFormatType, Transaction, TransactionCreateRequest,
+                                                TransactionCursorRequest, TransactionExportRequest, TransactionRequest,
                                                 TransactionType)
 from app.services.accounting import transaction_service
 from app.services.accounting.transaction_processor.base import TransactionProcessor
 
-router = APIRouter()
+router = APIRouter(route_class=ModelRoute)
 
 
 @router.post('')
 async def create_transaction(create_data: TransactionCreateRequest,
+                             idempotency_key: str | None = Header(None, min_length=1, max_length=255),
                              user_id: UUID = Depends(get_user_id),
                              db: AsyncSession = Depends(get_db_transaction)) -> Transaction:
     """
@@ -34,15 +41,33 @@ async def create_transaction(create_data: TransactionCreateRequest,
     `destination_*` refers to the credited amount in **the receiving account**.
     - **Transfers:** `source_*` refers to **the withdrawal from one account**.
     `destination_*` refers to the deposit to **another account**.
+
+    A retry sent with the same `Idempotency-Key` header gets the response of the first request
+    and does not create the transaction again. Reusing a key for another request is rejected with 422.
     """
-    transaction_processor: TransactionProcessor = TransactionProcessor.factory(db=db,
-                                                                               user_id=user_id,
-                                                                               transaction_type=create_data.transaction_type)
-    transaction: Transaction = await transaction_processor.create(data=create_data)
+    transaction: Transaction = await transaction_service.create_transaction(db=db,
+                                                                            create_data=create_data,
+                                                                            user_id=user_id,
+                                                                            idempotency_key=idempotency_key)
     return transaction
 
 
-@router.get('')
+@router.post('/batch')
+async def create_transactions(create_data: list[TransactionCreateRequest],
+                              user_id: UUID = Depends(get_user_id),
+                              db: AsyncSession = Depends(get_db_transaction)) -> list[Transaction]:
+    """
+    Creates many transactions at once, e.g. when importing a bank statement. Fields are the same as in
+    `POST /accounting/transactions`. Incomes are applied first, then transfers, then expenses.
+    Account rates are taken as they were before the batch. If any transaction fails, nothing is created.
+    """
+    transactions: list[Transaction] = await transaction_service.create_transactions(db=db,
+                                                                                    create_data=create_data,
+                                                                                    user_id=user_id)
+    return transactions
+
+
+@router.get('', dependencies=[Depends(check_etag)])
 async def get_transactions(request: TransactionRequest = Depends(),
                            user_id: UUID = Depends(get_user_id),
                            db: AsyncSession = Depends(get_db)) -> Page[Transaction]:
@@ -52,7 +77,42 @@ async def get_transactions(request: TransactionRequest = Depends(),
     return transactions
 
 
-@router.get('/{transaction_id}')
+@router.get('/cursor', dependencies=[Depends(check_etag)])
+async def get_transactions_cursor(request: TransactionCursorRequest = Depends(),
+                                  user_id: UUID = Depends(get_user_id),
+                                  db: AsyncSession = Depends(get_db)) -> CursorPage[Transaction]:
+    """
+    Keyset paginated transactions. Pass `next_page` from the response as `cursor` to get the next page.
+    The total count is calculated only if `include_total` is set.
+    """
+    transactions: CursorPage[Transaction] = await transaction_service.get_transactions_cursor(db=db,
+                                                                                              request=request,
+                                                                                              user_id=user_id)
+    return transactions
+
+
+@router.get('/export')
+async def export_transactions(request: TransactionExportRequest = Depends(),
+                              user_id: UUID = Depends(get_user_id)) -> StreamingResponse:
+    """
+    Streams all transactions matching the filters as NDJSON or CSV.
+    Rows are read with a server-side cursor and sent while the query is still running.
+    """
+    async def content() -> AsyncIterator[str]:
+        # the session has to live as long as the response, so it is not taken from a dependency
+        async with session_maker() as db:
+            async for chunk in transaction_service.export_transactions(db=db, request=request, user_id=user_id):
+                yield chunk
+
+    media_types = {ExportFormatType.NDJSON: 'application/x-ndjson',
+                   ExportFormatType.CSV: 'text/csv'}
+    filename = f'transactions.{request.export_format.value}'
+    return StreamingResponse(content(),
+                             media_type=media_types[request.export_format],
+                             headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+
+
+@router.get('/{transaction_id}', dependencies=[Depends(check_etag)])
 async def get_transaction(transaction_id: UUID,
                           user_id: UUID = Depends(get_user_id),
                           db: AsyncSession = Depends(get_db)) -> Transaction:
@@ -0,0 +1,45 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.configs.logging_settings import get_logger
+from app.configs.settings import settings
+from app.db.query_counter import count_queries, QueryStats
+
+logger = get_logger(__name__)
+
+
+class QueryCounterMiddleware:
+    """
+    Adds the number of SQL statements and the time spent in them to the `Server-Timing` header
+    and logs requests running more statements than `settings.query_count_warning_threshold`
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        with count_queries() as query_stats:
+            async def send_with_stats(message: Message) -> None:
+                if message['type'] == 'http.response.start':
+                    headers = MutableHeaders(scope=message)
+                    headers.append('Server-Timing', f'db;desc="{query_stats.count} queries";'
+                                                    f'dur={query_stats.duration * 1000:.1f}')
+                    self._log_stats(scope=scope, query_stats=query_stats)
+
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
+
+    @staticmethod
+    def _log_stats(scope: Scope, query_stats: QueryStats) -> None:
+        if query_stats.count <= settings.query_count_warning_threshold:
+            return
+
+        repeated: dict[str, int] = query_stats.repeated_statements
+        logger.warning(f'{scope["method"]} {scope["path"]} executed {query_stats.count} queries '
+                       f'in {query_stats.duration * 1000:.1f} ms, {len(repeated)} statements were repeated '
+                       f'{sum(repeated.values())} times')
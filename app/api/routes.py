@@ -0,0 +1,54 @@
+import functools
+import inspect
+from typing import Any, Callable
+
+from fastapi import Response
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+
+_RESPONSE_PARAMETER = 'model_route_response'
+
+
+class ModelRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs):
+        """
+        Route that dumps the endpoint result straight to JSON bytes with a `TypeAdapter` of the response model
+        built once per route. FastAPI would dump the result to a dict, validate it against the response model
+        again and only then encode it, while services already return validated schemas.
+        Status code and headers set by dependencies on the injected `Response` are kept, headers also on responses
+        returned by the endpoint.
+        """
+
+        super().__init__(path, self._wrap_endpoint(endpoint), **kwargs)
+        self.response_adapter: TypeAdapter = TypeAdapter(Any if self.response_model is None else self.response_model)
+
+    def _wrap_endpoint(self, endpoint: Callable[..., Any]) -> Callable[..., Any]:
+        signature: inspect.Signature = inspect.signature(endpoint)
+        # routes of an included router are created again with the wrapped endpoint
+        if _RESPONSE_PARAMETER in signature.parameters:
+            return endpoint
+
+        response_parameter: inspect.Parameter = inspect.Parameter(_RESPONSE_PARAMETER,
+                                                                  inspect.Parameter.KEYWORD_ONLY,
+                                                                  annotation=Response)
+
+        @functools.wraps(endpoint)
+        async def model_endpoint(*args, **kwargs) -> Any:
+            sub_response: Response = kwargs.pop(_RESPONSE_PARAMETER)
+            content: Any = await endpoint(*args, **kwargs)
+            if isinstance(content, Response):
+                # headers set by dependencies, e.g. the ETag of a 304, unless the endpoint set them itself
+                own_headers: set[bytes] = {key for key, _ in content.headers.raw}
+                content.headers.raw.extend(header for header in sub_response.headers.raw
+                                           if header[0] not in own_headers)
+                return content
+
+            response: Response = Response(content=self.response_adapter.dump_json(content),
+                                          status_code=sub_response.status_code or self.status_code or 200,
+                                          media_type='application/json')
+            response.headers.raw.extend(sub_response.headers.raw)
+            return response
+
+        model_endpoint.__signature__ = signature.replace(parameters=[*signature.parameters.values(),
+                                                                     response_parameter])
+        return model_endpoint
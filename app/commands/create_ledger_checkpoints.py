@@ -0,0 +1,23 @@
+"""
+Closes a day of the account ledger with per-account checkpoints. Run once a day after midnight, e.g. from cron:
+
+    python -m app.commands.create_ledger_checkpoints [YYYY-MM-DD]
+"""
+import asyncio
+import sys
+from datetime import date
+
+from app.db.postgres import engine, session_maker
+from app.services.accounting import ledger_service
+
+
+async def main(day: date | None = None) -> None:
+    async with session_maker() as session:
+        await ledger_service.create_checkpoints(db=session, day=day)
+        await session.commit()
+
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main(date.fromisoformat(sys.argv[1]) if len(sys.argv) > 1 else None))
@@ -0,0 +1,30 @@
+"""
+Verifies account balances against active transactions and reports mismatches:
+
+    python -m app.commands.reconcile_balances [--repair]
+"""
+import argparse
+import asyncio
+
+from app.db.postgres import engine, session_maker
+from app.schemas.accounting.account import BalanceMismatch
+from app.services.accounting import reconciliation_service
+
+
+async def main(repair: bool = False) -> list[BalanceMismatch]:
+    async with session_maker() as session:
+        mismatches: list[BalanceMismatch] = await reconciliation_service.reconcile_balances(db=session, repair=repair)
+        await session.commit()
+
+    await engine.dispose()
+    return mismatches
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Reconcile account balances with transactions')
+    parser.add_argument('--repair', action='store_true', help='set expected balances for mismatched accounts')
+    args = parser.parse_args()
+
+    found: list[BalanceMismatch] = asyncio.run(main(repair=args.repair))
+    print(f'{len(found)} mismatched accounts' + (' repaired' if args.repair and len(found) > 0 else ''))
+    raise SystemExit(1 if len(found) > 0 and not args.repair else 0)
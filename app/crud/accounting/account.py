@@ -1,12 +1,16 @@
+from typing import Collection
 from uuid import UUID
 
-from sqlalchemy import Select, select
+from sqlalchemy import case, func, literal, or_, Row, Select, select, Subquery, Table, union_all, Update, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.functions import count
 
 from app.crud.base import CRUDBase
 from app.models.accounting.account import Account
+from app.models.accounting.transaction import ExpenseTransaction, IncomeTransaction, Transaction, TransferTransaction
+from app.models.user.user import User
 from app.schemas.accounting.account import AccountCreate, AccountUpdate
+from app.schemas.base import EntityStatusType
 
 
 class CRUDAccount(CRUDBase[Account, AccountCreate, AccountUpdate]):
@@ -15,5 +19,114 @@ class CRUDAccount(CRUDBase[Account, AccountCreate, AccountUpdate]):
         result: int = (await db.execute(query)).scalar()
         return result
 
+    async def lock_by_ids(self, *, db: AsyncSession, ids: Collection[UUID], user_id: UUID) -> list[Account]:
+        """
+        Locks the accounts with one SELECT ... FOR UPDATE in id order, so requests changing the same accounts
+        queue up instead of deadlocking. Objects already in the session get the values of the locked rows.
+        """
+        query: Select = (select(self.model)
+                         .where(self.model.id.in_(ids))
+                         .where(self.model.user_id == user_id)
+                         .order_by(self.model.id)
+                         .with_for_update()
+                         .execution_options(populate_existing=True))
+        result: list[Account] = (await db.scalars(query)).all()
+        return result
+
+    def _build_expected_balances_query(self) -> Subquery:
+        """
+        Balances of all accounts recomputed from active transactions with one aggregate over the subtype tables.
+        The base currency rate depends on the order of transactions, so only its invariants are checked:
+        a non-empty account in the user base currency has rate 1, a non-empty account in another currency
+        has a rate, a missing one is replaced with the average rate of incoming transactions.
+        """
+        transactions: Table = Transaction.__table__
+        zero = literal(0)
+
+        def movements(subtype: type[Transaction], account_column: str, outgoing: bool) -> Select:
+            subtype_table: Table = subtype.__table__
+            if outgoing:
+                columns = (-transactions.c.source_amount, zero, zero)
+            else:
+                columns = (transactions.c.destination_amount,
+                           transactions.c.destination_amount,
+                           transactions.c.base_currency_amount)
+
+            query: Select = (select(subtype_table.c[account_column].label('account_id'),
+                                    columns[0].label('amount'),
+                                    columns[1].label('incoming_amount'),
+                                    columns[2].label('incoming_base_currency_amount'))
+                             .join(transactions, transactions.c.id == subtype_table.c.id)
+                             .where(transactions.c.status == EntityStatusType.ACTIVE.value))
+            return query
+
+        all_movements: Subquery = union_all(movements(ExpenseTransaction, 'from_account_id', outgoing=True),
+                                            movements(IncomeTransaction, 'to_account_id', outgoing=False),
+                                            movements(TransferTransaction, 'from_account_id', outgoing=True),
+                                            movements(TransferTransaction, 'to_account_id', outgoing=False)).subquery()
+        totals: Subquery = (select(all_movements.c.account_id,
+                                   func.sum(all_movements.c.amount).label('balance'),
+                                   func.sum(all_movements.c.incoming_amount).label('incoming_amount'),
+                                   func.sum(all_movements.c.incoming_base_currency_amount)
+                                   .label('incoming_base_currency_amount'))
+                            .group_by(all_movements.c.account_id)
+                            .subquery())
+
+        expected_balance = func.coalesce(totals.c.balance, 0)
+        average_rate = func.round(totals.c.incoming_amount / func.nullif(totals.c.incoming_base_currency_amount, 0), 4)
+        expected_rate = case((expected_balance == 0, self.model.base_currency_rate),
+                             (self.model.currency == User.base_currency, 1),
+                             (self.model.base_currency_rate != 0, self.model.base_currency_rate),
+                             else_=func.coalesce(average_rate, 0))
+        query: Subquery = (select(self.model.id.label('account_id'),
+                                  self.model.user_id,
+                                  self.model.balance,
+                                  self.model.base_currency_rate,
+                                  expected_balance.label('expected_balance'),
+                                  expected_rate.label('expected_base_currency_rate'))
+                           .join(User, User.id == self.model.user_id)
+                           .outerjoin(totals, totals.c.account_id == self.model.id)
+                           .subquery())
+        return query
+
+    def _build_mismatches_query(self) -> Subquery:
+        expected: Subquery = self._build_expected_balances_query()
+        query: Subquery = (select(expected)
+                           .where(or_(expected.c.balance != expected.c.expected_balance,
+                                      expected.c.base_currency_rate != expected.c.expected_base_currency_rate))
+                           .subquery())
+        return query
+
+    async def get_balance_mismatches(self, db: AsyncSession) -> list[Row]:
+        mismatches: Subquery = self._build_mismatches_query()
+        query: Select = select(mismatches).order_by(mismatches.c.account_id)
+        result: list[Row] = (await db.execute(query)).all()
+        return result
+
+    async def repair_balances(self, db: AsyncSession) -> list[Row]:
+        """
+        Sets expected balances and rates for all mismatched accounts with one UPDATE.
+        The accounts are locked in id order first, as transactions lock them, so the expected balances
+        are computed only after concurrent transactions on them are committed and include their changes.
+        Returns the mismatches as they were before the repair.
+        """
+        lock: Select = (select(self.model.id)
+                        .where(self.model.id.in_(select(self._build_mismatches_query().c.account_id)))
+                        .order_by(self.model.id)
+                        .with_for_update())
+        account_ids: list[UUID] = (await db.scalars(lock)).all()
+        if len(account_ids) == 0:
+            return []
+
+        mismatches: Subquery = self._build_mismatches_query()
+        query: Update = (update(self.model)
+                         .where(self.model.id == mismatches.c.account_id)
+                         .where(self.model.id.in_(account_ids))
+                         .values(balance=mismatches.c.expected_balance,
+                                 base_currency_rate=mismatches.c.expected_base_currency_rate)
+                         .returning(*mismatches.c))
+        result: list[Row] = (await db.execute(query)).all()
+        return result
+
 
 account_crud = CRUDAccount(Account)
@@ -0,0 +1,216 @@
+from datetime import date
+from decimal import Decimal
+from typing import Collection
+from uuid import UUID
+
+from sqlalchemy import (and_, column, ColumnElement, CTE, Date, Exists, func, Integer, Lateral, literal, Numeric, or_,
+                        Row, select, Select, Subquery, true, update, Update, values, Values)
+from sqlalchemy.dialects.postgresql import insert, Insert, UUID as DB_UUID
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.crud.base import CRUDBase
+from app.models.accounting.account import Account
+from app.models.accounting.account_ledger import AccountLedgerEntry
+from app.schemas.accounting.account_ledger import (AccountLedgerCorrectionCreate, AccountLedgerEntryCreate,
+                                                   LedgerEntryType)
+
+
+class CRUDAccountLedger(CRUDBase[AccountLedgerEntry, AccountLedgerEntryCreate, AccountLedgerEntryCreate]):
+    @staticmethod
+    def _build_previous_entry_query(account_id: ColumnElement, entry_date: ColumnElement) -> Lateral:
+        """
+        Last entry of the account up to the date, found with one index lookup
+        """
+        query: Lateral = (select(AccountLedgerEntry.balance, AccountLedgerEntry.base_currency_balance)
+                          .where(AccountLedgerEntry.account_id == account_id)
+                          .where(AccountLedgerEntry.entry_date <= entry_date)
+                          .order_by(AccountLedgerEntry.entry_date.desc(), AccountLedgerEntry.id.desc())
+                          .limit(1)
+                          .lateral())
+        return query
+
+    async def add(self, *, db: AsyncSession, objs_in: list[AccountLedgerEntryCreate]) -> None:
+        """
+        Appends movements at their `entry_date` with one statement. Every movement continues the last entry
+        of its account up to that date, entries of later dates and checkpoints of the same date are shifted
+        by the amounts, so running balances stay in date order when transactions are back-dated.
+        Entries of one account and date get ids in the order of `objs_in`.
+        """
+        if len(objs_in) == 0:
+            return
+
+        new_entries: CTE = (select(values(column('position', Integer()),
+                                          column('user_id', DB_UUID()),
+                                          column('account_id', DB_UUID()),
+                                          column('transaction_id', DB_UUID()),
+                                          column('entry_date', Date()),
+                                          column('amount', Numeric()),
+                                          column('base_currency_amount', Numeric()),
+                                          name='entries')
+                                   .data([(position, obj_in.user_id, obj_in.account_id, obj_in.transaction_id,
+                                           obj_in.entry_date, obj_in.amount, obj_in.base_currency_amount)
+                                          for position, obj_in in enumerate(objs_in)]))
+                            .cte('new_entries'))
+        previous: Lateral = self._build_previous_entry_query(account_id=new_entries.c.account_id,
+                                                             entry_date=new_entries.c.entry_date)
+        running: dict = {'partition_by': new_entries.c.account_id,
+                         'order_by': (new_entries.c.entry_date, new_entries.c.position)}
+        entries: Select = (select(new_entries.c.user_id,
+                                  new_entries.c.account_id,
+                                  new_entries.c.transaction_id,
+                                  literal(LedgerEntryType.MOVEMENT.value),
+                                  new_entries.c.entry_date,
+                                  new_entries.c.amount,
+                                  func.coalesce(previous.c.balance, 0) +
+                                  func.sum(new_entries.c.amount).over(**running),
+                                  func.coalesce(previous.c.base_currency_balance, 0) +
+                                  func.sum(new_entries.c.base_currency_amount).over(**running))
+                           .outerjoin(previous, true())
+                           .order_by(new_entries.c.account_id, new_entries.c.entry_date, new_entries.c.position))
+        inserted: CTE = (insert(self.model)
+                         .from_select(['user_id', 'account_id', 'transaction_id', 'entry_type', 'entry_date', 'amount',
+                                       'balance', 'base_currency_balance'],
+                                      entries)
+                         .cte('inserted'))
+
+        # statements of one WITH see the same snapshot, so the UPDATE shifts only the entries written before
+        shift: Subquery = (select(self.model.id,
+                                  func.sum(new_entries.c.amount).label('amount'),
+                                  func.sum(new_entries.c.base_currency_amount).label('base_currency_amount'))
+                           .join(new_entries,
+                                 and_(new_entries.c.account_id == self.model.account_id,
+                                      or_(new_entries.c.entry_date < self.model.entry_date,
+                                          and_(new_entries.c.entry_date == self.model.entry_date,
+                                               self.model.entry_type == LedgerEntryType.CHECKPOINT))))
+                           .group_by(self.model.id)
+                           .subquery('shift'))
+        query: Update = (update(self.model)
+                         .where(self.model.id == shift.c.id)
+                         .values(balance=self.model.balance + shift.c.amount,
+                                 base_currency_balance=(self.model.base_currency_balance +
+                                                        shift.c.base_currency_amount))
+                         .add_cte(inserted))
+        await db.execute(query)
+
+    async def add_corrections(self, *, db: AsyncSession, objs_in: list[AccountLedgerCorrectionCreate]) -> None:
+        """
+        Writes an entry moving the last balance of the account up to `entry_date` to the corrected one.
+        Accounts whose ledger already has the corrected balance get no entry, later entries are not changed.
+        """
+        if len(objs_in) == 0:
+            return
+
+        corrections: Values = (values(column('user_id', DB_UUID()),
+                                      column('account_id', DB_UUID()),
+                                      column('entry_date', Date()),
+                                      column('balance', Numeric()),
+                                      column('base_currency_balance', Numeric()),
+                                      name='corrections')
+                               .data([(obj_in.user_id, obj_in.account_id, obj_in.entry_date, obj_in.balance,
+                                       obj_in.base_currency_balance)
+                                      for obj_in in objs_in]))
+        previous: Lateral = self._build_previous_entry_query(account_id=corrections.c.account_id,
+                                                             entry_date=corrections.c.entry_date)
+        previous_balance: ColumnElement = func.coalesce(previous.c.balance, 0)
+        previous_base_currency_balance: ColumnElement = func.coalesce(previous.c.base_currency_balance, 0)
+        entries: Select = (select(corrections.c.user_id,
+                                  corrections.c.account_id,
+                                  literal(LedgerEntryType.MOVEMENT.value),
+                                  corrections.c.entry_date,
+                                  corrections.c.balance - previous_balance,
+                                  corrections.c.balance,
+                                  corrections.c.base_currency_balance)
+                           .outerjoin(previous, true())
+                           .where(or_(corrections.c.balance != previous_balance,
+                                      corrections.c.base_currency_balance != previous_base_currency_balance)))
+        query: Insert = insert(self.model).from_select(['user_id', 'account_id', 'entry_type', 'entry_date', 'amount',
+                                                        'balance', 'base_currency_balance'],
+                                                       entries)
+        await db.execute(query)
+
+    async def create_checkpoints(self, *, db: AsyncSession, day: date) -> int:
+        """
+        Writes the closing balance of `day` for every account with movements on that day.
+        Checkpoints already written are kept, so the method can be run again for the same day.
+        """
+        entries: Select = (select(self.model.user_id,
+                                  self.model.account_id,
+                                  literal(LedgerEntryType.CHECKPOINT.value).label('entry_type'),
+                                  literal(day).label('entry_date'),
+                                  literal(Decimal('0')).label('amount'),
+                                  self.model.balance,
+                                  self.model.base_currency_balance)
+                           .distinct(self.model.account_id)
+                           .where(self.model.entry_date == day)
+                           .where(self.model.entry_type == LedgerEntryType.MOVEMENT)
+                           .order_by(self.model.account_id, self.model.id.desc()))
+        query: Insert = (insert(self.model)
+                         .from_select(['user_id', 'account_id', 'entry_type', 'entry_date', 'amount', 'balance',
+                                       'base_currency_balance'],
+                                      entries)
+                         .on_conflict_do_nothing())
+        result: CursorResult = await db.execute(query)
+        return result.rowcount
+
+    async def get_balances(self, *,
+                           db: AsyncSession,
+                           user_id: UUID,
+                           on_date: date,
+                           account_ids: Collection[UUID] | None = None) -> list[Row]:
+        """
+        Balances of the user accounts at the end of `on_date`, found with one index lookup per account.
+        Accounts without entries up to that date have `None` balances.
+        """
+        last_entry = (select(self.model.balance, self.model.base_currency_balance)
+                      .where(self.model.account_id == Account.id)
+                      .where(self.model.entry_date <= on_date)
+                      .order_by(self.model.entry_date.desc(), self.model.id.desc())
+                      .limit(1)
+                      .lateral())
+        query: Select = (select(Account.id.label('account_id'),
+                                last_entry.c.balance,
+                                last_entry.c.base_currency_balance)
+                         .outerjoin(last_entry, true())
+                         .where(Account.user_id == user_id))
+        if account_ids is not None:
+            query = query.where(Account.id.in_(account_ids))
+
+        result: list[Row] = (await db.execute(query)).all()
+        return result
+
+    async def get_daily_balances(self, *,
+                                 db: AsyncSession,
+                                 user_id: UUID,
+                                 date_from: date,
+                                 date_to: date,
+                                 account_ids: Collection[UUID] | None = None) -> list[Row]:
+        """
+        Closing balance per account for every day with entries between `date_from` and `date_to`.
+        Days closed by a checkpoint are read from it, movements are scanned only for days without one.
+        """
+        checkpoint = aliased(self.model)
+        day_checkpoint: Exists = (select(checkpoint.id)
+                                  .where(checkpoint.account_id == self.model.account_id)
+                                  .where(checkpoint.entry_date == self.model.entry_date)
+                                  .where(checkpoint.entry_type == LedgerEntryType.CHECKPOINT)
+                                  .exists())
+        query: Select = (select(self.model.account_id,
+                                self.model.entry_date.label('date'),
+                                self.model.balance,
+                                self.model.base_currency_balance)
+                         .distinct(self.model.account_id, self.model.entry_date)
+                         .where(self.model.user_id == user_id)
+                         .where(self.model.entry_date.between(date_from, date_to))
+                         .where(or_(self.model.entry_type == LedgerEntryType.CHECKPOINT,
+                                    ~day_checkpoint))
+                         .order_by(self.model.account_id, self.model.entry_date, self.model.id.desc()))
+        if account_ids is not None:
+            query = query.where(self.model.account_id.in_(account_ids))
+
+        result: list[Row] = (await db.execute(query)).all()
+        return result
+
+
+account_ledger_crud = CRUDAccountLedger(AccountLedgerEntry)
@@ -0,0 +1,67 @@
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy import func, Row, select, Select
+from sqlalchemy.dialects.postgresql import insert, Insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.accounting.expense_rollup import MonthlyExpenseRollup
+from app.schemas.accounting.report import ExpenseRollupUpdate
+
+
+class CRUDMonthlyExpenseRollup(CRUDBase[MonthlyExpenseRollup, ExpenseRollupUpdate, ExpenseRollupUpdate]):
+    async def add(self, *, db: AsyncSession, objs_in: list[ExpenseRollupUpdate]) -> None:
+        """
+        Adds amounts and counts to the rollup rows, creating missing ones. Keys of `objs_in` should be unique.
+        """
+        if len(objs_in) == 0:
+            return
+
+        query: Insert = insert(self.model).values([obj_in.model_dump() for obj_in in objs_in])
+        query = query.on_conflict_do_update(index_elements=[c.name for c in self.model.__table__.primary_key],
+                                            set_={'amount': self.model.amount + query.excluded.amount,
+                                                  'transactions_count': (self.model.transactions_count +
+                                                                         query.excluded.transactions_count),
+                                                  'updated_at': func.now()})
+        await db.execute(query)
+
+    def _build_report_query(self, *group_by, user_id: UUID, month_from: date, month_to: date) -> Select:
+        query: Select = (select(*group_by,
+                                self.model.currency,
+                                func.sum(self.model.amount).label('amount'),
+                                func.sum(self.model.transactions_count).label('transactions_count'))
+                         .where(self.model.user_id == user_id)
+                         .where(self.model.month.between(month_from, month_to))
+                         .group_by(*group_by, self.model.currency)
+                         .having(func.sum(self.model.transactions_count) > 0))
+        return query
+
+    async def get_by_category(self, *,
+                              db: AsyncSession,
+                              user_id: UUID,
+                              month_from: date,
+                              month_to: date) -> list[Row]:
+        query: Select = self._build_report_query(self.model.category_id,
+                                                 user_id=user_id,
+                                                 month_from=month_from,
+                                                 month_to=month_to)
+        query = query.order_by(func.sum(self.model.amount).desc())
+        result: list[Row] = (await db.execute(query)).all()
+        return result
+
+    async def get_by_month(self, *,
+                           db: AsyncSession,
+                           user_id: UUID,
+                           month_from: date,
+                           month_to: date) -> list[Row]:
+        query: Select = self._build_report_query(self.model.month,
+                                                 user_id=user_id,
+                                                 month_from=month_from,
+                                                 month_to=month_to)
+        query = query.order_by(self.model.month)
+        result: list[Row] = (await db.execute(query)).all()
+        return result
+
+
+monthly_expense_rollup_crud = CRUDMonthlyExpenseRollup(MonthlyExpenseRollup)
@@ -0,0 +1,51 @@
+from datetime import timedelta
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import func, Row, select, update
+from sqlalchemy.dialects.postgresql import insert, Insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.accounting.idempotency_key import IdempotencyKey
+
+
+class CRUDIdempotencyKey(CRUDBase[IdempotencyKey, BaseModel, BaseModel]):
+    async def claim(self, *,
+                    db: AsyncSession,
+                    user_id: UUID,
+                    key: str,
+                    request_hash: str,
+                    expire_seconds: int) -> bool:
+        """
+        Inserts the key, or takes over an expired one. A key inserted by a transaction that is still running
+        blocks here until it ends, so concurrent duplicates wait for the first request instead of repeating it.
+        Returns `False` when the key is already used.
+        """
+        query: Insert = insert(self.model).values(user_id=user_id, key=key, request_hash=request_hash)
+        query = query.on_conflict_do_update(
+            index_elements=[self.model.user_id, self.model.key],
+            set_={'request_hash': request_hash, 'response': None, 'created_at': func.now()},
+            # compared in the database, so the expiry does not depend on the clock and timezone of the app
+            where=self.model.created_at < func.now() - timedelta(seconds=expire_seconds)
+        ).returning(self.model.key)
+        claimed: str | None = await db.scalar(query)
+        return claimed is not None
+
+    async def get_response(self, *, db: AsyncSession, user_id: UUID, key: str) -> Row | None:
+        query = (select(self.model.request_hash, self.model.response)
+                 .where(self.model.user_id == user_id)
+                 .where(self.model.key == key))
+        row: Row | None = (await db.execute(query)).one_or_none()
+        return row
+
+    async def set_response(self, *, db: AsyncSession, user_id: UUID, key: str, response: dict[str, Any]) -> None:
+        query = (update(self.model)
+                 .where(self.model.user_id == user_id)
+                 .where(self.model.key == key)
+                 .values(response=response))
+        await db.execute(query)
+
+
+idempotency_key_crud = CRUDIdempotencyKey(IdempotencyKey)
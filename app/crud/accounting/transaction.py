@@ -1,40 +1,122 @@
-from uuid import UUID
+from datetime import date
+from typing import Any, AsyncIterator, Collection, Sequence
+from uuid import UUID, uuid4
 
-from fastapi_pagination import Page
+from fastapi_pagination import Page, set_page
+from fastapi_pagination.cursor import CursorPage
 from fastapi_pagination.ext.sqlalchemy import paginate
-from sqlalchemy import asc, desc, select, Select
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload, with_polymorphic
+from sqlalchemy import (asc, bindparam, case, cast, ColumnElement, Date, desc, func, insert, Insert, inspect,
+                        literal_column, Row, select, Select, Table)
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+from sqlalchemy.orm import aliased, noload, selectinload, with_expression, with_polymorphic
+from sqlalchemy.orm.util import AliasedClass
 
 from app.configs.logging_settings import get_logger
-from app.crud.base import CRUDBase
-from app.models.accounting.transaction import ExpenseTransaction, IncomeTransaction, Transaction, TransferTransaction
+from app.crud.base import CRUDBase, Model
+from app.models.accounting.account import Account
+from app.models.accounting.category import Category
+from app.models.accounting.income_source import IncomeSource
+from app.models.accounting.location import Location
+from app.models.accounting.transaction import (COMMENT_SEARCH_CONFIG, ExpenseTransaction, IncomeTransaction,
+                                               Transaction, TransferTransaction)
+from app.models.base import Base
+from app.schemas.accounting.report import NetWorthResolution
 from app.schemas.accounting.transaction import (OrderDirectionType, OrderFieldType, TransactionCreate,
-                                                TransactionRequest)
+                                                TransactionCursorRequest, TransactionExpandType, TransactionFilter,
+                                                TransactionRequest, TransactionType)
+from app.schemas.base import EntityStatusType
 
 logger = get_logger(__name__)
 
 TransactionModel = with_polymorphic(Transaction, [ExpenseTransaction, IncomeTransaction, TransferTransaction])
 
+_COMMENT_SEARCH_CONFIG: ColumnElement = literal_column(f"'{COMMENT_SEARCH_CONFIG}'", REGCONFIG)
+_FROM_ACCOUNT_ID: ColumnElement = func.coalesce(TransactionModel.ExpenseTransaction.from_account_id,
+                                                TransactionModel.TransferTransaction.from_account_id)
+_TO_ACCOUNT_ID: ColumnElement = func.coalesce(TransactionModel.IncomeTransaction.to_account_id,
+                                              TransactionModel.TransferTransaction.to_account_id)
+
+
+def _flat_relationship(model: type[Base],
+                       expand_type: TransactionExpandType,
+                       related_id: ColumnElement) -> tuple[AliasedClass, list[ColumnElement], ColumnElement]:
+    related = aliased(model, name=expand_type.value)
+    columns: list[ColumnElement] = [getattr(related, attribute.key).label(f'{expand_type.value}__{attribute.key}')
+                                    for attribute in inspect(model).column_attrs]
+    return related, columns, related.id == related_id
+
+
+# labelled columns and join conditions are built once, every page query then reuses the compiled statement
+_FLAT_RELATIONSHIPS: dict[TransactionExpandType, tuple[AliasedClass, list[ColumnElement], ColumnElement]] = {
+    expand_type: _flat_relationship(model, expand_type, related_id) for model, expand_type, related_id in [
+        (Account, TransactionExpandType.FROM_ACCOUNT, _FROM_ACCOUNT_ID),
+        (Account, TransactionExpandType.TO_ACCOUNT, _TO_ACCOUNT_ID),
+        (Category, TransactionExpandType.CATEGORY, TransactionModel.ExpenseTransaction.category_id),
+        (Location, TransactionExpandType.LOCATION, TransactionModel.ExpenseTransaction.location_id),
+        (IncomeSource, TransactionExpandType.INCOME_SOURCE, TransactionModel.IncomeTransaction.income_source_id)]}
+
+
+def _comment_highlight(comment_query: str) -> ColumnElement:
+    ts_query: ColumnElement = func.websearch_to_tsquery(_COMMENT_SEARCH_CONFIG, comment_query)
+    return func.ts_headline(_COMMENT_SEARCH_CONFIG, TransactionModel.comment, ts_query)
+
 
 class CRUDTransaction(CRUDBase[TransactionModel, TransactionCreate, TransactionCreate]):
-    def _get_polymorphic_query(self, query: Select) -> Select:
-        query: Select = query.options(selectinload(TransactionModel.ExpenseTransaction.from_account),
-                                      selectinload(TransactionModel.ExpenseTransaction.category),
-                                      selectinload(TransactionModel.ExpenseTransaction.location),
-                                      selectinload(TransactionModel.IncomeTransaction.to_account),
-                                      selectinload(TransactionModel.IncomeTransaction.income_source),
-                                      selectinload(TransactionModel.TransferTransaction.from_account),
-                                      selectinload(TransactionModel.TransferTransaction.to_account))
-        return query
+    def _get_polymorphic_query(self,
+                               query: Select,
+                               expand: Collection[TransactionExpandType] = tuple(TransactionExpandType)) -> Select:
+        """
+        Related objects in `expand` are loaded with one SELECT IN per relationship, the others are not loaded at all
+        """
+        relationships = {TransactionExpandType.FROM_ACCOUNT: [TransactionModel.ExpenseTransaction.from_account,
+                                                              TransactionModel.TransferTransaction.from_account],
+                         TransactionExpandType.TO_ACCOUNT: [TransactionModel.IncomeTransaction.to_account,
+                                                            TransactionModel.TransferTransaction.to_account],
+                         TransactionExpandType.CATEGORY: [TransactionModel.ExpenseTransaction.category],
+                         TransactionExpandType.LOCATION: [TransactionModel.ExpenseTransaction.location],
+                         TransactionExpandType.INCOME_SOURCE: [TransactionModel.IncomeTransaction.income_source]}
+        for expand_type, attributes in relationships.items():
+            loader = selectinload if expand_type in expand else noload
+            query = query.options(*[loader(attribute) for attribute in attributes])
 
-    async def get_transactions(self,
-                               db: AsyncSession,
-                               request: TransactionRequest,
-                               user_id: UUID) -> Page[Transaction]:
+        return query
 
-        query: Select = select(TransactionModel).where(TransactionModel.user_id == user_id)
-        query = self._get_polymorphic_query(query)
+    def _get_flat_columns(self) -> list[ColumnElement]:
+        """
+        Columns of the base and the subtype tables, ids of both accounts are merged over the subtypes
+        """
+        columns: list[ColumnElement] = [
+            TransactionModel.id,
+            TransactionModel.user_id,
+            TransactionModel.transaction_type,
+            TransactionModel.status,
+            TransactionModel.transaction_date,
+            TransactionModel.source_amount,
+            TransactionModel.source_currency,
+            TransactionModel.destination_amount,
+            TransactionModel.destination_currency,
+            TransactionModel.base_currency_amount,
+            TransactionModel.comment,
+            _FROM_ACCOUNT_ID.label('from_account_id'),
+            _TO_ACCOUNT_ID.label('to_account_id'),
+            TransactionModel.ExpenseTransaction.category_id,
+            TransactionModel.ExpenseTransaction.location_id,
+            TransactionModel.IncomeTransaction.income_source_id,
+            TransactionModel.IncomeTransaction.income_period,
+            TransactionModel.created_at,
+            TransactionModel.updated_at]
+        return columns
+
+    def _filter_transactions_query(self,
+                                   query: Select,
+                                   request: TransactionFilter,
+                                   user_id: UUID,
+                                   rank_by_comment: bool = False) -> Select:
+        """
+        With `rank_by_comment` a comment search is ordered by relevance first
+        """
+        query = query.where(TransactionModel.user_id == user_id)
 
         if request.base_currency_amount_from is not None:
             query = query.where(TransactionModel.base_currency_amount >= request.base_currency_amount_from)
@@ -53,9 +135,16 @@ class CRUDTransaction(CRUDBase[TransactionModel, TransactionCreate, TransactionC
             query = query.where(TransactionModel.transaction_type.in_(transaction_types))
 
         if len(request.statuses) > 0:
-            statuses = [s.value for s in request.statuses]
+            # rendered inline, so the planner can match the partial index on active transactions
+            statuses = bindparam('statuses', [s.value for s in request.statuses], expanding=True, literal_execute=True)
             query = query.where(TransactionModel.status.in_(statuses))
 
+        if request.comment_query is not None:
+            ts_query: ColumnElement = func.websearch_to_tsquery(_COMMENT_SEARCH_CONFIG, request.comment_query)
+            query = query.where(TransactionModel.comment_tsv.bool_op('@@')(ts_query))
+            if rank_by_comment:
+                query = query.order_by(func.ts_rank(TransactionModel.comment_tsv, ts_query).desc())
+
         order_fields_map = {OrderFieldType.CREATED_AT: TransactionModel.created_at,
                             OrderFieldType.TRANSACTION_DATE: TransactionModel.transaction_date,
                             OrderFieldType.AMOUNT: TransactionModel.base_currency_amount}
@@ -64,10 +153,116 @@ class CRUDTransaction(CRUDBase[TransactionModel, TransactionCreate, TransactionC
             query = query.order_by(func_ordering(order_fields_map[order.field]))
 
         query = query.order_by(TransactionModel.id)
+        return query
+
+    def _build_transactions_query(self,
+                                  request: TransactionRequest | TransactionCursorRequest,
+                                  user_id: UUID,
+                                  rank_by_comment: bool = False) -> Select:
+        query: Select = self._get_polymorphic_query(select(TransactionModel), expand=request.get_expand())
+        if rank_by_comment and request.comment_query is not None:
+            query = query.options(with_expression(TransactionModel.comment_highlight,
+                                                  _comment_highlight(request.comment_query)))
+
+        query = self._filter_transactions_query(query=query,
+                                                request=request,
+                                                user_id=user_id,
+                                                rank_by_comment=rank_by_comment)
+        return query
+
+    def _build_flat_transactions_query(self, request: TransactionRequest, user_id: UUID) -> Select:
+        """
+        One statement for a page of transactions: the subtype tables and the related objects in `expand`
+        are LEFT JOINed, columns of a related object are labelled `<relationship>__<column>`.
+        A comment search is ordered by relevance first, and the matched words are highlighted in `comment_highlight`.
+        """
+        columns: list[ColumnElement] = self._get_flat_columns()
+        if request.comment_query is not None:
+            columns.append(_comment_highlight(request.comment_query).label('comment_highlight'))
+
+        query: Select = select(*columns).select_from(TransactionModel)
+        for expand_type in request.get_expand():
+            related, related_columns, onclause = _FLAT_RELATIONSHIPS[expand_type]
+            query = query.add_columns(*related_columns).outerjoin(related, onclause)
+
+        query = self._filter_transactions_query(query=query, request=request, user_id=user_id, rank_by_comment=True)
+        return query
+
+    async def get_transactions(self,
+                               db: AsyncSession,
+                               request: TransactionRequest,
+                               user_id: UUID) -> Page[Row]:
+        """
+        Page of flat rows of `_build_flat_transactions_query`, no ORM objects are loaded
+        """
+        query: Select = self._build_flat_transactions_query(request=request, user_id=user_id)
+        # the filters only use the parent table, so the count does not need the joins
+        count_query: Select = self._filter_transactions_query(query=select(func.count()).select_from(Transaction),
+                                                              request=request,
+                                                              user_id=user_id).order_by(None)
+        paginated_expenses: Page[Row] = await paginate(db, query, request, count_query=count_query, unique=False)
+        return paginated_expenses
 
-        paginated_expenses = await paginate(db, query, request)
+    async def get_transactions_cursor(self,
+                                      db: AsyncSession,
+                                      request: TransactionCursorRequest,
+                                      user_id: UUID) -> CursorPage[Transaction]:
+        query: Select = self._build_transactions_query(request=request, user_id=user_id)
+        with set_page(CursorPage):
+            paginated_expenses = await paginate(db, query, request)
         return paginated_expenses
 
+    async def stream_transactions(self,
+                                  db: AsyncSession,
+                                  request: TransactionFilter,
+                                  user_id: UUID,
+                                  yield_per: int = 1000) -> AsyncIterator[Sequence[Row]]:
+        """
+        Yields flat transaction rows in chunks of `yield_per` from a server-side cursor.
+        Only columns are selected, no ORM objects or relationships are loaded.
+        """
+        query: Select = select(*self._get_flat_columns()).select_from(TransactionModel)
+        query = self._filter_transactions_query(query=query, request=request, user_id=user_id)
+
+        result: AsyncResult = await db.stream(query.execution_options(yield_per=yield_per))
+        async for rows in result.partitions():
+            yield rows
+
+    async def get_net_worth_changes(self, *,
+                                    db: AsyncSession,
+                                    user_id: UUID,
+                                    resolution: NetWorthResolution,
+                                    date_from: date | None = None,
+                                    date_to: date | None = None) -> list[Row]:
+        """
+        Cash flow per bucket of transaction dates, incomes minus expenses in the base currency amounts booked
+        with the transactions, and its running total from `date_from` counted with a window function.
+        Transfers are left out and nothing is revalued: opening account balances, exchange rate changes
+        and fees hidden in transfers between currencies are not part of the total.
+        """
+        bucket = cast(func.date_trunc(resolution.value.lower(), Transaction.transaction_date), Date)
+        change = func.sum(case((Transaction.transaction_type == TransactionType.INCOME,
+                                Transaction.base_currency_amount),
+                               else_=-Transaction.base_currency_amount))
+        # rendered inline, so the planner can match the partial index on active transactions
+        status = bindparam('status', EntityStatusType.ACTIVE.value, literal_execute=True)
+        query: Select = (select(bucket.label('bucket'),
+                                change.label('change'),
+                                func.sum(change).over(order_by=bucket).label('net_worth'))
+                         .where(Transaction.user_id == user_id)
+                         .where(Transaction.status == status)
+                         .where(Transaction.transaction_type.in_([TransactionType.INCOME, TransactionType.EXPENSE]))
+                         .group_by(bucket)
+                         .order_by(bucket))
+        if date_from is not None:
+            query = query.where(Transaction.transaction_date >= date_from)
+
+        if date_to is not None:
+            query = query.where(Transaction.transaction_date <= date_to)
+
+        result: list[Row] = (await db.execute(query)).all()
+        return result
+
     def _build_get_query(self, with_for_update: bool = False, **kwargs) -> Select:
         query: Select = select(TransactionModel).where(*[getattr(TransactionModel, k) == v for k, v in kwargs.items()])
         query = self._get_polymorphic_query(query)
@@ -80,10 +275,45 @@ class CRUDTransaction(CRUDBase[TransactionModel, TransactionCreate, TransactionC
 
 transaction_crud = CRUDTransaction(Transaction)
 
+
+class CRUDTransactionSubtype(CRUDBase[Model, TransactionCreate, TransactionCreate]):
+    async def create_batch_values(self, *,
+                                  db: AsyncSession,
+                                  objs_in: list[TransactionCreate],
+                                  chunk_size: int = 1000) -> list[Row]:
+        """
+        Inserts transactions of one subtype with one multi-row INSERT per table and per chunk.
+        Ids are generated here, so child rows do not have to wait for the parent RETURNING.
+        Returns server generated columns of the parent rows in the order of `objs_in`.
+        """
+        parent_table: Table = Transaction.__table__
+        child_table: Table = self.model.__table__
+
+        parent_rows: list[dict[str, Any]] = []
+        child_rows: list[dict[str, Any]] = []
+        for obj_in in objs_in:
+            obj_data: dict[str, Any] = {**obj_in.model_dump(), 'id': uuid4()}
+            parent_rows.append({k: v for k, v in obj_data.items() if k in parent_table.c})
+            child_rows.append({k: v for k, v in obj_data.items() if k in child_table.c})
+
+        rows: dict[UUID, Row] = {}
+        for i in range(0, len(objs_in), chunk_size):
+            query: Insert = (insert(parent_table)
+                             .values(parent_rows[i:i + chunk_size])
+                             .returning(parent_table.c.id,
+                                        parent_table.c.status,
+                                        parent_table.c.created_at,
+                                        parent_table.c.updated_at))
+            rows.update({row.id: row for row in await db.execute(query)})
+            await db.execute(insert(child_table).values(child_rows[i:i + chunk_size]))
+
+        return [rows[row['id']] for row in parent_rows]
+
+
 Expense = with_polymorphic(Transaction, [ExpenseTransaction])
 
 
-class CRUDExpenseTransaction(CRUDBase[Expense, TransactionCreate, TransactionCreate]):
+class CRUDExpenseTransaction(CRUDTransactionSubtype[Expense]):
     pass
 
 
@@ -92,7 +322,7 @@ expense_transaction_crud = CRUDExpenseTransaction(ExpenseTransaction)
 Income = with_polymorphic(Transaction, [IncomeTransaction])
 
 
-class CRUDIncomeTransaction(CRUDBase[Income, TransactionCreate, TransactionCreate]):
+class CRUDIncomeTransaction(CRUDTransactionSubtype[Income]):
     pass
 
 
@@ -101,7 +331,7 @@ income_transaction_crud = CRUDIncomeTransaction(IncomeTransaction)
 Transfer = with_polymorphic(Transaction, [TransferTransaction])
 
 
-class CRUDTransferTransaction(CRUDBase[Transfer, TransactionCreate, TransactionCreate]):
+class CRUDTransferTransaction(CRUDTransactionSubtype[Transfer]):
     pass
 
 
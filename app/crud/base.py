@@ -1,9 +1,12 @@
-from typing import Any, Generic, Type, TypeVar
+from typing import Any, Collection, Generic, Type, TypeVar
+from uuid import UUID
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy import select, Select, update, Update
+from sqlalchemy import ColumnElement, insert, Insert, inspect, literal_column, select, Select, update, Update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import lazyload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models.base import Base
 
@@ -56,29 +59,39 @@ class CRUDBase(Generic[Model, CreateSchema, UpdateSchema]):
         result: list[Model] = (await db.execute(query)).unique().scalars().all()
         return result
 
+    async def get_all(self, *, db: AsyncSession, **kwargs) -> list[Model]:
+        query: Select = self._build_get_query(**kwargs).order_by(self.model.id)
+        result: list[Model] = (await db.execute(query)).unique().scalars().all()
+        return result
+
+    async def get_by_ids(self, *, db: AsyncSession, ids: Collection[UUID], **kwargs) -> list[Model]:
+        # with `with_for_update` rows are locked in id order, so two requests can not lock them crosswise
+        query: Select = self._build_get_query(**kwargs).where(self.model.id.in_(ids)).order_by(self.model.id)
+        result: list[Model] = (await db.execute(query)).unique().scalars().all()
+        return result
+
     async def create(self, *,
                      db: AsyncSession,
                      obj_in: CreateSchema | dict[str, Any],
-                     flush: bool | None = True,
-                     commit: bool | None = False) -> Model:
-        obj_data = obj_in
-        if isinstance(obj_in, BaseModel):
-            obj_data = obj_in.model_dump(exclude_unset=True)
-
-        db_obj: Model = self.model(**obj_data)
-        db.add(db_obj)
-        if flush:
-            await db.flush()
-        if commit:
-            await db.commit()
-        await db.refresh(db_obj)
+                     commit: bool | None = False,
+                     load_relationships: bool | None = True) -> Model:
+        db_obj: Model = (await self.create_batch(db=db,
+                                                 objs_in=[obj_in],
+                                                 commit=commit,
+                                                 load_relationships=load_relationships))[0]
         return db_obj
 
     async def create_batch(self, *,
                            db: AsyncSession,
                            objs_in: list[CreateSchema] | list[dict[str, Any]],
-                           flush: bool | None = True,
-                           commit: bool | None = False) -> list[Model]:
+                           commit: bool | None = False,
+                           load_relationships: bool | None = True) -> list[Model]:
+        """
+        Inserts all objects with one multi-row INSERT ... RETURNING, so server defaults come back without a refresh.
+        Fields left unset get the column DEFAULT, also when another object of the batch sets them.
+        With `load_relationships` off, eager relationships are not queried, they are resolved lazily
+        from the objects the session has already loaded.
+        """
         objs_data: list[dict[str, Any]] = []
         for obj_in in objs_in:
             obj_data = obj_in
@@ -86,14 +99,35 @@ class CRUDBase(Generic[Model, CreateSchema, UpdateSchema]):
                 obj_data = obj_in.model_dump(exclude_unset=True)
             objs_data.append(obj_data)
 
-        db_objs: list[Model] = [self.model(**obj_data) for obj_data in objs_data]
-        db.add_all(db_objs)
-        if flush:
-            await db.flush()
+        if len(objs_data) == 0:
+            return []
+
+        params: list[dict[str, Any]] | None = None
+        if len(inspect(self.model).tables) > 1:
+            # joined inheritance is inserted table by table, a multi-row VALUES can only target one table
+            query: Insert = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+            params = objs_data
+        else:
+            # VALUES takes its column list from the first row, so every row gets the same keys
+            keys: list[str] = list(dict.fromkeys(key for obj_data in objs_data for key in obj_data))
+            default: ColumnElement = literal_column('DEFAULT')
+            objs_data = [{key: obj_data.get(key, default) for key in keys} for obj_data in objs_data]
+            query: Insert = insert(self.model).values(objs_data).returning(self.model)
+
+        if not load_relationships:
+            query = query.options(lazyload('*'))
+
+        db_objs: list[Model] = (await db.scalars(query, params)).unique().all()
+        # a row that has just been inserted can not be referenced yet, its collections are known to be empty
+        collections: list[str] = [r.key for r in inspect(self.model).relationships if r.uselist]
+        for db_obj in db_objs:
+            unloaded: set[str] = inspect(db_obj).unloaded
+            for key in collections:
+                if key in unloaded:
+                    set_committed_value(db_obj, key, [])
+
         if commit:
             await db.commit()
-        for db_obj in db_objs:
-            await db.refresh(db_obj)
 
         return db_objs
 
@@ -0,0 +1,59 @@
+import re
+from weakref import WeakKeyDictionary
+
+from fastapi_pagination import create_page, Page, Params
+from fastapi_pagination.bases import RawParams
+from fastapi_pagination.ext.sqlalchemy import paginate
+from sqlalchemy import Engine, func, or_, Select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.base import Base
+from app.utils.ngram import similarity
+
+_trigram_support: WeakKeyDictionary[Engine, bool] = WeakKeyDictionary()
+
+
+async def has_trigram_support(db: AsyncSession) -> bool:
+    """
+    Whether the pg_trgm extension is installed in the database, checked once per engine
+    """
+    bind: Engine = db.get_bind()
+    if bind not in _trigram_support:
+        supported: bool = False
+        if bind.dialect.name == 'postgresql':
+            supported = await db.scalar(text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')"))
+        _trigram_support[bind] = supported
+
+    return _trigram_support[bind]
+
+
+async def search_by_name(db: AsyncSession,
+                         query: Select,
+                         model: type[Base],
+                         search_term: str | None,
+                         params: Params) -> Page:
+    """
+    Paginates `query` over `model` rows with `name` or `description` containing `search_term`,
+    the most similar first. The filter uses the pg_trgm GIN indexes. Databases without pg_trgm, e.g. local ones,
+    fall back to a plain scan: the matching rows are loaded and ranked in Python by the same similarity.
+    """
+    if search_term is None:
+        return await paginate(db, query.order_by(model.name, model.id), params)
+
+    pattern: str = '%' + re.sub(r'([/%_])', r'/\1', search_term) + '%'
+    query = query.where(or_(model.name.ilike(pattern, escape='/'), model.description.ilike(pattern, escape='/')))
+    if not await has_trigram_support(db):
+        rows: list[Base] = (await db.scalars(query.order_by(model.name, model.id))).all()
+        ranks: list[float] = [max(similarity(row.name, search_term), similarity(row.description or '', search_term))
+                              for row in rows]
+        found: list[Base] = [row for _, row in sorted(zip(ranks, rows), key=lambda item: -item[0])]
+        raw_params: RawParams = params.to_raw_params().as_limit_offset()
+        return create_page(found[raw_params.offset:raw_params.offset + raw_params.limit],
+                           total=len(found),
+                           params=params)
+
+    rank = func.greatest(func.similarity(model.name, search_term),
+                         func.similarity(func.coalesce(model.description, ''), search_term))
+    query = query.order_by(rank.desc(), model.name, model.id)
+    result: Page = await paginate(db, query, params)
+    return result
@@ -0,0 +1,32 @@
+from typing import Collection
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert, Insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.user.change_version import UserChangeVersion
+
+
+class CRUDUserChangeVersion(CRUDBase[UserChangeVersion, BaseModel, BaseModel]):
+    async def get_version(self, *, db: AsyncSession, user_id: UUID) -> int:
+        version: int | None = await db.scalar(select(self.model.version).where(self.model.user_id == user_id))
+        return version or 0
+
+    async def increment(self, *, db: AsyncSession, user_ids: Collection[UUID]) -> None:
+        """
+        Increments versions of the users, creating missing counters. The row lock taken here is held
+        until the commit, so concurrent changes of one user get distinct versions.
+        """
+        if len(user_ids) == 0:
+            return
+
+        query: Insert = insert(self.model).values([{'user_id': user_id, 'version': 1} for user_id in sorted(user_ids)])
+        query = query.on_conflict_do_update(index_elements=[self.model.user_id],
+                                            set_={'version': self.model.version + 1, 'updated_at': func.now()})
+        await db.execute(query)
+
+
+user_change_version_crud = CRUDUserChangeVersion(UserChangeVersion)
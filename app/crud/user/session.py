@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import select, update
+from sqlalchemy import Row, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.base import CRUDBase
@@ -18,6 +18,17 @@ class CRUDUserSession(CRUDBase[Session, UserSessionCreate, UserSessionUpdate]):
         session: Session | None = await db.scalar(query)
         return session
 
+    async def get_active_session_owner(self, db: AsyncSession, session_id: UUID) -> Row | None:
+        """
+        Returns `user_id` and `expires_at` of an active session without loading the session and its user
+        """
+        query = (select(self.model.user_id, self.model.expires_at)
+                 .where(self.model.id == session_id)
+                 .where(self.model.expires_at >= datetime.now()))
+
+        session: Row | None = (await db.execute(query)).one_or_none()
+        return session
+
     async def revoke(self,
                      db: AsyncSession,
                      id: UUID,  # noqa: A002
@@ -1,4 +1,6 @@
-from sqlalchemy import select
+from uuid import UUID
+
+from sqlalchemy import Row, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.base import CRUDBase
@@ -21,5 +23,15 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         user: User | None = await db.scalar(query)
         return user
 
+    async def get_profile(self, db: AsyncSession, user_id: UUID) -> Row | None:
+        """
+        Returns profile columns of the user without joining `external_users`
+        """
+        query = (select(self.model.id, self.model.username, self.model.avatar, self.model.base_currency)
+                 .where(self.model.id == user_id))
+
+        profile: Row | None = (await db.execute(query)).one_or_none()
+        return profile
+
 
 user_crud = CRUDUser(User)
@@ -0,0 +1,54 @@
+import asyncio
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.configs.logging_settings import get_logger
+
+logger = get_logger(__name__)
+
+
+class PoolMonitor:
+    def __init__(self, engine: AsyncEngine):
+        """
+        Counts connection pool events of the engine.
+
+        **Parameters**
+
+        * `engine`: An async SQLAlchemy engine with a queue pool
+        """
+
+        self.engine = engine
+        self.connects = 0
+        self.checkouts = 0
+        self.max_checked_out = 0
+
+        event.listen(engine.sync_engine, 'connect', self._on_connect)
+        event.listen(engine.sync_engine, 'checkout', self._on_checkout)
+
+    def _on_connect(self, *_) -> None:
+        self.connects += 1
+
+    def _on_checkout(self, *_) -> None:
+        self.checkouts += 1
+        self.max_checked_out = max(self.max_checked_out, self.engine.pool.checkedout())
+
+    def stats(self) -> dict[str, int]:
+        pool = self.engine.pool
+        return {'size': pool.size(),
+                'checked_in': pool.checkedin(),
+                'checked_out': pool.checkedout(),
+                'overflow': pool.overflow(),
+                'max_checked_out': self.max_checked_out,
+                'checkouts': self.checkouts,
+                'connects': self.connects}
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> None:
+    """
+    Opens `connections` connections at once and returns them to the pool,
+    so the first requests after a start do not pay for connecting
+    """
+    opened: list[AsyncConnection] = await asyncio.gather(*[engine.connect() for _ in range(connections)])
+    await asyncio.gather(*[connection.close() for connection in opened])
+    logger.info(f'Connection pool warmed up with {connections} connections')
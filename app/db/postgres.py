@@ -1,10 +1,21 @@
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from app.configs.settings import database_settings
+from app.db.pool import PoolMonitor
+from app.db.query_counter import install_query_counter
 
 engine = create_async_engine(database_settings.database_url,
-                             pool_pre_ping=True,
-                             pool_size=5,
-                             max_overflow=50)
+                             pool_size=database_settings.db_pool_size,
+                             max_overflow=database_settings.db_max_overflow,
+                             pool_recycle=database_settings.db_pool_recycle_seconds,
+                             pool_timeout=database_settings.db_pool_timeout_seconds,
+                             pool_pre_ping=database_settings.db_pool_pre_ping,
+                             connect_args={
+                                 'prepared_statement_cache_size': database_settings.db_prepared_statement_cache_size,
+                                 'statement_cache_size': database_settings.db_statement_cache_size,
+                                 'server_settings': {'statement_timeout': str(database_settings.db_statement_timeout_ms)},
+                             })
+pool_monitor = PoolMonitor(engine)
+install_query_counter(engine)
 
 session_maker = async_sessionmaker(engine, autocommit=False, autoflush=False, expire_on_commit=False)
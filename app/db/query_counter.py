@@ -0,0 +1,74 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter[str] = Counter()
+
+    @property
+    def repeated_statements(self) -> dict[str, int]:
+        """
+        Statements executed more than once, a sign of N+1 loading
+        """
+        return {statement: count for statement, count in self.statements.items() if count > 1}
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar('query_stats', default=None)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """
+    Collects statements executed by any engine with the counter installed inside the block
+    """
+    query_stats = QueryStats()
+    token = _query_stats.set(query_stats)
+    try:
+        yield query_stats
+
+    finally:
+        _query_stats.reset(token)
+
+
+def _before_cursor_execute(conn, *_) -> None:
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement: str, *_) -> None:
+    started_at: float = conn.info['query_start'].pop()
+    query_stats: QueryStats | None = _query_stats.get()
+    if query_stats is None:
+        return
+
+    query_stats.count += 1
+    query_stats.duration += time.perf_counter() - started_at
+    query_stats.statements[statement] += 1
+
+
+def _handle_error(context: ExceptionContext) -> None:
+    """
+    Failed statements do not reach `after_cursor_execute`, their start is dropped here
+    """
+    if context.connection is None:
+        return
+
+    started_at: list[float] = context.connection.info.get('query_start', [])
+    if len(started_at) > 0:
+        started_at.pop()
+
+
+def install_query_counter(engine: AsyncEngine) -> None:
+    if not event.contains(engine.sync_engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine.sync_engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine.sync_engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(engine.sync_engine, 'handle_error', _handle_error)
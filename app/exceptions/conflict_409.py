@@ -32,3 +32,12 @@ class IntegrityException(ConflictException):
                          error_code=ErrorCodeType.INTEGRITY_ERROR,
                          logger=logger,
                          log_level=LogLevelType.ERROR)
+
+
+class IdempotencyKeyWithoutResponse(ConflictException):
+    def __init__(self, key: str, logger: logging.Logger):
+        super().__init__(message='Request with this idempotency key has no stored response, retry with a new key',
+                         log_message=f'Idempotency key {key} is used but has no stored response',
+                         error_code=ErrorCodeType.IDEMPOTENCY_KEY_WITHOUT_RESPONSE,
+                         logger=logger,
+                         log_level=LogLevelType.WARNING)
@@ -1,21 +1,40 @@
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
 from app.api.api import api_router
+from app.api.middlewares import QueryCounterMiddleware
 from app.configs.logging_settings import get_logger
-from app.configs.settings import EnvironmentType, settings
+from app.configs.settings import database_settings, EnvironmentType, settings
+from app.db.pool import warm_up_pool
+from app.db.postgres import engine, pool_monitor
 from app.exceptions.base import AppBaseException
 from app.schemas.error_response import ErrorResponse
+from app.services.accounting import report_service
+from app.services.user import session_service, user_service
 
 logger = get_logger(__name__)
-app = FastAPI(title=settings.app_title)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    if database_settings.db_pool_warmup:
+        await warm_up_pool(engine=engine, connections=database_settings.db_pool_size)
+
+    yield
+
+    await engine.dispose()
+
+
+app = FastAPI(title=settings.app_title, lifespan=lifespan)
 
 log_level = logging.INFO if settings.environment == EnvironmentType.PROD else logging.DEBUG
 logging.getLogger('uvicorn.access').setLevel(log_level)
 
+app.add_middleware(QueryCounterMiddleware)
 app.include_router(api_router)
 
 
@@ -34,3 +53,12 @@ async def app_exception_handler(_: Request, exc: AppBaseException):
 @app.get('/')
 async def main():
     return 'The entry for the API'
+
+
+if settings.stats_endpoint_enabled:
+    @app.get('/stats')
+    async def stats():
+        return {'session_cache': session_service.session_cache.stats(),
+                'user_profile_cache': user_service.user_profile_cache.stats(),
+                'net_worth_cache': report_service.net_worth_cache.stats(),
+                'db_pool': pool_monitor.stats()}
@@ -1,9 +1,13 @@
 from app.models.accounting.account import Account
+from app.models.accounting.account_ledger import AccountLedgerEntry
 from app.models.accounting.category import Category
+from app.models.accounting.expense_rollup import MonthlyExpenseRollup
+from app.models.accounting.idempotency_key import IdempotencyKey
 from app.models.accounting.income_source import IncomeSource
 from app.models.accounting.location import Location
 from app.models.accounting.transaction import ExpenseTransaction, IncomeTransaction, Transaction, TransferTransaction
 from app.models.base import Base
+from app.models.user.change_version import UserChangeVersion
 from app.models.user.external_user import ExternalUser
 from app.models.user.session import Session
 from app.models.user.user import User
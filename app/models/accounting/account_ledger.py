@@ -0,0 +1,50 @@
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import BigInteger, Date, DateTime, Enum, ForeignKey, func, Identity, Index, Numeric, text
+from sqlalchemy.dialects.postgresql import UUID as DB_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.accounting.account import Account
+from app.models.accounting.transaction import Transaction
+from app.models.base import Base
+from app.schemas.accounting.account_ledger import LedgerEntryType
+
+
+class AccountLedgerEntry(Base):
+    __tablename__ = 'account_ledger'
+    __table_args__ = (Index('ix_account_ledger_account_id_entry_date', 'account_id', 'entry_date', 'id'),
+                      Index('ix_account_ledger_checkpoint', 'account_id', 'entry_date',
+                            unique=True,
+                            postgresql_where=text(f"entry_type = '{LedgerEntryType.CHECKPOINT.value}'")))
+
+    """
+    History of account balances. Entries of one account are ordered by `entry_date` and `id`.
+    MOVEMENT — one change of the account balance by a transaction, `amount` is the signed change,
+               `entry_date` is the transaction date
+    CHECKPOINT — closing balance of the account for `entry_date`, written for days with movements
+    balance — account balance after the entry, in the account currency
+    base_currency_balance — the same balance in the user base currency
+    """
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)  # noqa: A003
+    user_id: Mapped[UUID] = mapped_column(DB_UUID, nullable=False, index=True)
+    account_id: Mapped[UUID] = mapped_column(DB_UUID, ForeignKey(Account.id), nullable=False)
+    transaction_id: Mapped[UUID | None] = mapped_column(DB_UUID, ForeignKey(Transaction.id), nullable=True)
+
+    entry_type: Mapped[LedgerEntryType] = mapped_column(Enum(LedgerEntryType,
+                                                             native_enum=False,
+                                                             validate_strings=True,
+                                                             values_callable=lambda x: [i.value for i in x]),
+                                                        nullable=False)
+    entry_date: Mapped[date] = mapped_column(Date, nullable=False)
+    amount: Mapped[Decimal] = mapped_column(Numeric, nullable=False, server_default='0')
+    balance: Mapped[Decimal] = mapped_column(Numeric, nullable=False)
+    base_currency_balance: Mapped[Decimal] = mapped_column(Numeric, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return (f'<AccountLedgerEntry (id={self.id}, account_id={self.account_id}, entry_type={self.entry_type}, '
+                f'balance={self.balance})>')
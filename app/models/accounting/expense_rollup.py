@@ -0,0 +1,41 @@
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import Date, DateTime, Enum, ForeignKey, func, Integer, Numeric
+from sqlalchemy.dialects.postgresql import UUID as DB_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.accounting.category import Category
+from app.models.accounting.location import Location
+from app.models.base import Base
+from app.schemas.base import CurrencyType
+
+
+class MonthlyExpenseRollup(Base):
+    __tablename__ = 'monthly_expense_rollup'
+
+    """
+    Active expenses aggregated per month, category and location. Kept up to date by the expense processor.
+    currency — the user base currency, `amount` is the sum of `base_currency_amount`
+    """
+
+    user_id: Mapped[UUID] = mapped_column(DB_UUID, primary_key=True)
+    month: Mapped[date] = mapped_column(Date, primary_key=True)
+    category_id: Mapped[UUID] = mapped_column(DB_UUID, ForeignKey(Category.id), primary_key=True)
+    location_id: Mapped[UUID] = mapped_column(DB_UUID, ForeignKey(Location.id), primary_key=True)
+    currency: Mapped[CurrencyType] = mapped_column(Enum(CurrencyType,
+                                                        native_enum=False,
+                                                        validate_strings=True,
+                                                        values_callable=lambda x: [i.value for i in x]),
+                                                   primary_key=True)
+
+    amount: Mapped[Decimal] = mapped_column(Numeric, nullable=False, server_default='0')
+    transactions_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default='0')
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now(),
+                                                 nullable=False)
+
+    def __repr__(self):
+        return (f'<MonthlyExpenseRollup (user_id={self.user_id}, month={self.month}, category_id={self.category_id}, '
+                f'amount={self.amount})>')
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import DateTime, func, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID as DB_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = 'idempotency_keys'
+
+    """
+    Response of a write request sent with an `Idempotency-Key` header, replayed to retries of the request.
+    request_hash — hash of the request body, a key can not be reused for another request
+    response — null until the request transaction commits together with its response
+    """
+
+    user_id: Mapped[UUID] = mapped_column(DB_UUID, primary_key=True)
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    response: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f'<IdempotencyKey (user_id={self.user_id}, key={self.key})>'
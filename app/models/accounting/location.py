@@ -5,12 +5,14 @@ from sqlalchemy import DateTime, func, String, text, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID as DB_UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.models.base import Base
+from app.models.base import Base, trigram_index
 
 
 class Location(Base):
     __tablename__ = 'locations'
-    __table_args__ = (UniqueConstraint('user_id', 'name', name='location_unique_user_id_name'),)
+    __table_args__ = (UniqueConstraint('user_id', 'name', name='location_unique_user_id_name'),
+                      trigram_index('ix_locations_name_trgm', 'name'),
+                      trigram_index('ix_locations_description_trgm', 'description'))
 
     id: Mapped[UUID] = mapped_column(DB_UUID, primary_key=True, server_default=text('gen_random_uuid()'))  # noqa: A003
     user_id: Mapped[UUID] = mapped_column(DB_UUID, nullable=False, index=True)
@@ -2,9 +2,9 @@ from datetime import date, datetime
 from decimal import Decimal
 from uuid import UUID
 
-from sqlalchemy import Date, DateTime, Enum, ForeignKey, func, Numeric, String, text
-from sqlalchemy.dialects.postgresql import UUID as DB_UUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Computed, Date, DateTime, desc, Enum, ForeignKey, func, Index, Numeric, String, text
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID as DB_UUID
+from sqlalchemy.orm import Mapped, mapped_column, query_expression, relationship
 
 from app.models.accounting.account import Account
 from app.models.accounting.category import Category
@@ -14,9 +14,16 @@ from app.models.base import Base
 from app.schemas.accounting.transaction import TransactionType
 from app.schemas.base import CurrencyType, EntityStatusType
 
+COMMENT_SEARCH_CONFIG = 'simple'
+
 
 class Transaction(Base):
     __tablename__ = 'transactions'
+    # matches the filter and default ordering of the transactions list
+    __table_args__ = (Index('ix_transactions_user_id_transaction_date_active',
+                            'user_id', desc('transaction_date'), desc('created_at'), 'id',
+                            postgresql_where=text(f"status = '{EntityStatusType.ACTIVE.value}'")),
+                      Index('ix_transactions_comment_tsv', 'comment_tsv', postgresql_using='gin'))
 
     """
     source_amount — amount in the withdrawal currency
@@ -33,10 +40,10 @@ class Transaction(Base):
     id: Mapped[UUID] = mapped_column(DB_UUID, primary_key=True, server_default=text('gen_random_uuid()'))  # noqa: A003
     user_id: Mapped[UUID] = mapped_column(DB_UUID, nullable=False, index=True)
 
-    transaction_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
-    base_currency_amount: Mapped[Decimal] = mapped_column(Numeric, nullable=False, index=True)
+    transaction_date: Mapped[date] = mapped_column(Date, nullable=False)
+    base_currency_amount: Mapped[Decimal] = mapped_column(Numeric, nullable=False)
 
-    source_amount: Mapped[Decimal] = mapped_column(Numeric, nullable=False, index=True)
+    source_amount: Mapped[Decimal] = mapped_column(Numeric, nullable=False)
     source_currency: Mapped[CurrencyType] = mapped_column(Enum(CurrencyType,
                                                                native_enum=False,
                                                                validate_strings=True,
@@ -53,16 +60,22 @@ class Transaction(Base):
                                                                    native_enum=False,
                                                                    validate_strings=True,
                                                                    values_callable=lambda x: [i.value for i in x]),
-                                                              nullable=False, index=True)
+                                                              nullable=False)
 
     status: Mapped[EntityStatusType] = mapped_column(Enum(EntityStatusType,
                                                           native_enum=False,
                                                           validate_strings=True,
                                                           values_callable=lambda x: [i.value for i in x]),
                                                      nullable=False,
-                                                     server_default=EntityStatusType.ACTIVE.value,
-                                                     index=True)
+                                                     server_default=EntityStatusType.ACTIVE.value)
     comment: Mapped[str | None] = mapped_column(String(256), nullable=True)
+    # 'simple' config: comments are written in any language, words are only lowercased, not stemmed
+    comment_tsv: Mapped[str] = mapped_column(TSVECTOR,
+                                             Computed(f"to_tsvector('{COMMENT_SEARCH_CONFIG}', coalesce(comment, ''))",
+                                                      persisted=True),
+                                             deferred=True)
+    # comment with the search matches highlighted, loaded only by a full-text search
+    comment_highlight: Mapped[str | None] = query_expression()
 
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now(),
@@ -1,5 +1,20 @@
+from sqlalchemy import Connection, Index, text
 from sqlalchemy.orm import DeclarativeBase
 
 
 class Base(DeclarativeBase):
     pass
+
+
+def _has_pg_trgm(ddl, target, bind: Connection, **kw) -> bool:
+    return bind.execute(text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")).scalar()
+
+
+def trigram_index(name: str, column: str) -> Index:
+    """
+    GIN pg_trgm index for `ILIKE '%term%'` and similarity search on `column`.
+    `metadata.create_all` skips it on databases without the pg_trgm extension.
+    """
+    index: Index = Index(name, column, postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'})
+    index.ddl_if(dialect='postgresql', callable_=_has_pg_trgm)
+    return index
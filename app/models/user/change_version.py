@@ -0,0 +1,25 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import BigInteger, DateTime, func
+from sqlalchemy.dialects.postgresql import UUID as DB_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class UserChangeVersion(Base):
+    __tablename__ = 'user_change_versions'
+
+    """
+    Counter increased by every change of the user accounting data, ETags of the user GET responses are built from it
+    """
+
+    user_id: Mapped[UUID] = mapped_column(DB_UUID, primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now(),
+                                                 nullable=False)
+
+    def __repr__(self):
+        return f'<UserChangeVersion (user_id={self.user_id}, version={self.version})>'
@@ -43,3 +43,14 @@ class Account(AccountBase):
     status: EntityStatusType
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class BalanceMismatch(BaseModel):
+    account_id: UUID
+    user_id: UUID
+    balance: Decimal
+    expected_balance: Decimal
+    base_currency_rate: Decimal
+    expected_base_currency_rate: Decimal
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,46 @@
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from uuid import UUID
+
+from fastapi import Query
+from pydantic import BaseModel, ConfigDict
+
+
+class LedgerEntryType(str, Enum):
+    MOVEMENT = 'MOVEMENT'
+    CHECKPOINT = 'CHECKPOINT'
+
+
+class AccountLedgerEntryCreate(BaseModel):
+    user_id: UUID
+    account_id: UUID
+    transaction_id: UUID
+    entry_date: date
+    amount: Decimal
+    base_currency_amount: Decimal
+
+
+class AccountLedgerCorrectionCreate(BaseModel):
+    user_id: UUID
+    account_id: UUID
+    entry_date: date
+    balance: Decimal
+    base_currency_balance: Decimal
+
+
+class BalancePoint(BaseModel):
+    date: date
+    balance: Decimal
+    base_currency_balance: Decimal
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BalanceRequest(BaseModel):
+    on_date: date = Query(date.today(), description='Balance at the end of the day')
+
+
+class BalanceHistoryRequest(BaseModel):
+    date_from: date = Query(date(date.today().year, date.today().month, 1))
+    date_to: date = Query(date.today())
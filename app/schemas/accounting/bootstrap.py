@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+from app.schemas.accounting.account import Account
+from app.schemas.accounting.category import Category
+from app.schemas.accounting.income_source import IncomeSource
+from app.schemas.accounting.location import Location
+
+
+class Bootstrap(BaseModel):
+    accounts: list[Account]
+    categories: list[Category]
+    locations: list[Location]
+    income_sources: list[IncomeSource]
+
+    content_hash: str = ''
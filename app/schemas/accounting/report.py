@@ -0,0 +1,64 @@
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from uuid import UUID
+
+from fastapi import Query
+from pydantic import BaseModel, ConfigDict, field_validator
+
+from app.schemas.base import CurrencyType
+
+
+class ExpenseReportRequest(BaseModel):
+    month_from: date = Query(date(date.today().year, 1, 1), description='First month, day is ignored')
+    month_to: date = Query(date.today(), description='Last month, day is ignored')
+
+    @field_validator('month_from', 'month_to', mode='after')
+    def validate_month(cls, month: date):
+        return month.replace(day=1)
+
+
+class ExpenseRollupUpdate(BaseModel):
+    user_id: UUID
+    month: date
+    category_id: UUID
+    location_id: UUID
+    currency: CurrencyType
+    amount: Decimal
+    transactions_count: int
+
+
+class CategoryExpenses(BaseModel):
+    category_id: UUID
+    currency: CurrencyType
+    amount: Decimal
+    transactions_count: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class MonthExpenses(BaseModel):
+    month: date
+    currency: CurrencyType
+    amount: Decimal
+    transactions_count: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class NetWorthResolution(str, Enum):
+    DAY = 'DAY'
+    MONTH = 'MONTH'
+
+
+class NetWorthRequest(BaseModel):
+    date_from: date = Query(date(date.today().year, 1, 1))
+    date_to: date = Query(date.today())
+    resolution: NetWorthResolution = Query(NetWorthResolution.MONTH,
+                                           description='Bucket size, points are dated by the bucket start')
+
+
+class NetWorthPoint(BaseModel):
+    date: date
+    currency: CurrencyType
+    amount: Decimal
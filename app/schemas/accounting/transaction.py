@@ -5,6 +5,8 @@ from uuid import UUID
 
 from fastapi import Query
 from fastapi_pagination import Params
+from fastapi_pagination.bases import CursorRawParams
+from fastapi_pagination.cursor import CursorParams
 from pydantic import BaseModel, condecimal, ConfigDict, constr, field_validator, model_validator
 
 from app.schemas.accounting.account import Account
@@ -124,6 +126,8 @@ class Transaction(TransactionCreate):
     category: Category | None = None
     location: Location | None = None
 
+    comment_highlight: str | None = None
+
     created_at: datetime
     updated_at: datetime
 
@@ -146,9 +150,7 @@ class Order(BaseModel):
     ordering: OrderDirectionType | None = None
 
 
-class TransactionRequest(Params):
-    page: int = Query(1, ge=1, description='Page number')
-    size: int = Query(20, ge=1, le=100, description='Page size')
+class TransactionFilter(BaseModel):
     orders: list[Order] = [Order(field=OrderFieldType.TRANSACTION_DATE, ordering=OrderDirectionType.DESC),
                            Order(field=OrderFieldType.CREATED_AT, ordering=OrderDirectionType.DESC)]
 
@@ -161,7 +163,84 @@ class TransactionRequest(Params):
     transaction_types: list[TransactionType] = []
     statuses: list[EntityStatusType] = [EntityStatusType.ACTIVE]
 
+    comment_query: constr(min_length=2, max_length=256) | None = None
+
     def __hash__(self):
         data = self.model_dump()
         hashable_items: tuple = utils.make_hashable(data)
         return hash(hashable_items)
+
+
+class TransactionExpandType(str, Enum):
+    FROM_ACCOUNT = 'from_account'
+    TO_ACCOUNT = 'to_account'
+    CATEGORY = 'category'
+    LOCATION = 'location'
+    INCOME_SOURCE = 'income_source'
+
+
+_EXPAND_VALUES: str = '|'.join(expand_type.value for expand_type in TransactionExpandType)
+
+
+class TransactionExpand(BaseModel):
+    expand: constr(pattern=rf'^(({_EXPAND_VALUES})(,({_EXPAND_VALUES}))*)?$') | None = Query(
+        None, description=f'Comma separated related objects to load: {_EXPAND_VALUES.replace("|", ", ")}. '
+                          f'All by default, empty for none. Ids of not loaded objects are returned anyway'
+    )
+
+    def get_expand(self) -> set[TransactionExpandType]:
+        if self.expand is None:
+            return set(TransactionExpandType)
+
+        return {TransactionExpandType(value) for value in self.expand.split(',') if value != ''}
+
+
+class TransactionRequest(TransactionFilter, TransactionExpand, Params):
+    page: int = Query(1, ge=1, description='Page number')
+    size: int = Query(20, ge=1, le=100, description='Page size')
+
+
+class TransactionCursorRequest(TransactionFilter, TransactionExpand, CursorParams):
+    """
+    Keyset pagination over the same filters as `TransactionRequest`.
+    The cursor is opaque and encodes the ordering values of the last row, so every page costs the same.
+    """
+    size: int = Query(20, ge=1, le=100, description='Page size')
+    include_total: bool = Query(False, description='Count all matching transactions')
+
+    def to_raw_params(self) -> CursorRawParams:
+        raw_params: CursorRawParams = super().to_raw_params()
+        raw_params.include_total = self.include_total
+        return raw_params
+
+
+class ExportFormatType(str, Enum):
+    NDJSON = 'ndjson'
+    CSV = 'csv'
+
+
+class TransactionExportRequest(TransactionFilter):
+    export_format: ExportFormatType = Query(ExportFormatType.NDJSON, description='Output format')
+
+
+class TransactionExportRow(BaseModel):
+    id: UUID  # noqa: A003
+    transaction_type: TransactionType
+    status: EntityStatusType
+    transaction_date: date
+    source_amount: Decimal
+    source_currency: CurrencyType
+    destination_amount: Decimal
+    destination_currency: CurrencyType
+    base_currency_amount: Decimal
+    comment: str | None = None
+
+    from_account_id: UUID | None = None
+    to_account_id: UUID | None = None
+    category_id: UUID | None = None
+    location_id: UUID | None = None
+    income_source_id: UUID | None = None
+    income_period: date | None = None
+
+    created_at: datetime
+    updated_at: datetime
@@ -20,6 +20,8 @@ class ErrorCodeType(str, Enum):
     NO_ACCOUNT_BASE_CURRENCY_RATE = 'NO_ACCOUNT_BASE_CURRENCY_RATE'
     CURRENCY_MISMATCH = 'CURRENCY_MISMATCH'
     ACCOUNT_TYPE_MISMATCH = 'ACCOUNT_TYPE_MISMATCH'
+    IDEMPOTENCY_KEY_REUSED = 'IDEMPOTENCY_KEY_REUSED'
+    IDEMPOTENCY_KEY_WITHOUT_RESPONSE = 'IDEMPOTENCY_KEY_WITHOUT_RESPONSE'
 
 
 class ErrorResponse(BaseModel):
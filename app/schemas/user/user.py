@@ -26,3 +26,12 @@ class User(UserBase):
     external_users: list[ExternalUser]
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class UserProfile(BaseModel):
+    id: UUID  # noqa: A003
+    username: str
+    avatar: str | None = None
+    base_currency: CurrencyType
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
@@ -13,9 +13,12 @@ from app.exceptions.not_fount_404 import EntityNotFound
 from app.models.accounting.account import Account as AccountModel
 from app.schemas.accounting.account import Account, AccountCreate, AccountCreateRequest, AccountType, AccountUpdate
 from app.schemas.base import CurrencyType, EntityStatusType
+from app.services.user import change_version_service
 
 logger = get_logger(__name__)
 
+accounts_adapter: TypeAdapter[list[Account]] = TypeAdapter(list[Account])
+
 
 async def create_account(db: AsyncSession,
                          create_data: AccountCreateRequest,
@@ -31,6 +34,8 @@ async def create_account(db: AsyncSession,
     except IntegrityError as exc:
         raise IntegrityException(entity=AccountModel, exception=exc, logger=logger)
 
+    await change_version_service.increment(db=db, user_ids=[user_id])
+
     account: Account = Account.model_validate(account_db)
     return account
 
@@ -50,7 +55,7 @@ async def get_accounts(db: AsyncSession, user_id: UUID) -> list[Account]:
                                                                    user_id=user_id,
                                                                    status=EntityStatusType.ACTIVE)
 
-    accounts: list[Account] = TypeAdapter(list[Account]).validate_python(accounts_db)
+    accounts: list[Account] = accounts_adapter.validate_python(accounts_db)
     return accounts
 
 
@@ -79,6 +84,8 @@ async def update_account(db: AsyncSession, account_id: UUID, update_data: Accoun
     if account_db is None:
         raise EntityNotFound(entity=AccountModel, search_params={'id': account_id, 'user_id': user_id}, logger=logger)
 
+    await change_version_service.increment(db=db, user_ids=[user_id])
+
     account: Account = Account.model_validate(account_db)
     return account
 
@@ -101,5 +108,7 @@ async def delete_account(db: AsyncSession, account_id: UUID, user_id: UUID) -> A
                                                              id=account_id,
                                                              user_id=user_id,
                                                              status=EntityStatusType.ACTIVE)
+    await change_version_service.increment(db=db, user_ids=[user_id])
+
     account: Account = Account.model_validate(account_db)
     return account
@@ -0,0 +1,37 @@
+import hashlib
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.configs.logging_settings import get_logger
+from app.crud.accounting.account import account_crud
+from app.crud.accounting.category import category_crud
+from app.crud.accounting.income_source import income_source_crud
+from app.crud.accounting.location import location_crud
+from app.models.accounting.account import Account
+from app.models.accounting.category import Category
+from app.models.accounting.income_source import IncomeSource
+from app.models.accounting.location import Location
+from app.schemas.accounting.bootstrap import Bootstrap
+from app.schemas.base import EntityStatusType
+
+logger = get_logger(__name__)
+
+
+async def get_bootstrap(db: AsyncSession, user_id: UUID) -> Bootstrap:
+    """
+    Reference data the client needs before its first screen, read on the request session.
+    `content_hash` is the sha256 of the payload.
+    """
+    accounts_db: list[Account] = await account_crud.get_all(db=db, user_id=user_id, status=EntityStatusType.ACTIVE)
+    categories_db: list[Category] = await category_crud.get_all(db=db, user_id=user_id)
+    locations_db: list[Location] = await location_crud.get_all(db=db, user_id=user_id)
+    income_sources_db: list[IncomeSource] = await income_source_crud.get_all(db=db, user_id=user_id)
+
+    bootstrap: Bootstrap = Bootstrap.model_validate({'accounts': accounts_db,
+                                                     'categories': categories_db,
+                                                     'locations': locations_db,
+                                                     'income_sources': income_sources_db},
+                                                    from_attributes=True)
+    bootstrap.content_hash = hashlib.sha256(bootstrap.model_dump_json(exclude={'content_hash'}).encode()).hexdigest()
+    return bootstrap
@@ -11,6 +11,7 @@ from app.exceptions.not_fount_404 import EntityNotFound
 from app.models.accounting.category import Category as CategoryModel
 from app.schemas.accounting.category import (Category, CategoryCreate, CategoryCreateRequest, CategoryRequest,
                                              CategoryUpdate)
+from app.services.user import change_version_service
 
 logger = get_logger(__name__)
 
@@ -23,6 +24,8 @@ async def create_category(db: AsyncSession, create_data: CategoryCreateRequest,
     except IntegrityError as exc:
         raise IntegrityException(entity=CategoryModel, exception=exc, logger=logger)
 
+    await change_version_service.increment(db=db, user_ids=[user_id])
+
     category: Category = Category.model_validate(expense_db)
     return category
 
@@ -55,5 +58,7 @@ async def update_category(db: AsyncSession, category_id: UUID, update_data: Cate
     if category_db is None:
         raise EntityNotFound(entity=CategoryModel, search_params={'id': category_id, 'user_id': user_id}, logger=logger)
 
+    await change_version_service.increment(db=db, user_ids=[user_id])
+
     category: Category = Category.model_validate(category_db)
     return category
@@ -11,6 +11,7 @@ from app.exceptions.not_fount_404 import EntityNotFound
 from app.models.accounting.income_source import IncomeSource as IncomeSourceModel
 from app.schemas.accounting.income_source import (IncomeSource, IncomeSourceCreate, IncomeSourceCreateRequest,
                                                   IncomeSourceRequest, IncomeSourceUpdate)
+from app.services.user import change_version_service
 
 logger = get_logger(__name__)
 
@@ -25,6 +26,8 @@ async def create_income_source(db: AsyncSession,
     except IntegrityError as exc:
         raise IntegrityException(entity=IncomeSourceModel, exception=exc, logger=logger)
 
+    await change_version_service.increment(db=db, user_ids=[user_id])
+
     income_source: IncomeSource = IncomeSource.model_validate(income_source_db)
     return income_source
 
@@ -67,5 +70,7 @@ async def update_income_source(db: AsyncSession,
                              search_params={'id': income_source_id, 'user_id': user_id},
                              logger=logger)
 
+    await change_version_service.increment(db=db, user_ids=[user_id])
+
     income_source: IncomeSource = IncomeSource.model_validate(income_source_db)
     return income_source
@@ -0,0 +1,74 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.configs.logging_settings import get_logger
+from app.crud.accounting.account_ledger import account_ledger_crud
+from app.exceptions.not_fount_404 import EntityNotFound
+from app.models.accounting.account import Account as AccountModel
+from app.schemas.accounting.account_ledger import BalancePoint
+
+logger = get_logger(__name__)
+
+
+async def create_checkpoints(db: AsyncSession, day: date | None = None) -> int:
+    """
+    Closes `day`, yesterday by default, with a checkpoint for every account that had movements on it
+    """
+    if day is None:
+        day = date.today() - timedelta(days=1)
+
+    created: int = await account_ledger_crud.create_checkpoints(db=db, day=day)
+    logger.info(f'{created} ledger checkpoints created for {day}')
+    return created
+
+
+async def get_balance(db: AsyncSession, user_id: UUID, account_id: UUID, on_date: date) -> BalancePoint:
+    rows: list[Row] = await account_ledger_crud.get_balances(db=db,
+                                                             user_id=user_id,
+                                                             on_date=on_date,
+                                                             account_ids=[account_id])
+    if len(rows) == 0:
+        raise EntityNotFound(entity=AccountModel, search_params={'id': account_id, 'user_id': user_id}, logger=logger)
+
+    balance: BalancePoint = BalancePoint(date=on_date,
+                                         balance=rows[0].balance or Decimal('0'),
+                                         base_currency_balance=rows[0].base_currency_balance or Decimal('0'))
+    return balance
+
+
+async def get_balance_history(db: AsyncSession,
+                              user_id: UUID,
+                              account_id: UUID,
+                              date_from: date,
+                              date_to: date) -> list[BalancePoint]:
+    """
+    Closing balance of the account for every day from `date_from` to `date_to`
+    """
+    opening: BalancePoint = await get_balance(db=db,
+                                              user_id=user_id,
+                                              account_id=account_id,
+                                              on_date=date_from - timedelta(days=1))
+    rows: list[Row] = await account_ledger_crud.get_daily_balances(db=db,
+                                                                   user_id=user_id,
+                                                                   date_from=date_from,
+                                                                   date_to=date_to,
+                                                                   account_ids=[account_id])
+    closings: dict[date, Row] = {row.date: row for row in rows}
+
+    history: list[BalancePoint] = []
+    balance: Decimal = opening.balance
+    base_currency_balance: Decimal = opening.base_currency_balance
+    day: date = date_from
+    while day <= date_to:
+        if day in closings:
+            balance = closings[day].balance
+            base_currency_balance = closings[day].base_currency_balance
+
+        history.append(BalancePoint(date=day, balance=balance, base_currency_balance=base_currency_balance))
+        day += timedelta(days=1)
+
+    return history
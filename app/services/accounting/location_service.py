@@ -11,6 +11,7 @@ from app.exceptions.not_fount_404 import EntityNotFound
 from app.models.accounting.location import Location as LocationModel
 from app.schemas.accounting.location import (Location, LocationCreate, LocationCreateRequest, LocationRequest,
                                              LocationUpdate)
+from app.services.user import change_version_service
 
 logger = get_logger(__name__)
 
@@ -23,6 +24,8 @@ async def create_location(db: AsyncSession, create_data: LocationCreateRequest,
     except IntegrityError as exc:
         raise IntegrityException(entity=LocationModel, exception=exc, logger=logger)
 
+    await change_version_service.increment(db=db, user_ids=[user_id])
+
     expense: Location = Location.model_validate(expense_db)
     return expense
 
@@ -58,5 +61,7 @@ async def update_location(db: AsyncSession,
     if location_db is None:
         raise EntityNotFound(entity=LocationModel, search_params={'id': location_id, 'user_id': user_id}, logger=logger)
 
+    await change_version_service.increment(db=db, user_ids=[user_id])
+
     location: Location = Location.model_validate(location_db)
     return location
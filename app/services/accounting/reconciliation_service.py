@@ -0,0 +1,51 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.configs.logging_settings import get_logger
+from app.crud.accounting.account import account_crud
+from app.crud.accounting.account_ledger import account_ledger_crud
+from app.schemas.accounting.account import BalanceMismatch
+from app.schemas.accounting.account_ledger import AccountLedgerCorrectionCreate
+from app.services.user import change_version_service
+
+logger = get_logger(__name__)
+
+
+async def reconcile_balances(db: AsyncSession, repair: bool = False) -> list[BalanceMismatch]:
+    """
+    Compares balances and base currency rates of all accounts with the ones recomputed from active transactions.
+    With `repair` mismatched accounts get the expected values, balances the ledger misses are corrected in it.
+    """
+    if repair:
+        rows: list[Row] = await account_crud.repair_balances(db=db)
+    else:
+        rows: list[Row] = await account_crud.get_balance_mismatches(db=db)
+
+    mismatches: list[BalanceMismatch] = [BalanceMismatch.model_validate(row) for row in rows]
+    for mismatch in mismatches:
+        logger.warning(f'Account {mismatch.account_id} balance {mismatch.balance} '
+                       f'(expected {mismatch.expected_balance}), base currency rate {mismatch.base_currency_rate} '
+                       f'(expected {mismatch.expected_base_currency_rate})')
+
+    if repair:
+        await account_ledger_crud.add_corrections(db=db, objs_in=[_correction_entry(mismatch)
+                                                                  for mismatch in mismatches])
+        await change_version_service.increment(db=db, user_ids=[mismatch.user_id for mismatch in mismatches])
+
+    return mismatches
+
+
+def _correction_entry(mismatch: BalanceMismatch) -> AccountLedgerCorrectionCreate:
+    base_currency_balance: Decimal = Decimal('0')
+    if mismatch.expected_base_currency_rate != 0:
+        base_currency_balance = round(mismatch.expected_balance / mismatch.expected_base_currency_rate, 2)
+
+    entry: AccountLedgerCorrectionCreate = AccountLedgerCorrectionCreate(user_id=mismatch.user_id,
+                                                                         account_id=mismatch.account_id,
+                                                                         entry_date=date.today(),
+                                                                         balance=mismatch.expected_balance,
+                                                                         base_currency_balance=base_currency_balance)
+    return entry
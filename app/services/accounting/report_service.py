@@ -0,0 +1,148 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import event, Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.configs.logging_settings import get_logger
+from app.configs.settings import settings
+from app.crud.accounting.expense_rollup import monthly_expense_rollup_crud
+from app.crud.accounting.transaction import transaction_crud
+from app.schemas.accounting.report import (CategoryExpenses, ExpenseReportRequest, MonthExpenses, NetWorthPoint,
+                                           NetWorthRequest, NetWorthResolution)
+from app.schemas.base import CurrencyType
+from app.services.user import user_service
+from app.utils.cache import LRUTTLCache
+
+logger = get_logger(__name__)
+
+ClosedBuckets = list[tuple[date, Decimal]]
+
+# (user_id, resolution) -> (open bucket, running net worth of the closed buckets before it).
+# Writes in another process are picked up after at most `net_worth_cache_ttl_seconds`
+net_worth_cache: LRUTTLCache[tuple[UUID, NetWorthResolution], tuple[date, ClosedBuckets]] = LRUTTLCache(
+    maxsize=settings.net_worth_cache_size,
+    ttl=settings.net_worth_cache_ttl_seconds)
+
+# session info key of the cache keys to drop when the session commits
+NET_WORTH_INVALIDATIONS: str = 'net_worth_invalidations'
+
+
+async def get_expenses_by_category(db: AsyncSession,
+                                   request: ExpenseReportRequest,
+                                   user_id: UUID) -> list[CategoryExpenses]:
+    rows: list[Row] = await monthly_expense_rollup_crud.get_by_category(db=db,
+                                                                        user_id=user_id,
+                                                                        month_from=request.month_from,
+                                                                        month_to=request.month_to)
+    expenses: list[CategoryExpenses] = [CategoryExpenses.model_validate(row) for row in rows]
+    return expenses
+
+
+async def get_expenses_by_month(db: AsyncSession,
+                                request: ExpenseReportRequest,
+                                user_id: UUID) -> list[MonthExpenses]:
+    rows: list[Row] = await monthly_expense_rollup_crud.get_by_month(db=db,
+                                                                     user_id=user_id,
+                                                                     month_from=request.month_from,
+                                                                     month_to=request.month_to)
+    expenses: list[MonthExpenses] = [MonthExpenses.model_validate(row) for row in rows]
+    return expenses
+
+
+def _bucket_start(day: date, resolution: NetWorthResolution) -> date:
+    if resolution == NetWorthResolution.MONTH:
+        return day.replace(day=1)
+
+    return day
+
+
+def _next_bucket(bucket: date, resolution: NetWorthResolution) -> date:
+    if resolution == NetWorthResolution.MONTH:
+        return (bucket + timedelta(days=32)).replace(day=1)
+
+    return bucket + timedelta(days=1)
+
+
+async def _get_closed_buckets(db: AsyncSession,
+                              user_id: UUID,
+                              resolution: NetWorthResolution,
+                              open_bucket: date) -> ClosedBuckets:
+    cached: tuple[date, ClosedBuckets] | None = net_worth_cache.get((user_id, resolution))
+    if cached is not None and cached[0] == open_bucket:
+        return cached[1]
+
+    rows: list[Row] = await transaction_crud.get_net_worth_changes(db=db,
+                                                                   user_id=user_id,
+                                                                   resolution=resolution,
+                                                                   date_to=open_bucket - timedelta(days=1))
+    closed_buckets: ClosedBuckets = [(row.bucket, row.net_worth) for row in rows]
+    net_worth_cache.set((user_id, resolution), (open_bucket, closed_buckets))
+    return closed_buckets
+
+
+async def get_net_worth(db: AsyncSession, request: NetWorthRequest, user_id: UUID) -> list[NetWorthPoint]:
+    """
+    Running cash-flow total at the end of every bucket, see `get_net_worth_changes` for what it leaves out.
+    Buckets before the current one are cached, only the current bucket and the ones after it are recomputed.
+    """
+    base_currency: CurrencyType = await user_service.get_user_base_currency(db=db, user_id=user_id)
+    open_bucket: date = _bucket_start(date.today(), request.resolution)
+
+    closed_buckets: ClosedBuckets = await _get_closed_buckets(db=db,
+                                                              user_id=user_id,
+                                                              resolution=request.resolution,
+                                                              open_bucket=open_bucket)
+    open_rows: list[Row] = await transaction_crud.get_net_worth_changes(db=db,
+                                                                        user_id=user_id,
+                                                                        resolution=request.resolution,
+                                                                        date_from=open_bucket)
+    closed_net_worth: Decimal = closed_buckets[-1][1] if len(closed_buckets) > 0 else Decimal('0')
+    net_worth_by_bucket: dict[date, Decimal] = dict(closed_buckets)
+    net_worth_by_bucket.update({row.bucket: closed_net_worth + row.net_worth for row in open_rows})
+
+    bucket: date = _bucket_start(request.date_from, request.resolution)
+    buckets_before: list[date] = [b for b in net_worth_by_bucket if b < bucket]
+    amount: Decimal = net_worth_by_bucket[max(buckets_before)] if len(buckets_before) > 0 else Decimal('0')
+
+    net_worth: list[NetWorthPoint] = []
+    while bucket <= request.date_to:
+        amount = net_worth_by_bucket.get(bucket, amount)
+        net_worth.append(NetWorthPoint(date=bucket, currency=base_currency, amount=amount))
+        bucket = _next_bucket(bucket, request.resolution)
+
+    return net_worth
+
+
+def invalidate_net_worth(db: AsyncSession, user_id: UUID, transaction_dates: Iterable[date]) -> None:
+    """
+    Must be called in the database transaction creating or deleting transactions of the user.
+    Only transactions dated before the current bucket change the cached buckets, they are dropped after
+    the commit, so a concurrent request can not cache the data from before it again.
+    """
+    earliest: date = min(transaction_dates, default=date.max)
+    keys: set[tuple[UUID, NetWorthResolution]] = {(user_id, resolution) for resolution in NetWorthResolution
+                                                  if earliest < _bucket_start(date.today(), resolution)}
+    if len(keys) > 0:
+        db.info.setdefault(NET_WORTH_INVALIDATIONS, set()).update(keys)
+
+
+@event.listens_for(Session, 'after_commit')
+def _drop_invalidated_net_worth(session: Session) -> None:
+    # released savepoints are committed only with the outer transaction
+    if session.in_nested_transaction():
+        return
+
+    for key in session.info.pop(NET_WORTH_INVALIDATIONS, ()):
+        net_worth_cache.pop(key)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _keep_net_worth(session: Session) -> None:
+    if session.in_nested_transaction():
+        return
+
+    session.info.pop(NET_WORTH_INVALIDATIONS, None)
@@ -1,13 +1,21 @@
+import asyncio
+import random
 from abc import ABC, abstractmethod
-from decimal import Decimal, ROUND_HALF_EVEN
-from typing import Generic, TypeVar
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Collection, Generic, TypeVar
 from uuid import UUID
 
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import case, func, Row
+from sqlalchemy.exc import DBAPIError, IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.configs.logging_settings import get_logger
+from app.configs.settings import settings
 from app.crud.accounting.account import account_crud
+from app.crud.accounting.account_ledger import account_ledger_crud
+from app.crud.accounting.transaction import CRUDTransactionSubtype
 from app.crud.base import CRUDBase
 from app.exceptions.conflict_409 import IntegrityException
 from app.exceptions.forbidden_403 import CurrencyMismatchException, NoAccountBaseCurrencyRate
@@ -15,24 +23,42 @@ from app.exceptions.not_fount_404 import EntityNotFound
 from app.exceptions.not_implemented_501 import NotImplementedException
 from app.models.accounting.account import Account as AccountModel
 from app.models.accounting.transaction import Transaction as TransactionModel
+from app.schemas.accounting.account_ledger import AccountLedgerEntryCreate
 from app.schemas.accounting.transaction import (Transaction, TransactionCreate, TransactionCreateRequest,
                                                 TransactionType)
 from app.schemas.base import CurrencyType, EntityStatusType
-from app.services.user import user_service
+from app.services.accounting import report_service
+from app.services.user import change_version_service, user_service
 
 T = TypeVar('T', bound=TransactionCreateRequest)
+R = TypeVar('R')
+
+# serialization_failure, deadlock_detected
+RETRYABLE_SQLSTATES: frozenset[str] = frozenset({'40001', '40P01'})
 
 logger = get_logger(__name__)
 
 
 class TransactionProcessor(ABC, Generic[T]):
-    def __init__(self, db: AsyncSession, user_id: UUID):
+    def __init__(self,
+                 db: AsyncSession,
+                 user_id: UUID,
+                 locked_accounts: dict[UUID, AccountModel | None] | None = None):
         self.db: AsyncSession = db
         self.user_id: UUID = user_id
         self.base_currency: CurrencyType | None = None
+        # accounts the caller has locked in the outer transaction, `None` for the ones not found
+        self._locked_accounts: dict[UUID, AccountModel | None] = locked_accounts or {}
+        self._accounts: dict[UUID, AccountModel | None] = {}
+        self._referenced: dict[str, dict[UUID, Any]] = {}
+        self._ledger_entries: list[AccountLedgerEntryCreate] = []
 
     @classmethod
-    def factory(cls, db: AsyncSession, user_id: UUID, transaction_type: TransactionType) -> 'TransactionProcessor':
+    def factory(cls,
+                db: AsyncSession,
+                user_id: UUID,
+                transaction_type: TransactionType,
+                locked_accounts: dict[UUID, AccountModel | None] | None = None) -> 'TransactionProcessor':
         from app.services.accounting.transaction_processor.income import Income
         from app.services.accounting.transaction_processor.expense import Expense
         from app.services.accounting.transaction_processor.transfer import Transfer
@@ -45,7 +71,9 @@ class TransactionProcessor(ABC, Generic[T]):
             raise NotImplementedException(log_message=f'Transaction {transaction_type.__name__} is not implemented',
                                           logger=logger)
 
-        transaction_processor: TransactionProcessor = transaction_class(db=db, user_id=user_id)
+        transaction_processor: TransactionProcessor = transaction_class(db=db,
+                                                                        user_id=user_id,
+                                                                        locked_accounts=locked_accounts)
         return transaction_processor
 
     @property
@@ -55,9 +83,94 @@ class TransactionProcessor(ABC, Generic[T]):
 
     @property
     @abstractmethod
-    def _transaction_crud(self) -> CRUDBase:
+    def _transaction_crud(self) -> CRUDTransactionSubtype:
         pass
 
+    @property
+    def _references(self) -> dict[str, CRUDBase]:
+        """
+        Request fields referencing user entities other than accounts, mapped to the CRUD used to load them
+        """
+        return {}
+
+    async def _get_account(self, account_id: UUID) -> AccountModel | None:
+        if account_id not in self._accounts:
+            self._accounts[account_id] = await account_crud.get_or_none(db=self.db,
+                                                                        id=account_id,
+                                                                        user_id=self.user_id)
+
+        return self._accounts[account_id]
+
+    async def _lock_accounts(self, account_ids: Collection[UUID]) -> None:
+        """
+        Locks every account the operation changes with one query before the first write, so concurrent
+        operations on the same accounts, e.g. opposite transfers, wait for each other instead of deadlocking.
+        The locked rows stay in the session, so validation and balance updates do not query them again.
+        Accounts already locked by the caller are skipped.
+        """
+        account_ids = [account_id for account_id in account_ids if account_id not in self._accounts]
+        if len(account_ids) == 0:
+            return
+
+        accounts_db: list[AccountModel] = await account_crud.lock_by_ids(db=self.db,
+                                                                         ids=account_ids,
+                                                                         user_id=self.user_id)
+        self._accounts.update({account_id: None for account_id in account_ids})
+        self._accounts.update({account_db.id: account_db for account_db in accounts_db})
+
+    async def _load_accounts(self, data: list[T]) -> None:
+        account_ids: set[UUID] = set()
+        for item in data:
+            account_ids.update(getattr(item, field) for field in ('from_account_id', 'to_account_id')
+                               if getattr(item, field, None) is not None)
+
+        await self._lock_accounts(account_ids=account_ids)
+
+    async def _retry_on_conflict(self, operation: Callable[[], Awaitable[R]]) -> R:
+        """
+        Runs `operation` in a savepoint. A deadlock or serialization failure rolls back only the savepoint,
+        which releases the locks taken by the operation, and the operation is repeated after a jittered
+        exponential backoff instead of failing the request.
+        Locks the caller took before the savepoint are kept, but the rolled back savepoint expires
+        the accounts it changed, so a retry locks them again to reload the rows.
+        """
+        for attempt in range(1, settings.lock_retry_attempts + 1):
+            self._accounts = dict(self._locked_accounts) if attempt == 1 else {}
+            self._referenced = {}
+            self._ledger_entries = []
+            try:
+                async with self.db.begin_nested():
+                    return await operation()
+
+            except DBAPIError as exc:
+                if getattr(exc.orig, 'sqlstate', None) not in RETRYABLE_SQLSTATES:
+                    raise
+
+                if attempt == settings.lock_retry_attempts:
+                    logger.error(f'{self._transaction_type} transaction of user {self.user_id} failed '
+                                 f'after {attempt} attempts: {exc.orig}')
+                    raise
+
+                delay: float = settings.lock_retry_backoff_seconds * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+                logger.warning(f'{self._transaction_type} transaction of user {self.user_id} attempt {attempt} '
+                               f'failed: {exc.orig}, retrying in {delay:.3f}s')
+                await asyncio.sleep(delay)
+
+    async def _validate_references(self, data: list[T]) -> None:
+        """
+        Loads the referenced entities of the user with one query per type, so relationships of new transactions
+        are resolved without queries. References to missing entities or to ones of other users are not found.
+        """
+        for field, crud in self._references.items():
+            ids: list[UUID] = list(dict.fromkeys(getattr(item, field) for item in data))
+            entities_db: list = await crud.get_by_ids(db=self.db, ids=ids, user_id=self.user_id)
+            self._referenced[field] = {entity_db.id: entity_db for entity_db in entities_db}
+            missing_ids: list[UUID] = [entity_id for entity_id in ids if entity_id not in self._referenced[field]]
+            if len(missing_ids) > 0:
+                raise EntityNotFound(entity=crud.model,
+                                     search_params={'id': missing_ids[0], 'user_id': self.user_id},
+                                     logger=logger)
+
     async def _validate_transaction_from_account(self, data: T, from_account_db: AccountModel | None) -> None:
         if from_account_db is None:
             raise EntityNotFound(entity=AccountModel, search_params={'id': data.from_account_id}, logger=logger)
@@ -85,51 +198,209 @@ class TransactionProcessor(ABC, Generic[T]):
     async def _prepare_transaction(self, data: T) -> TransactionCreate:
         pass
 
+    async def _change_from_account_balance(self, account_id: UUID, delta: Decimal) -> AccountModel:
+        account_db: AccountModel = await account_crud.update_orm(db=self.db,
+                                                                 id=account_id,
+                                                                 obj_in={'balance': AccountModel.balance + delta})
+        return account_db
+
+    async def _change_to_account_balance(self,
+                                         account_id: UUID,
+                                         delta: Decimal,
+                                         base_delta: Decimal,
+                                         initial_rate: Decimal) -> AccountModel:
+        """
+        Balance and base currency rate are recalculated from the current row values inside one UPDATE,
+        so concurrent transactions on the same account can not overwrite each other's result.
+        """
+        new_balance = AccountModel.balance + delta
+        current_base_balance = AccountModel.balance / AccountModel.base_currency_rate
+        new_base_rate = case((new_balance == 0, Decimal('0')),
+                             (AccountModel.currency == self.base_currency, Decimal('1')),
+                             (AccountModel.base_currency_rate == 0, initial_rate),
+                             else_=new_balance / (current_base_balance + base_delta))
+
+        update_data: dict = {'balance': func.round(new_balance, 2), 'base_currency_rate': func.round(new_base_rate, 4)}
+        account_db: AccountModel = await account_crud.update_orm(db=self.db, id=account_id, obj_in=update_data)
+        return account_db
+
+    def _add_ledger_entry(self,
+                          account_db: AccountModel,
+                          transaction_id: UUID,
+                          entry_date: date,
+                          amount: Decimal,
+                          base_currency_amount: Decimal | None = None) -> None:
+        """
+        Queues a ledger entry for `amount` applied to `account_db` by the transaction.
+        Without `base_currency_amount` the amount is converted with the account rate, which a change of
+        the source account balance keeps. Running balances are counted by the ledger in transaction date order.
+        """
+        if base_currency_amount is None:
+            base_currency_amount = Decimal('0')
+            if account_db.base_currency_rate != 0:
+                base_currency_amount = round(amount / account_db.base_currency_rate, 2)
+
+        self._ledger_entries.append(AccountLedgerEntryCreate(user_id=self.user_id,
+                                                             account_id=account_db.id,
+                                                             transaction_id=transaction_id,
+                                                             entry_date=entry_date,
+                                                             amount=amount,
+                                                             base_currency_amount=base_currency_amount))
+
+    async def _write_ledger(self) -> None:
+        await account_ledger_crud.add(db=self.db, objs_in=self._ledger_entries)
+        self._ledger_entries = []
+
     async def _update_from_account(self, transaction_db: TransactionModel) -> None:
         delta = transaction_db.source_amount if transaction_db.status == EntityStatusType.DELETED else -transaction_db.source_amount
-        new_balance: Decimal = transaction_db.from_account.balance + delta
-        await account_crud.update_orm(db=self.db,
-                                      id=transaction_db.from_account_id,
-                                      obj_in={'balance': new_balance})
+        account_db: AccountModel = await self._change_from_account_balance(account_id=transaction_db.from_account_id,
+                                                                           delta=delta)
+        self._add_ledger_entry(account_db=account_db,
+                               transaction_id=transaction_db.id,
+                               entry_date=transaction_db.transaction_date,
+                               amount=delta)
 
     async def _update_to_account(self, transaction_db: TransactionModel) -> None:
         delta = -transaction_db.destination_amount if transaction_db.status == EntityStatusType.DELETED else transaction_db.destination_amount
-        new_balance: Decimal = transaction_db.to_account.balance + delta
-        if new_balance == 0:
-            new_base_rate: Decimal = Decimal('0')
-        elif transaction_db.to_account.currency == self.base_currency:
-            new_base_rate: Decimal = Decimal('1')
-        elif transaction_db.to_account.base_currency_rate == 0:
-            new_base_rate: Decimal = transaction_db.destination_amount / transaction_db.source_amount
-        else:
-            current_base_balance: Decimal = transaction_db.to_account.balance / transaction_db.to_account.base_currency_rate
-            delta = -transaction_db.base_currency_amount if transaction_db.status == EntityStatusType.DELETED else transaction_db.base_currency_amount
-            new_base_balance: Decimal = current_base_balance + delta
-            new_base_rate: Decimal = new_balance / new_base_balance
-
-        new_balance: Decimal = new_balance.quantize(Decimal('0.01'), rounding=ROUND_HALF_EVEN)
-        new_base_rate: Decimal = new_base_rate.quantize(Decimal('0.0001'), rounding=ROUND_HALF_EVEN)
-        await account_crud.update_orm(db=self.db,
-                                      id=transaction_db.to_account_id,
-                                      obj_in={'balance': new_balance, 'base_currency_rate': new_base_rate})
+        base_delta = -transaction_db.base_currency_amount if transaction_db.status == EntityStatusType.DELETED else transaction_db.base_currency_amount
+        initial_rate: Decimal = transaction_db.destination_amount / transaction_db.source_amount
+        account_db: AccountModel = await self._change_to_account_balance(account_id=transaction_db.to_account_id,
+                                                                         delta=delta,
+                                                                         base_delta=base_delta,
+                                                                         initial_rate=initial_rate)
+        self._add_ledger_entry(account_db=account_db,
+                               transaction_id=transaction_db.id,
+                               entry_date=transaction_db.transaction_date,
+                               amount=delta,
+                               base_currency_amount=base_delta)
+
+    async def _update_rollups(self,
+                              transactions: list[TransactionCreate] | list[TransactionModel],
+                              is_delete: bool = False) -> None:
+        pass
+
+    async def _update_accounts(self, transactions_data: list[TransactionCreate], transaction_ids: list[UUID]) -> None:
+        """
+        Applies one net change per account for a batch of new transactions
+        """
+        from_accounts: dict[UUID, list[tuple[UUID, TransactionCreate]]] = defaultdict(list)
+        to_accounts: dict[UUID, list[tuple[UUID, TransactionCreate]]] = defaultdict(list)
+        for transaction_id, transaction_data in zip(transaction_ids, transactions_data):
+            if transaction_data.from_account_id is not None:
+                from_accounts[transaction_data.from_account_id].append((transaction_id, transaction_data))
+            if transaction_data.to_account_id is not None:
+                to_accounts[transaction_data.to_account_id].append((transaction_id, transaction_data))
+
+        for account_id in sorted(from_accounts):
+            delta: Decimal = sum(t.source_amount for _, t in from_accounts[account_id])
+            account_db: AccountModel = await self._change_from_account_balance(account_id=account_id, delta=-delta)
+            for transaction_id, transaction_data in from_accounts[account_id]:
+                self._add_ledger_entry(account_db=account_db,
+                                       transaction_id=transaction_id,
+                                       entry_date=transaction_data.transaction_date,
+                                       amount=-transaction_data.source_amount)
+
+        for account_id in sorted(to_accounts):
+            delta: Decimal = sum(t.destination_amount for _, t in to_accounts[account_id])
+            base_delta: Decimal = sum(t.base_currency_amount for _, t in to_accounts[account_id])
+            source_amount: Decimal = sum(t.source_amount for _, t in to_accounts[account_id])
+            account_db: AccountModel = await self._change_to_account_balance(account_id=account_id,
+                                                                             delta=delta,
+                                                                             base_delta=base_delta,
+                                                                             initial_rate=delta / source_amount)
+            for transaction_id, transaction_data in to_accounts[account_id]:
+                self._add_ledger_entry(account_db=account_db,
+                                       transaction_id=transaction_id,
+                                       entry_date=transaction_data.transaction_date,
+                                       amount=transaction_data.destination_amount,
+                                       base_currency_amount=transaction_data.base_currency_amount)
 
     async def create(self, data: T) -> Transaction:
+        transaction: Transaction = await self._retry_on_conflict(lambda: self._create(data=data.model_copy()))
+        return transaction
+
+    async def _create(self, data: T) -> Transaction:
         self.base_currency = await user_service.get_user_base_currency(db=self.db, user_id=self.user_id)
 
+        await self._load_accounts(data=[data])
+        await self._validate_references(data=[data])
         transaction_data: TransactionCreate = await self._prepare_transaction(data=data)
         try:
-            transaction_db: TransactionModel = await self._transaction_crud.create(db=self.db, obj_in=transaction_data)
+            transaction_db: TransactionModel = await self._transaction_crud.create(db=self.db,
+                                                                                   obj_in=transaction_data,
+                                                                                   load_relationships=False)
 
         except IntegrityError as exc:
             raise IntegrityException(entity=TransactionModel, exception=exc, logger=logger)
 
         await self._update_from_account(transaction_db=transaction_db)
         await self._update_to_account(transaction_db=transaction_db)
+        await self._write_ledger()
+        await self._update_rollups(transactions=[transaction_db])
+        await change_version_service.increment(db=self.db, user_ids=[self.user_id])
+        report_service.invalidate_net_worth(db=self.db,
+                                            user_id=self.user_id,
+                                            transaction_dates=[transaction_db.transaction_date])
 
         transaction: Transaction = Transaction.model_validate(transaction_db)
         return transaction
 
+    async def create_many(self, data: list[T]) -> list[Transaction]:
+        """
+        Batch version of `create`. Accounts and other referenced entities are loaded with one query per type,
+        transactions are inserted with multi-row INSERTs and every account balance is changed once.
+        Amounts are converted with the account rates as they were before the batch.
+        """
+        transactions: list[Transaction] = await self._retry_on_conflict(
+            lambda: self._create_many(data=[item.model_copy() for item in data])
+        )
+        return transactions
+
+    async def _create_many(self, data: list[T]) -> list[Transaction]:
+        self.base_currency = await user_service.get_user_base_currency(db=self.db, user_id=self.user_id)
+
+        await self._load_accounts(data=data)
+        await self._validate_references(data=data)
+        transactions_data: list[TransactionCreate] = [await self._prepare_transaction(data=item) for item in data]
+        try:
+            rows: list[Row] = await self._transaction_crud.create_batch_values(db=self.db, objs_in=transactions_data)
+
+        except IntegrityError as exc:
+            raise IntegrityException(entity=TransactionModel, exception=exc, logger=logger)
+
+        await self._update_accounts(transactions_data=transactions_data, transaction_ids=[row.id for row in rows])
+        await self._write_ledger()
+        await self._update_rollups(transactions=transactions_data)
+        await change_version_service.increment(db=self.db, user_ids=[self.user_id])
+        report_service.invalidate_net_worth(db=self.db,
+                                            user_id=self.user_id,
+                                            transaction_dates=[t.transaction_date for t in transactions_data])
+
+        transactions: list[Transaction] = [self._build_transaction(transaction_data=transaction_data, row=row)
+                                           for transaction_data, row in zip(transactions_data, rows)]
+        return transactions
+
+    def _build_transaction(self, transaction_data: TransactionCreate, row: Row) -> Transaction:
+        """
+        Response of a batch created transaction with the accounts and references loaded for the batch,
+        so it has the same related objects as the one returned by `create`
+        """
+        related: dict[str, Any] = {field.removesuffix('_id'): self._referenced[field][getattr(transaction_data, field)]
+                                   for field in self._references}
+        for field in ('from_account_id', 'to_account_id'):
+            account_id: UUID | None = getattr(transaction_data, field, None)
+            related[field.removesuffix('_id')] = self._accounts[account_id] if account_id is not None else None
+
+        transaction: Transaction = Transaction.model_validate({**transaction_data.model_dump(),
+                                                               **row._mapping,
+                                                               **related})
+        return transaction
+
     async def delete(self, transaction_id: UUID) -> Transaction:
+        transaction: Transaction = await self._retry_on_conflict(lambda: self._delete(transaction_id=transaction_id))
+        return transaction
+
+    async def _delete(self, transaction_id: UUID) -> Transaction:
         transaction_db: TransactionModel | None = await self._transaction_crud.get_or_none(db=self.db,
                                                                                            id=transaction_id,
                                                                                            user_id=self.user_id,
@@ -140,6 +411,9 @@ class TransactionProcessor(ABC, Generic[T]):
                                  search_params={'id': transaction_id, 'user_id': self.user_id},
                                  logger=logger)
 
+        account_ids: list[UUID] = [getattr(transaction_db, field) for field in ('from_account_id', 'to_account_id')
+                                   if getattr(transaction_db, field, None) is not None]
+        await self._lock_accounts(account_ids=account_ids)
         delete_update_data = {'status': EntityStatusType.DELETED}
         transaction_db: TransactionModel = await self._transaction_crud.update_api(db=self.db,
                                                                                    db_obj=transaction_db,
@@ -147,6 +421,12 @@ class TransactionProcessor(ABC, Generic[T]):
 
         await self._update_from_account(transaction_db=transaction_db)
         await self._update_to_account(transaction_db=transaction_db)
+        await self._write_ledger()
+        await self._update_rollups(transactions=[transaction_db], is_delete=True)
+        await change_version_service.increment(db=self.db, user_ids=[self.user_id])
+        report_service.invalidate_net_worth(db=self.db,
+                                            user_id=self.user_id,
+                                            transaction_dates=[transaction_db.transaction_date])
 
         transaction: Transaction = Transaction.model_validate(transaction_db)
         return transaction
@@ -1,13 +1,20 @@
+from datetime import date
 from decimal import Decimal
 
 from app.configs.logging_settings import get_logger
-from app.crud.accounting.account import account_crud
+from app.crud.accounting.category import category_crud
+from app.crud.accounting.expense_rollup import monthly_expense_rollup_crud
+from app.crud.accounting.location import location_crud
 from app.crud.accounting.transaction import CRUDExpenseTransaction, expense_transaction_crud
+from app.crud.base import CRUDBase
 from app.exceptions.forbidden_403 import AccountTypeMismatchException
 from app.models.accounting.account import Account as AccountModel
+from app.models.accounting.transaction import Transaction as TransactionModel
 from app.schemas.accounting.account import AccountType
+from app.schemas.accounting.report import ExpenseRollupUpdate
 from app.schemas.accounting.transaction import ExpenseRequest, Transaction, TransactionCreate, TransactionType
 from app.services.accounting.transaction_processor.base import TransactionProcessor
+from app.services.user import user_service
 
 logger = get_logger(__name__)
 
@@ -21,6 +28,10 @@ class Expense(TransactionProcessor[ExpenseRequest]):
     def _transaction_crud(self) -> CRUDExpenseTransaction:
         return expense_transaction_crud
 
+    @property
+    def _references(self) -> dict[str, CRUDBase]:
+        return {'category_id': category_crud, 'location_id': location_crud}
+
     async def _validate_transaction_from_account(self, data: ExpenseRequest,
                                                  from_account_db: AccountModel | None) -> None:
         await super()._validate_transaction_from_account(data=data, from_account_db=from_account_db)
@@ -35,9 +46,7 @@ class Expense(TransactionProcessor[ExpenseRequest]):
         pass
 
     async def _prepare_transaction(self, data: ExpenseRequest) -> TransactionCreate:
-        from_account: AccountModel | None = await account_crud.get_or_none(db=self.db,
-                                                                           id=data.from_account_id,
-                                                                           user_id=self.user_id)
+        from_account: AccountModel | None = await self._get_account(account_id=data.from_account_id)
         await self._validate_transaction_from_account(data=data, from_account_db=from_account)
 
         base_currency_amount: Decimal = data.source_amount / from_account.base_currency_rate
@@ -48,3 +57,28 @@ class Expense(TransactionProcessor[ExpenseRequest]):
 
     async def _update_to_account(self, transaction_db: Transaction, is_delete: bool = False) -> None:
         pass
+
+    async def _update_rollups(self,
+                              transactions: list[TransactionCreate] | list[TransactionModel],
+                              is_delete: bool = False) -> None:
+        if self.base_currency is None:
+            self.base_currency = await user_service.get_user_base_currency(db=self.db, user_id=self.user_id)
+
+        sign: int = -1 if is_delete else 1
+        rollups: dict[tuple, ExpenseRollupUpdate] = {}
+        for transaction in transactions:
+            month: date = transaction.transaction_date.replace(day=1)
+            key: tuple = (month, transaction.category_id, transaction.location_id)
+            if key not in rollups:
+                rollups[key] = ExpenseRollupUpdate(user_id=self.user_id,
+                                                   month=month,
+                                                   category_id=transaction.category_id,
+                                                   location_id=transaction.location_id,
+                                                   currency=self.base_currency,
+                                                   amount=Decimal('0'),
+                                                   transactions_count=0)
+
+            rollups[key].amount += sign * transaction.base_currency_amount
+            rollups[key].transactions_count += sign
+
+        await monthly_expense_rollup_crud.add(db=self.db, objs_in=list(rollups.values()))
@@ -1,6 +1,7 @@
 from app.configs.logging_settings import get_logger
-from app.crud.accounting.account import account_crud
+from app.crud.accounting.income_source import income_source_crud
 from app.crud.accounting.transaction import CRUDIncomeTransaction, income_transaction_crud
+from app.crud.base import CRUDBase
 from app.exceptions.forbidden_403 import AccountTypeMismatchException
 from app.models.accounting.account import Account as AccountModel
 from app.schemas.accounting.account import AccountType
@@ -19,6 +20,10 @@ class Income(TransactionProcessor[IncomeRequest]):
     def _transaction_crud(self) -> type[CRUDIncomeTransaction]:
         return income_transaction_crud
 
+    @property
+    def _references(self) -> dict[str, CRUDBase]:
+        return {'income_source_id': income_source_crud}
+
     async def _validate_transaction_from_account(self, data: IncomeRequest,
                                                  from_account_db: AccountModel | None) -> None:
         pass
@@ -33,9 +38,7 @@ class Income(TransactionProcessor[IncomeRequest]):
                                                logger=logger)
 
     async def _prepare_transaction(self, data: IncomeRequest) -> TransactionCreate:
-        to_account_db: AccountModel | None = await account_crud.get_or_none(db=self.db,
-                                                                            id=data.to_account_id,
-                                                                            user_id=self.user_id)
+        to_account_db: AccountModel | None = await self._get_account(account_id=data.to_account_id)
         await self._validate_transaction_to_account(data=data, to_account_db=to_account_db)
 
         transaction_data: TransactionCreate = TransactionCreate(**data.model_dump(),
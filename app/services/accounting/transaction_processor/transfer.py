@@ -1,7 +1,6 @@
 from decimal import Decimal, ROUND_HALF_EVEN
 
 from app.configs.logging_settings import get_logger
-from app.crud.accounting.account import account_crud
 from app.crud.accounting.transaction import CRUDTransferTransaction, transfer_transaction_crud
 from app.exceptions.forbidden_403 import NoAccountBaseCurrencyRate
 from app.exceptions.unprocessable_422 import UnprocessableException
@@ -38,12 +37,8 @@ class Transfer(TransactionProcessor[TransferRequest]):
                 raise NoAccountBaseCurrencyRate(account_id=to_account_db.id, logger=logger)
 
     async def _prepare_transaction(self, data: TransferRequest) -> TransactionCreate:
-        from_account_db: AccountModel | None = await account_crud.get_or_none(db=self.db,
-                                                                              id=data.from_account_id,
-                                                                              user_id=self.user_id)
-        to_account_db: AccountModel | None = await account_crud.get(db=self.db,
-                                                                    id=data.to_account_id,
-                                                                    user_id=self.user_id)
+        from_account_db: AccountModel | None = await self._get_account(account_id=data.from_account_id)
+        to_account_db: AccountModel | None = await self._get_account(account_id=data.to_account_id)
         await self._validate_transaction(data=data, to_account_db=to_account_db, from_account_db=from_account_db)
 
         # from base currency account -> to base currency account
@@ -1,25 +1,98 @@
+import csv
+import hashlib
+import io
+from typing import Any, AsyncIterator, Sequence
 from uuid import UUID
 
 from fastapi_pagination import Page
+from fastapi_pagination.cursor import CursorPage
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.configs.logging_settings import get_logger
+from app.configs.settings import settings
+from app.crud.accounting.account import account_crud
+from app.crud.accounting.idempotency_key import idempotency_key_crud
 from app.crud.accounting.transaction import transaction_crud
+from app.exceptions.conflict_409 import IdempotencyKeyWithoutResponse
 from app.exceptions.not_fount_404 import EntityNotFound
+from app.exceptions.unprocessable_422 import UnprocessableException
+from app.models.accounting.account import Account as AccountModel
 from app.models.accounting.transaction import Transaction as TransactionModel
-from app.schemas.accounting.transaction import Transaction, TransactionRequest
+from app.schemas.accounting.transaction import (ExportFormatType, Transaction, TransactionCreateRequest,
+                                                TransactionCursorRequest, TransactionExportRequest, TransactionExportRow,
+                                                TransactionRequest, TransactionType)
+from app.schemas.error_response import ErrorCodeType
+from app.services.accounting.transaction_processor.base import TransactionProcessor
+from app.utils.cache import LRUTTLCache
 
 logger = get_logger(__name__)
 
+# (user_id, idempotency key) -> (request hash, response) of committed requests, retries are answered without queries
+idempotency_cache: LRUTTLCache[tuple[UUID, str], tuple[str, Transaction]] = LRUTTLCache(
+    maxsize=settings.idempotency_cache_size,
+    ttl=min(settings.idempotency_cache_ttl_seconds, settings.idempotency_key_expire_seconds)
+)
+
 
 async def get_transactions(db: AsyncSession, request: TransactionRequest, user_id: UUID) -> Page[Transaction]:
-    transactions_db: Page[TransactionModel] = await transaction_crud.get_transactions(db=db,
-                                                                                      request=request,
-                                                                                      user_id=user_id)
-    transactions = Page[Transaction].model_validate(transactions_db)
+    transactions_db: Page[Row] = await transaction_crud.get_transactions(db=db, request=request, user_id=user_id)
+    transactions = Page[Transaction].model_validate({**dict(transactions_db),
+                                                     'items': [_nest_flat_row(row) for row in transactions_db.items]})
     return transactions
 
 
+def _nest_flat_row(row: Row) -> dict[str, Any]:
+    """
+    Columns labelled `<relationship>__<column>` become a nested object, `None` when the related row is missing
+    """
+    data: dict[str, Any] = {}
+    related: dict[str, dict[str, Any]] = {}
+    for key, value in row._mapping.items():
+        relationship, _, column = key.partition('__')
+        if column == '':
+            data[key] = value
+        else:
+            related.setdefault(relationship, {})[column] = value
+
+    for relationship, columns in related.items():
+        data[relationship] = None if columns['id'] is None else columns
+
+    return data
+
+
+async def get_transactions_cursor(db: AsyncSession,
+                                  request: TransactionCursorRequest,
+                                  user_id: UUID) -> CursorPage[Transaction]:
+    transactions_db: CursorPage[TransactionModel] = await transaction_crud.get_transactions_cursor(db=db,
+                                                                                                   request=request,
+                                                                                                   user_id=user_id)
+    transactions = CursorPage[Transaction].model_validate(transactions_db)
+    return transactions
+
+
+async def export_transactions(db: AsyncSession,
+                              request: TransactionExportRequest,
+                              user_id: UUID) -> AsyncIterator[str]:
+    """
+    Yields the export chunk by chunk, one chunk per fetched batch of rows
+    """
+    if request.export_format == ExportFormatType.CSV:
+        yield ','.join(TransactionExportRow.model_fields) + '\r\n'
+
+    rows: Sequence[Row]
+    async for rows in transaction_crud.stream_transactions(db=db, request=request, user_id=user_id):
+        if request.export_format == ExportFormatType.CSV:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerows(TransactionExportRow.model_validate(row._mapping).model_dump(mode='json').values()
+                             for row in rows)
+            yield buffer.getvalue()
+
+        else:
+            yield ''.join(TransactionExportRow.model_validate(row._mapping).model_dump_json() + '\n' for row in rows)
+
+
 async def get_transaction(db: AsyncSession, transaction_id: UUID, user_id: UUID) -> Transaction:
     transaction_db: TransactionModel | None = await transaction_crud.get_or_none(db=db,
                                                                                  id=transaction_id,
@@ -32,3 +105,100 @@ async def get_transaction(db: AsyncSession, transaction_id: UUID, user_id: UUID)
 
     transaction: Transaction = Transaction.model_validate(transaction_db)
     return transaction
+
+
+async def create_transaction(db: AsyncSession,
+                             create_data: TransactionCreateRequest,
+                             user_id: UUID,
+                             idempotency_key: str | None = None) -> Transaction:
+    """
+    A request repeated with the same `idempotency_key` gets the response of the first one and creates nothing.
+    Until the first request commits its duplicates wait for it on the key row.
+    """
+    if idempotency_key is None:
+        return await _create_transaction(db=db, create_data=create_data, user_id=user_id)
+
+    request_hash: str = hashlib.sha256(create_data.model_dump_json().encode()).hexdigest()
+    cache_key: tuple[UUID, str] = (user_id, idempotency_key)
+    cached: tuple[str, Transaction] | None = idempotency_cache.get(cache_key)
+    if cached is not None:
+        return _replay_transaction(idempotency_key=idempotency_key, request_hash=request_hash, stored=cached)
+
+    claimed: bool = await idempotency_key_crud.claim(db=db,
+                                                     user_id=user_id,
+                                                     key=idempotency_key,
+                                                     request_hash=request_hash,
+                                                     expire_seconds=settings.idempotency_key_expire_seconds)
+    if not claimed:
+        stored_db: Row | None = await idempotency_key_crud.get_response(db=db, user_id=user_id, key=idempotency_key)
+        # the key of a request that failed after its transaction was committed has no response to replay
+        if stored_db is None or stored_db.response is None:
+            raise IdempotencyKeyWithoutResponse(key=idempotency_key, logger=logger)
+
+        stored: tuple[str, Transaction] = (stored_db.request_hash, Transaction.model_validate(stored_db.response))
+        idempotency_cache.set(cache_key, stored)
+        return _replay_transaction(idempotency_key=idempotency_key, request_hash=request_hash, stored=stored)
+
+    transaction: Transaction = await _create_transaction(db=db, create_data=create_data, user_id=user_id)
+    await idempotency_key_crud.set_response(db=db,
+                                            user_id=user_id,
+                                            key=idempotency_key,
+                                            response=transaction.model_dump(mode='json'))
+    return transaction
+
+
+async def _create_transaction(db: AsyncSession, create_data: TransactionCreateRequest, user_id: UUID) -> Transaction:
+    transaction_processor: TransactionProcessor = TransactionProcessor.factory(db=db,
+                                                                               user_id=user_id,
+                                                                               transaction_type=create_data.transaction_type)
+    transaction: Transaction = await transaction_processor.create(data=create_data)
+    return transaction
+
+
+def _replay_transaction(idempotency_key: str, request_hash: str, stored: tuple[str, Transaction]) -> Transaction:
+    stored_hash, transaction = stored
+    if stored_hash != request_hash:
+        raise UnprocessableException(log_message=f'Idempotency key {idempotency_key} is reused for another request',
+                                     logger=logger,
+                                     message='Idempotency key is reused for another request',
+                                     error_code=ErrorCodeType.IDEMPOTENCY_KEY_REUSED)
+
+    return transaction
+
+
+async def create_transactions(db: AsyncSession,
+                              create_data: list[TransactionCreateRequest],
+                              user_id: UUID) -> list[Transaction]:
+    """
+    Incomes are created first, then transfers and expenses, so money received in the same batch
+    can be spent by it. The result keeps the order of `create_data`.
+    Every account of the batch is locked once in id order before the first phase, so concurrent batches
+    queue up on the accounts instead of deadlocking on locks taken phase by phase.
+    """
+    if len(create_data) > settings.max_transactions_per_batch:
+        raise UnprocessableException(log_message=f'Batch of {len(create_data)} transactions exceeds '
+                                                 f'the limit of {settings.max_transactions_per_batch}',
+                                     logger=logger)
+
+    account_ids: set[UUID] = {getattr(data, field) for data in create_data
+                              for field in ('from_account_id', 'to_account_id')
+                              if getattr(data, field, None) is not None}
+    accounts_db: list[AccountModel] = await account_crud.lock_by_ids(db=db, ids=account_ids, user_id=user_id)
+    locked_accounts: dict[UUID, AccountModel | None] = {account_id: None for account_id in account_ids}
+    locked_accounts.update({account_db.id: account_db for account_db in accounts_db})
+
+    transactions: list[Transaction | None] = [None] * len(create_data)
+    for transaction_type in [TransactionType.INCOME, TransactionType.TRANSFER, TransactionType.EXPENSE]:
+        indexes: list[int] = [i for i, data in enumerate(create_data) if data.transaction_type == transaction_type]
+        if len(indexes) == 0:
+            continue
+
+        transaction_processor: TransactionProcessor = TransactionProcessor.factory(db=db,
+                                                                                   user_id=user_id,
+                                                                                   transaction_type=transaction_type,
+                                                                                   locked_accounts=locked_accounts)
+        created: list[Transaction] = await transaction_processor.create_many(data=[create_data[i] for i in indexes])
+        for i, transaction in zip(indexes, created):
+            transactions[i] = transaction
+
+    return transactions
@@ -0,0 +1,39 @@
+import hashlib
+from typing import Collection
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.configs.logging_settings import get_logger
+from app.crud.user.change_version import user_change_version_crud
+
+logger = get_logger(__name__)
+
+
+async def get_version(db: AsyncSession, user_id: UUID) -> int:
+    version: int = await user_change_version_crud.get_version(db=db, user_id=user_id)
+    return version
+
+
+async def increment(db: AsyncSession, user_ids: Collection[UUID]) -> None:
+    """
+    Called in the transaction of every change of the user accounting data, so cached responses get stale
+    """
+    await user_change_version_crud.increment(db=db, user_ids=set(user_ids))
+
+
+def build_etag(user_id: UUID, version: int, key: str) -> str:
+    """
+    Weak ETag of a response identified by `key` for the user data at `version`
+    """
+    digest: str = hashlib.sha256(f'{user_id}:{version}:{key}'.encode()).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def etag_matches(etag: str, if_none_match: str | None) -> bool:
+    if if_none_match is None:
+        return False
+
+    # weak comparison: W/ prefixes are ignored
+    tags: set[str] = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    return '*' in tags or etag.removeprefix('W/') in tags
@@ -1,17 +1,27 @@
 from datetime import datetime, timedelta
 from uuid import UUID
 
+from sqlalchemy import event, Row
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session as DBSession
 
 from app.configs.logging_settings import get_logger
 from app.configs.settings import settings
 from app.crud.user.session import user_session_crud
+from app.exceptions.unauthorized_401 import SessionExpiredException
 from app.models.user.session import Session as SessionModel
 from app.schemas.user.external_user import ProviderType
 from app.schemas.user.session import AuthData, Session, UserSessionCreate
+from app.utils.cache import LRUTTLCache
 
 logger = get_logger(__name__)
 
+# token -> user_id. Revocation in another process is picked up after at most `session_cache_ttl_seconds`
+session_cache: LRUTTLCache[UUID, UUID] = LRUTTLCache(maxsize=settings.session_cache_size,
+                                                     ttl=settings.session_cache_ttl_seconds)
+# session info key of the revoked tokens to drop from the cache when the session commits
+SESSION_REVOCATIONS: str = 'session_revocations'
+
 
 async def create_session(db: AsyncSession,
                          user_id: UUID,
@@ -32,5 +42,39 @@ async def create_session(db: AsyncSession,
     return session
 
 
+async def get_user_id(db: AsyncSession, token: UUID) -> UUID:
+    user_id: UUID | None = session_cache.get(token)
+    if user_id is not None:
+        return user_id
+
+    session_db: Row | None = await user_session_crud.get_active_session_owner(db=db, session_id=token)
+    if session_db is None:
+        raise SessionExpiredException(token=token, logger=logger)
+
+    session_cache.set(token, session_db.user_id, ttl=(session_db.expires_at - datetime.now()).total_seconds())
+    return session_db.user_id
+
+
 async def revoke_session(db: AsyncSession, token: UUID) -> None:
+    """
+    The token stays cached until the revocation commits, otherwise a concurrent request
+    could cache it again from the row that is not revoked yet
+    """
     await user_session_crud.revoke(db=db, id=token)
+    db.info.setdefault(SESSION_REVOCATIONS, set()).add(token)
+
+
+@event.listens_for(DBSession, 'after_commit')
+def _drop_revoked_sessions(session: DBSession) -> None:
+    # released savepoints are committed only with the outer transaction
+    if session.in_nested_transaction():
+        return
+    for token in session.info.pop(SESSION_REVOCATIONS, ()):
+        session_cache.pop(token)
+
+
+@event.listens_for(DBSession, 'after_rollback')
+def _keep_sessions(session: DBSession) -> None:
+    if session.in_nested_transaction():
+        return
+    session.info.pop(SESSION_REVOCATIONS, None)
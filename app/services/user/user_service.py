@@ -1,9 +1,11 @@
 from uuid import UUID
 
+from sqlalchemy import Row
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.configs.logging_settings import get_logger
+from app.configs.settings import settings
 from app.crud.user.external_user import external_user_crud
 from app.crud.user.user import user_crud
 from app.exceptions.conflict_409 import IntegrityException
@@ -13,11 +15,16 @@ from app.models.user.external_user import ExternalUser as ExternalUserModel
 from app.schemas.base import CurrencyType
 from app.schemas.user.external_user import ExternalUserCreate
 from app.schemas.user.session import AuthData
-from app.schemas.user.user import UserCreate
+from app.schemas.user.user import UserCreate, UserProfile
 from app.services.accounting import account_service
+from app.utils.cache import LRUTTLCache
 
 logger = get_logger(__name__)
 
+# user_id -> profile. Changes made by another process are picked up after at most `user_profile_cache_ttl_seconds`
+user_profile_cache: LRUTTLCache[UUID, UserProfile] = LRUTTLCache(maxsize=settings.user_profile_cache_size,
+                                                                 ttl=settings.user_profile_cache_ttl_seconds)
+
 
 async def create_user(*, db: AsyncSession, auth_data: AuthData, base_currency: CurrencyType) -> UserModel:
     user_create = UserCreate(username=auth_data.username,
@@ -48,9 +55,27 @@ async def create_user(*, db: AsyncSession, auth_data: AuthData, base_currency: C
     return user_db
 
 
-async def get_user_base_currency(*, db: AsyncSession, user_id: UUID) -> CurrencyType:
-    user_db: UserModel | None = await user_crud.get_or_none(db=db, id=user_id)
-    if user_db is None:
+async def get_user_profile(*, db: AsyncSession, user_id: UUID) -> UserProfile:
+    user_profile: UserProfile | None = user_profile_cache.get(user_id)
+    if user_profile is not None:
+        return user_profile
+
+    profile_db: Row | None = await user_crud.get_profile(db=db, user_id=user_id)
+    if profile_db is None:
         raise EntityNotFound(entity=UserModel, search_params={'id': user_id}, logger=logger)
 
-    return user_db.base_currency
+    user_profile = UserProfile.model_validate(profile_db)
+    user_profile_cache.set(user_id, user_profile)
+    return user_profile
+
+
+def invalidate_user_profile(user_id: UUID) -> None:
+    """
+    Must be called after the base currency or other profile data of the user is changed
+    """
+    user_profile_cache.pop(user_id)
+
+
+async def get_user_base_currency(*, db: AsyncSession, user_id: UUID) -> CurrencyType:
+    user_profile: UserProfile = await get_user_profile(db=db, user_id=user_id)
+    return user_profile.base_currency
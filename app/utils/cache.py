@@ -0,0 +1,57 @@
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class LRUTTLCache(Generic[K, V]):
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        In-process cache bounded by size and by entry age. The least recently used entry is evicted first.
+
+        **Parameters**
+
+        * `maxsize`: Max number of entries
+        * `ttl`: Default entry lifetime in seconds
+        """
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        item: tuple[float, V] | None = self._data.get(key)
+        if item is None or item[0] <= time.monotonic():
+            if item is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:  # noqa: A003
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        return {'size': len(self._data), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,27 @@
+import re
+
+_WORD_PATTERN = re.compile(r'[^\W_]+')
+
+
+def word_trigrams(text: str) -> set[str]:
+    """
+    Trigrams of every word of `text` padded the way pg_trgm does it: two spaces in front and one behind
+    """
+    trigrams: set[str] = set()
+    for word in _WORD_PATTERN.findall(text.lower()):
+        padded: str = f'  {word} '
+        trigrams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+
+def similarity(text: str, term: str) -> float:
+    """
+    Same value as pg_trgm `similarity(text, term)`: shared trigrams divided by all distinct trigrams of both
+    """
+    text_trigrams: set[str] = word_trigrams(text)
+    term_trigrams: set[str] = word_trigrams(term)
+    union: set[str] = text_trigrams | term_trigrams
+    if len(union) == 0:
+        return 0.0
+
+    return len(text_trigrams & term_trigrams) / len(union)
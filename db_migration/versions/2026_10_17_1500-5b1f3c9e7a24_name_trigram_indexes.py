@@ -0,0 +1,35 @@
+"""Name trigram indexes
+
+Revision ID: 5b1f3c9e7a24
+Revises: e0839b56d66d
+Create Date: 2026-10-17 15:00:12.402817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1f3c9e7a24'
+down_revision: Union[str, None] = 'e0839b56d66d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES: tuple[str, ...] = ('categories', 'locations', 'income_sources')
+COLUMNS: tuple[str, ...] = ('name', 'description')
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table in TABLES:
+        for column in COLUMNS:
+            op.create_index(f'ix_{table}_{column}_trgm', table, [column], unique=False, postgresql_using='gin',
+                            postgresql_ops={column: 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        for column in COLUMNS:
+            op.drop_index(f'ix_{table}_{column}_trgm', table_name=table, postgresql_using='gin',
+                          postgresql_ops={column: 'gin_trgm_ops'})
@@ -16,6 +16,7 @@ from app.schemas.accounting.account import Account, AccountCreateRequest, Accoun
 from app.schemas.base import CurrencyType, EntityStatusType
 from app.schemas.error_response import ErrorCodeType
 from app.services.accounting import account_service
+from tests.helpers import assert_query_count
 
 
 @pytest.mark.asyncio
@@ -107,6 +108,26 @@ async def test_create_account_max_limit(db: AsyncSession, db_transaction: AsyncS
     assert len(transactions) == 2
 
 
+@pytest.mark.asyncio
+async def test_create_standard_accounts(db: AsyncSession):
+    # Arrange
+    user_id: UUID = uuid4()
+
+    # Act
+    with assert_query_count(1):
+        await account_service.create_standard_accounts(db=db, user_id=user_id, base_currency=CurrencyType.USD)
+    await db.commit()
+
+    # Assert
+    accounts: list[Account] = await account_service.get_accounts(db=db, user_id=user_id)
+    assert len(accounts) == len(AccountType)
+    assert {account.account_type for account in accounts} == set(AccountType)
+    for account in accounts:
+        assert account.id is not None
+        assert account.currency == CurrencyType.USD
+        assert account.status == EntityStatusType.ACTIVE
+
+
 @pytest.mark.asyncio
 async def test_get_accounts(db: AsyncSession):
     # Arrange
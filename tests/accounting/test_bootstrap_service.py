@@ -0,0 +1,58 @@
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.accounting.account import account_crud
+from app.crud.accounting.category import category_crud
+from app.crud.accounting.income_source import income_source_crud
+from app.crud.accounting.location import location_crud
+from app.schemas.accounting.account import AccountType
+from app.schemas.accounting.bootstrap import Bootstrap
+from app.schemas.accounting.category import CategoryCreate, CategoryType
+from app.schemas.accounting.income_source import IncomeSourceCreate
+from app.schemas.accounting.location import LocationCreate
+from app.schemas.base import CurrencyType, EntityStatusType
+from app.services.accounting import bootstrap_service
+
+
+@pytest.mark.asyncio
+async def test_get_bootstrap(db: AsyncSession):
+    # Arrange
+    user_id: UUID = uuid4()
+    for i in range(2):
+        await account_crud.create(db=db, obj_in={'user_id': user_id,
+                                                 'name': f'Checking {i}',
+                                                 'currency': CurrencyType.USD,
+                                                 'account_type': AccountType.CHECKING})
+    await account_crud.create(db=db, obj_in={'user_id': user_id,
+                                             'name': 'Closed',
+                                             'currency': CurrencyType.USD,
+                                             'account_type': AccountType.CHECKING,
+                                             'status': EntityStatusType.DELETED})
+    await category_crud.create(db=db, obj_in=CategoryCreate(user_id=user_id, name='Food', type=CategoryType.GENERAL))
+    await category_crud.create(db=db, obj_in=CategoryCreate(user_id=uuid4(), name='Food', type=CategoryType.GENERAL))
+    await location_crud.create(db=db, obj_in=LocationCreate(user_id=user_id, name='Some shop'))
+    await income_source_crud.create(db=db, obj_in=IncomeSourceCreate(user_id=user_id, name='Best Job'))
+    await db.commit()
+
+    # Act
+    bootstrap: Bootstrap = await bootstrap_service.get_bootstrap(db=db, user_id=user_id)
+    bootstrap_same: Bootstrap = await bootstrap_service.get_bootstrap(db=db, user_id=user_id)
+    await account_crud.update_orm(db=db,
+                                  obj_in={'balance': Decimal('10')},
+                                  commit=True,
+                                  name='Checking 0',
+                                  user_id=user_id)
+    bootstrap_changed: Bootstrap = await bootstrap_service.get_bootstrap(db=db, user_id=user_id)
+
+    # Assert
+    assert sorted(a.name for a in bootstrap.accounts) == ['Checking 0', 'Checking 1']
+    assert [c.name for c in bootstrap.categories] == ['Food']
+    assert [location.name for location in bootstrap.locations] == ['Some shop']
+    assert [source.name for source in bootstrap.income_sources] == ['Best Job']
+
+    assert len(bootstrap.content_hash) == 64
+    assert bootstrap_same.content_hash == bootstrap.content_hash
+    assert bootstrap_changed.content_hash != bootstrap.content_hash
@@ -2,11 +2,12 @@ from uuid import UUID, uuid4
 
 import pytest
 from fastapi_pagination import Page
-from sqlalchemy import select
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from app.configs.logging_settings import LogLevelType
+from app.crud.search import has_trigram_support
 from app.exceptions.conflict_409 import IntegrityException
 from app.exceptions.not_fount_404 import EntityNotFound
 from app.models.accounting.category import Category as CategoryModel
@@ -117,6 +118,60 @@ async def test_get_categories(db: AsyncSession):
     assert len(categories_not_found.items) == 0
 
 
+@pytest.mark.asyncio
+async def test_get_categories_search_ranked(db: AsyncSession):
+    # Arrange
+    user_id = uuid4()
+    for name, description in [('Seafood restaurant', None), ('Fast food', None), ('Food', None),
+                              ('Groceries', 'Food and drinks'), ('Taxi', None)]:
+        create_data: CategoryCreateRequest = CategoryCreateRequest(name=name,
+                                                                   description=description,
+                                                                   type=CategoryType.GENERAL)
+        await category_service.create_category(db=db, create_data=create_data, user_id=user_id)
+    await db.commit()
+
+    # Act
+    categories: Page[Category] = await category_service.get_categories(db=db,
+                                                                       request=CategoryRequest(search_term='food'),
+                                                                       user_id=user_id)
+
+    # Assert
+    assert categories.total == 4
+    assert [c.name for c in categories.items] == ['Food', 'Fast food', 'Groceries', 'Seafood restaurant']
+
+
+@pytest.mark.asyncio
+async def test_get_categories_search_trigram(db: AsyncSession):
+    # Arrange
+    if not await db.scalar(text("SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm')")):
+        pytest.skip('pg_trgm extension is not available')
+    await db.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+    await db.commit()
+
+    user_id = uuid4()
+    for name, description in [('Seafood restaurant', None), ('Fast food', None), ('Food', None),
+                              ('Groceries', 'Food and drinks'), ('Taxi', None), ('100% food', None)]:
+        create_data: CategoryCreateRequest = CategoryCreateRequest(name=name,
+                                                                   description=description,
+                                                                   type=CategoryType.GENERAL)
+        await category_service.create_category(db=db, create_data=create_data, user_id=user_id)
+    await db.commit()
+
+    # Act
+    categories: Page[Category] = await category_service.get_categories(
+        db=db, request=CategoryRequest(search_term='food'), user_id=user_id
+    )
+    categories_percent: Page[Category] = await category_service.get_categories(
+        db=db, request=CategoryRequest(search_term='0% f'), user_id=user_id
+    )
+
+    # Assert
+    assert await has_trigram_support(db)
+    assert categories.total == 5
+    assert [c.name for c in categories.items] == ['Food', '100% food', 'Fast food', 'Groceries', 'Seafood restaurant']
+    assert [c.name for c in categories_percent.items] == ['100% food']
+
+
 @pytest.mark.asyncio
 async def test_get_category_ok(db: AsyncSession):
     # Arrange
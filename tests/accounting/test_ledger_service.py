@@ -0,0 +1,266 @@
+from datetime import date
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from app.crud.accounting.account import account_crud
+from app.crud.user.user import user_crud
+from app.exceptions.not_fount_404 import EntityNotFound
+from app.models.accounting.account import Account as AccountModel
+from app.models.accounting.account_ledger import AccountLedgerEntry
+from app.models.user.user import User as UserModel
+from app.schemas.accounting.account import AccountType
+from app.schemas.accounting.account_ledger import BalancePoint, LedgerEntryType
+from app.schemas.accounting.transaction import Transaction, TransactionType, TransferRequest
+from app.schemas.base import CurrencyType
+from app.schemas.user.external_user import ProviderType
+from app.schemas.user.user import UserCreate
+from app.services.accounting import ledger_service
+from app.services.accounting.transaction_processor.base import TransactionProcessor
+
+
+async def _create_accounts(db: AsyncSession) -> tuple[UUID, AccountModel, AccountModel]:
+    user_create_data: UserCreate = UserCreate(username='test',
+                                              registration_provider=ProviderType.TELEGRAM,
+                                              base_currency=CurrencyType.USD)
+    user_db: UserModel = await user_crud.create(db=db, obj_in=user_create_data, commit=True)
+
+    account_from_db: AccountModel = await account_crud.create(db=db,
+                                                              obj_in={'user_id': user_db.id,
+                                                                      'name': 'Income USD',
+                                                                      'currency': CurrencyType.USD,
+                                                                      'account_type': AccountType.INCOME,
+                                                                      'base_currency_rate': Decimal('1')},
+                                                              commit=True)
+    account_to_db: AccountModel = await account_crud.create(db=db,
+                                                            obj_in={'user_id': user_db.id,
+                                                                    'name': 'Checking USD',
+                                                                    'currency': CurrencyType.USD,
+                                                                    'account_type': AccountType.CHECKING},
+                                                            commit=True)
+    return user_db.id, account_from_db, account_to_db
+
+
+def _transfer(account_from_db: AccountModel,
+              account_to_db: AccountModel,
+              amount: Decimal,
+              transaction_date: date = date(2025, 2, 10)) -> TransferRequest:
+    transfer_data: TransferRequest = TransferRequest(transaction_date=transaction_date,
+                                                     source_amount=amount,
+                                                     source_currency=CurrencyType.USD,
+                                                     destination_currency=CurrencyType.USD,
+                                                     from_account_id=account_from_db.id,
+                                                     to_account_id=account_to_db.id)
+    return transfer_data
+
+
+async def _get_entries(db: AsyncSession, account_id: UUID) -> list[AccountLedgerEntry]:
+    query = select(AccountLedgerEntry).where(AccountLedgerEntry.account_id == account_id).order_by(AccountLedgerEntry.id)
+    entries: list[AccountLedgerEntry] = (await db.scalars(query)).all()
+    return entries
+
+
+@pytest.mark.asyncio
+async def test_transactions_write_ledger(db: AsyncSession, db_transaction: AsyncSession):
+    # Arrange
+    user_id, account_from_db, account_to_db = await _create_accounts(db=db)
+    transaction_processor: TransactionProcessor = TransactionProcessor.factory(db=db_transaction,
+                                                                               user_id=user_id,
+                                                                               transaction_type=TransactionType.TRANSFER)
+
+    # Act
+    transaction: Transaction = await transaction_processor.create(
+        data=_transfer(account_from_db=account_from_db, account_to_db=account_to_db, amount=Decimal('10'))
+    )
+    await transaction_processor.create(
+        data=_transfer(account_from_db=account_from_db, account_to_db=account_to_db, amount=Decimal('5'))
+    )
+    await transaction_processor.delete(transaction_id=transaction.id)
+    await db_transaction.commit()
+
+    # Assert
+    entries_from: list[AccountLedgerEntry] = await _get_entries(db=db, account_id=account_from_db.id)
+    assert [e.amount for e in entries_from] == [Decimal('-10'), Decimal('-5'), Decimal('10')]
+    assert [e.balance for e in entries_from] == [Decimal('-10'), Decimal('-15'), Decimal('-5')]
+    assert [e.base_currency_balance for e in entries_from] == [Decimal('-10'), Decimal('-15'), Decimal('-5')]
+    assert entries_from[0].transaction_id == entries_from[2].transaction_id == transaction.id
+    assert all(e.entry_type == LedgerEntryType.MOVEMENT for e in entries_from)
+    assert all(e.entry_date == date(2025, 2, 10) for e in entries_from)
+    assert all(e.user_id == user_id for e in entries_from)
+
+    entries_to: list[AccountLedgerEntry] = await _get_entries(db=db, account_id=account_to_db.id)
+    assert [e.amount for e in entries_to] == [Decimal('10'), Decimal('5'), Decimal('-10')]
+    assert [e.balance for e in entries_to] == [Decimal('10'), Decimal('15'), Decimal('5')]
+    assert [e.base_currency_balance for e in entries_to] == [Decimal('10'), Decimal('15'), Decimal('5')]
+
+
+@pytest.mark.asyncio
+async def test_create_many_writes_running_balances(db: AsyncSession, db_transaction: AsyncSession):
+    # Arrange
+    user_id, account_from_db, account_to_db = await _create_accounts(db=db)
+    transaction_processor: TransactionProcessor = TransactionProcessor.factory(db=db_transaction,
+                                                                               user_id=user_id,
+                                                                               transaction_type=TransactionType.TRANSFER)
+    transfers_data: list[TransferRequest] = [
+        _transfer(account_from_db=account_from_db, account_to_db=account_to_db, amount=amount)
+        for amount in [Decimal('10'), Decimal('5'), Decimal('1')]
+    ]
+
+    # Act
+    transactions: list[Transaction] = await transaction_processor.create_many(data=transfers_data)
+    await db_transaction.commit()
+
+    # Assert
+    entries_from: list[AccountLedgerEntry] = await _get_entries(db=db, account_id=account_from_db.id)
+    assert [e.balance for e in entries_from] == [Decimal('-10'), Decimal('-15'), Decimal('-16')]
+    assert [e.transaction_id for e in entries_from] == [t.id for t in transactions]
+
+    entries_to: list[AccountLedgerEntry] = await _get_entries(db=db, account_id=account_to_db.id)
+    assert [e.balance for e in entries_to] == [Decimal('10'), Decimal('15'), Decimal('16')]
+    assert [e.transaction_id for e in entries_to] == [t.id for t in transactions]
+
+
+@pytest.mark.asyncio
+async def test_create_many_base_currency_balances(db: AsyncSession, db_transaction: AsyncSession):
+    # Arrange
+    user_id, account_from_db, _ = await _create_accounts(db=db)
+    account_to_db: AccountModel = await account_crud.create(db=db,
+                                                            obj_in={'user_id': user_id,
+                                                                    'name': 'Checking EUR',
+                                                                    'currency': CurrencyType.EUR,
+                                                                    'account_type': AccountType.CHECKING},
+                                                            commit=True)
+    transaction_processor: TransactionProcessor = TransactionProcessor.factory(db=db_transaction,
+                                                                               user_id=user_id,
+                                                                               transaction_type=TransactionType.TRANSFER)
+    transfers_data: list[TransferRequest] = [TransferRequest(transaction_date=date(2025, 2, 10),
+                                                             source_amount=Decimal('10'),
+                                                             source_currency=CurrencyType.USD,
+                                                             destination_amount=destination_amount,
+                                                             destination_currency=CurrencyType.EUR,
+                                                             from_account_id=account_from_db.id,
+                                                             to_account_id=account_to_db.id)
+                                             for destination_amount in [Decimal('9'), Decimal('8')]]
+
+    # Act
+    await transaction_processor.create_many(data=transfers_data)
+    await db_transaction.commit()
+
+    # Assert
+    entries_to: list[AccountLedgerEntry] = await _get_entries(db=db, account_id=account_to_db.id)
+    assert [e.balance for e in entries_to] == [Decimal('9'), Decimal('17')]
+    assert [e.base_currency_balance for e in entries_to] == [Decimal('10'), Decimal('20')]
+
+
+@pytest.mark.asyncio
+async def test_back_dated_transaction_keeps_date_order(db: AsyncSession):
+    # Arrange
+    user_id, account_from_db, account_to_db = await _create_accounts(db=db)
+    transaction_processor: TransactionProcessor = TransactionProcessor.factory(db=db,
+                                                                               user_id=user_id,
+                                                                               transaction_type=TransactionType.TRANSFER)
+    await transaction_processor.create(
+        data=_transfer(account_from_db=account_from_db, account_to_db=account_to_db, amount=Decimal('10'))
+    )
+    await ledger_service.create_checkpoints(db=db, day=date(2025, 2, 10))
+    await db.commit()
+
+    # Act
+    await transaction_processor.create_many(data=[
+        _transfer(account_from_db=account_from_db,
+                  account_to_db=account_to_db,
+                  amount=amount,
+                  transaction_date=transaction_date)
+        for amount, transaction_date in [(Decimal('1'), date(2025, 2, 12)), (Decimal('5'), date(2025, 2, 1))]
+    ])
+    await db.commit()
+    balance: BalancePoint = await ledger_service.get_balance(db=db,
+                                                             user_id=user_id,
+                                                             account_id=account_to_db.id,
+                                                             on_date=date(2025, 2, 5))
+    history: list[BalancePoint] = await ledger_service.get_balance_history(db=db,
+                                                                           user_id=user_id,
+                                                                           account_id=account_to_db.id,
+                                                                           date_from=date(2025, 2, 10),
+                                                                           date_to=date(2025, 2, 12))
+
+    # Assert
+    query = (select(AccountLedgerEntry)
+             .where(AccountLedgerEntry.account_id == account_to_db.id)
+             .order_by(AccountLedgerEntry.entry_date, AccountLedgerEntry.id))
+    entries: list[AccountLedgerEntry] = (await db.scalars(query)).all()
+    assert [(e.entry_date, e.entry_type, e.amount, e.balance) for e in entries] == [
+        (date(2025, 2, 1), LedgerEntryType.MOVEMENT, Decimal('5'), Decimal('5')),
+        (date(2025, 2, 10), LedgerEntryType.MOVEMENT, Decimal('10'), Decimal('15')),
+        (date(2025, 2, 10), LedgerEntryType.CHECKPOINT, Decimal('0'), Decimal('15')),
+        (date(2025, 2, 12), LedgerEntryType.MOVEMENT, Decimal('1'), Decimal('16')),
+    ]
+    assert [e.base_currency_balance for e in entries] == [e.balance for e in entries]
+
+    assert balance.balance == Decimal('5')
+    assert [point.balance for point in history] == [Decimal('15'), Decimal('15'), Decimal('16')]
+
+
+@pytest.mark.asyncio
+async def test_get_balance_history(db: AsyncSession):
+    # Arrange
+    user_id, account_db, _ = await _create_accounts(db=db)
+    movements: list[tuple[date, Decimal]] = [(date(2025, 3, 1), Decimal('10')),
+                                             (date(2025, 3, 1), Decimal('20')),
+                                             (date(2025, 3, 3), Decimal('5'))]
+    db.add_all([AccountLedgerEntry(user_id=user_id,
+                                   account_id=account_db.id,
+                                   entry_type=LedgerEntryType.MOVEMENT,
+                                   entry_date=entry_date,
+                                   balance=balance,
+                                   base_currency_balance=balance * 2)
+                for entry_date, balance in movements])
+    await db.commit()
+
+    # Act
+    checkpoints_created: int = await ledger_service.create_checkpoints(db=db, day=date(2025, 3, 1))
+    checkpoints_created_again: int = await ledger_service.create_checkpoints(db=db, day=date(2025, 3, 1))
+    await db.commit()
+    balance: BalancePoint = await ledger_service.get_balance(db=db,
+                                                             user_id=user_id,
+                                                             account_id=account_db.id,
+                                                             on_date=date(2025, 3, 2))
+    history: list[BalancePoint] = await ledger_service.get_balance_history(db=db,
+                                                                           user_id=user_id,
+                                                                           account_id=account_db.id,
+                                                                           date_from=date(2025, 2, 28),
+                                                                           date_to=date(2025, 3, 4))
+
+    # Assert
+    assert checkpoints_created == 1
+    assert checkpoints_created_again == 0
+    checkpoints: list[AccountLedgerEntry] = [e for e in await _get_entries(db=db, account_id=account_db.id)
+                                             if e.entry_type == LedgerEntryType.CHECKPOINT]
+    assert len(checkpoints) == 1
+    assert checkpoints[0].entry_date == date(2025, 3, 1)
+    assert checkpoints[0].balance == Decimal('20')
+
+    assert balance.balance == Decimal('20')
+    assert balance.base_currency_balance == Decimal('40')
+
+    assert [point.date for point in history] == [date(2025, 2, 28), date(2025, 3, 1), date(2025, 3, 2),
+                                                 date(2025, 3, 3), date(2025, 3, 4)]
+    assert [point.balance for point in history] == [Decimal('0'), Decimal('20'), Decimal('20'),
+                                                    Decimal('5'), Decimal('5')]
+
+
+@pytest.mark.asyncio
+async def test_get_balance_not_found(db: AsyncSession):
+    # Arrange
+    user_id, account_db, _ = await _create_accounts(db=db)
+
+    # Act
+    with pytest.raises(EntityNotFound) as exc:
+        await ledger_service.get_balance(db=db, user_id=uuid4(), account_id=account_db.id, on_date=date.today())
+
+    # Assert
+    assert exc.value.status_code == status.HTTP_404_NOT_FOUND
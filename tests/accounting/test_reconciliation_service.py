@@ -0,0 +1,170 @@
+import asyncio
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncEngine, AsyncSession
+
+from app.crud.accounting.account import account_crud
+from app.crud.user.user import user_crud
+from app.models.accounting.account import Account as AccountModel
+from app.models.accounting.account_ledger import AccountLedgerEntry
+from app.models.user.user import User as UserModel
+from app.schemas.accounting.account import AccountType, BalanceMismatch
+from app.schemas.accounting.transaction import TransactionType, TransferRequest
+from app.schemas.base import CurrencyType
+from app.schemas.user.external_user import ProviderType
+from app.schemas.user.user import UserCreate
+from app.services.accounting import reconciliation_service
+from app.services.accounting.transaction_processor.base import TransactionProcessor
+
+
+async def _create_transfers(db: AsyncSession) -> tuple[UUID, AccountModel, AccountModel]:
+    user_create_data: UserCreate = UserCreate(username='test',
+                                              registration_provider=ProviderType.TELEGRAM,
+                                              base_currency=CurrencyType.USD)
+    user_db: UserModel = await user_crud.create(db=db, obj_in=user_create_data, commit=True)
+
+    account_from_db: AccountModel = await account_crud.create(db=db,
+                                                              obj_in={'user_id': user_db.id,
+                                                                      'name': 'Income USD',
+                                                                      'currency': CurrencyType.USD,
+                                                                      'account_type': AccountType.INCOME,
+                                                                      'base_currency_rate': Decimal('1')},
+                                                              commit=True)
+    account_to_db: AccountModel = await account_crud.create(db=db,
+                                                            obj_in={'user_id': user_db.id,
+                                                                    'name': 'Checking USD',
+                                                                    'currency': CurrencyType.USD,
+                                                                    'account_type': AccountType.CHECKING},
+                                                            commit=True)
+
+    transaction_processor: TransactionProcessor = TransactionProcessor.factory(db=db,
+                                                                               user_id=user_db.id,
+                                                                               transaction_type=TransactionType.TRANSFER)
+    for amount in [Decimal('10'), Decimal('5')]:
+        await transaction_processor.create(data=TransferRequest(transaction_date=date(2025, 2, 10),
+                                                                source_amount=amount,
+                                                                source_currency=CurrencyType.USD,
+                                                                destination_currency=CurrencyType.USD,
+                                                                from_account_id=account_from_db.id,
+                                                                to_account_id=account_to_db.id))
+    await db.commit()
+
+    return user_db.id, account_from_db, account_to_db
+
+
+@pytest.mark.asyncio
+async def test_reconcile_balances_ok(db: AsyncSession):
+    # Arrange
+    await _create_transfers(db=db)
+
+    # Act
+    mismatches: list[BalanceMismatch] = await reconciliation_service.reconcile_balances(db=db)
+
+    # Assert
+    assert mismatches == []
+
+
+@pytest.mark.asyncio
+async def test_reconcile_balances_mismatch(db: AsyncSession):
+    # Arrange
+    user_id, account_from_db, account_to_db = await _create_transfers(db=db)
+    await db.execute(update(AccountModel)
+                     .where(AccountModel.id == account_to_db.id)
+                     .values(balance=Decimal('20'), base_currency_rate=Decimal('0')))
+    await db.commit()
+
+    # Act
+    mismatches: list[BalanceMismatch] = await reconciliation_service.reconcile_balances(db=db)
+
+    # Assert
+    assert len(mismatches) == 1
+    assert mismatches[0].account_id == account_to_db.id
+    assert mismatches[0].user_id == user_id
+    assert mismatches[0].balance == Decimal('20')
+    assert mismatches[0].expected_balance == Decimal('15')
+    assert mismatches[0].base_currency_rate == Decimal('0')
+    assert mismatches[0].expected_base_currency_rate == Decimal('1')
+
+    account_db: AccountModel = await account_crud.get(db=db, id=account_to_db.id)
+    assert account_db.balance == Decimal('20')
+
+
+@pytest.mark.asyncio
+async def test_reconcile_balances_repair(db: AsyncSession):
+    # Arrange
+    user_id, account_from_db, account_to_db = await _create_transfers(db=db)
+    await db.execute(update(AccountModel)
+                     .where(AccountModel.id.in_([account_from_db.id, account_to_db.id]))
+                     .values(balance=AccountModel.balance + Decimal('7')))
+    await db.execute(delete(AccountLedgerEntry).where(AccountLedgerEntry.account_id == account_to_db.id))
+    await db.commit()
+
+    # Act
+    mismatches: list[BalanceMismatch] = await reconciliation_service.reconcile_balances(db=db, repair=True)
+    await db.commit()
+
+    # Assert
+    assert {mismatch.account_id for mismatch in mismatches} == {account_from_db.id, account_to_db.id}
+    assert await reconciliation_service.reconcile_balances(db=db) == []
+
+    accounts_db: list[AccountModel] = (await db.scalars(select(AccountModel)
+                                                        .where(AccountModel.user_id == user_id)
+                                                        .execution_options(populate_existing=True))).all()
+    balances: dict[UUID, Decimal] = {account_db.id: account_db.balance for account_db in accounts_db}
+    assert balances == {account_from_db.id: Decimal('-15'), account_to_db.id: Decimal('15')}
+
+    corrections: list[AccountLedgerEntry] = (await db.scalars(select(AccountLedgerEntry)
+                                                              .where(AccountLedgerEntry.transaction_id.is_(None))
+                                                              .order_by(AccountLedgerEntry.account_id))).all()
+    assert len(corrections) == 1
+    assert corrections[0].account_id == account_to_db.id
+    assert corrections[0].entry_date == date.today()
+    assert corrections[0].amount == Decimal('15')
+    assert corrections[0].balance == Decimal('15')
+    assert corrections[0].base_currency_balance == Decimal('15')
+
+
+@pytest.mark.asyncio
+async def test_reconcile_balances_repair_concurrent_transaction(db: AsyncSession, engine: AsyncEngine):
+    # Arrange
+    user_id, account_from_db, account_to_db = await _create_transfers(db=db)
+    await db.execute(update(AccountModel)
+                     .where(AccountModel.id == account_to_db.id)
+                     .values(balance=AccountModel.balance + Decimal('7')))
+    await db.commit()
+
+    session_maker = async_sessionmaker(engine, autocommit=False, autoflush=False, expire_on_commit=False)
+    async with session_maker() as transaction_db, session_maker() as repair_db:
+        transaction_processor: TransactionProcessor = TransactionProcessor.factory(
+            db=transaction_db,
+            user_id=user_id,
+            transaction_type=TransactionType.TRANSFER
+        )
+        await transaction_processor.create(data=TransferRequest(transaction_date=date(2025, 2, 11),
+                                                                source_amount=Decimal('5'),
+                                                                source_currency=CurrencyType.USD,
+                                                                destination_currency=CurrencyType.USD,
+                                                                from_account_id=account_from_db.id,
+                                                                to_account_id=account_to_db.id))
+
+        # Act
+        repair = asyncio.create_task(reconciliation_service.reconcile_balances(db=repair_db, repair=True))
+        await asyncio.sleep(0.2)
+        repair_waited: bool = not repair.done()
+        await transaction_db.commit()
+        mismatches: list[BalanceMismatch] = await repair
+        await repair_db.commit()
+
+    # Assert
+    assert repair_waited
+    assert [mismatch.account_id for mismatch in mismatches] == [account_to_db.id]
+    assert mismatches[0].expected_balance == Decimal('20')
+    assert await reconciliation_service.reconcile_balances(db=db) == []
+
+    account_db: AccountModel = await account_crud.get(db=db, id=account_to_db.id)
+    await db.refresh(account_db)
+    assert account_db.balance == Decimal('20')
@@ -0,0 +1,218 @@
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.accounting.account import account_crud
+from app.crud.accounting.category import category_crud
+from app.crud.accounting.location import location_crud
+from app.crud.user.user import user_crud
+from app.models.accounting.account import Account as AccountModel
+from app.models.accounting.category import Category as CategoryModel
+from app.models.accounting.location import Location as LocationModel
+from app.models.user.user import User as UserModel
+from app.schemas.accounting.account import AccountType
+from app.schemas.accounting.category import CategoryCreate, CategoryType
+from app.schemas.accounting.location import LocationCreate
+from app.schemas.accounting.report import (CategoryExpenses, ExpenseReportRequest, MonthExpenses, NetWorthPoint,
+                                           NetWorthRequest, NetWorthResolution)
+from app.schemas.accounting.transaction import ExpenseRequest, Transaction, TransactionType
+from app.schemas.base import CurrencyType
+from app.schemas.user.external_user import ProviderType
+from app.schemas.user.user import UserCreate
+from app.services.accounting import report_service
+from app.services.accounting.transaction_processor.base import TransactionProcessor
+from tests.helpers import assert_query_count
+
+
+async def _create_expenses(db: AsyncSession) -> tuple[UUID, list[CategoryModel], list[Transaction]]:
+    user_create_data: UserCreate = UserCreate(username='test',
+                                              registration_provider=ProviderType.TELEGRAM,
+                                              base_currency=CurrencyType.USD)
+    user_db: UserModel = await user_crud.create(db=db, obj_in=user_create_data, commit=True)
+    user_id: UUID = user_db.id
+
+    account_create_data: dict = {'user_id': user_id,
+                                 'name': 'Checking EUR',
+                                 'currency': CurrencyType.EUR,
+                                 'account_type': AccountType.CHECKING,
+                                 'balance': Decimal('1000'),
+                                 'base_currency_rate': Decimal('0.5')}
+    account_db: AccountModel = await account_crud.create(db=db, obj_in=account_create_data, commit=True)
+    categories_db: list[CategoryModel] = [
+        await category_crud.create(db=db,
+                                   obj_in=CategoryCreate(user_id=user_id, name=name, type=CategoryType.GENERAL),
+                                   commit=True)
+        for name in ['Food', 'Rent']
+    ]
+    location_db: LocationModel = await location_crud.create(db=db,
+                                                            obj_in=LocationCreate(user_id=user_id, name='Some shop'),
+                                                            commit=True)
+
+    expenses_data: list[tuple[date, CategoryModel, Decimal]] = [(date(2025, 1, 5), categories_db[0], Decimal('10')),
+                                                                (date(2025, 1, 20), categories_db[0], Decimal('20')),
+                                                                (date(2025, 1, 25), categories_db[1], Decimal('100')),
+                                                                (date(2025, 2, 1), categories_db[0], Decimal('5')),
+                                                                (date(2025, 2, 3), categories_db[1], Decimal('100'))]
+    transactions: list[Transaction] = []
+    for transaction_date, category_db, amount in expenses_data:
+        expense_create_data: ExpenseRequest = ExpenseRequest(transaction_date=transaction_date,
+                                                             source_amount=amount,
+                                                             source_currency=CurrencyType.EUR,
+                                                             destination_amount=amount,
+                                                             destination_currency=CurrencyType.EUR,
+                                                             from_account_id=account_db.id,
+                                                             category_id=category_db.id,
+                                                             location_id=location_db.id)
+        transaction_processor: TransactionProcessor = TransactionProcessor.factory(db=db,
+                                                                                   user_id=user_id,
+                                                                                   transaction_type=TransactionType.EXPENSE)
+        transactions.append(await transaction_processor.create(data=expense_create_data))
+    await db.commit()
+
+    return user_id, categories_db, transactions
+
+
+@pytest.mark.asyncio
+async def test_get_expenses_by_category(db: AsyncSession):
+    # Arrange
+    user_id, categories_db, transactions = await _create_expenses(db=db)
+    transaction_processor: TransactionProcessor = TransactionProcessor.factory(db=db,
+                                                                               user_id=user_id,
+                                                                               transaction_type=TransactionType.EXPENSE)
+    await transaction_processor.delete(transaction_id=transactions[4].id)
+    await db.commit()
+    request: ExpenseReportRequest = ExpenseReportRequest(month_from=date(2025, 1, 1), month_to=date(2025, 12, 1))
+
+    # Act
+    expenses: list[CategoryExpenses] = await report_service.get_expenses_by_category(db=db,
+                                                                                     request=request,
+                                                                                     user_id=user_id)
+
+    # Assert
+    assert [(e.category_id, e.amount, e.transactions_count) for e in expenses] == [
+        (categories_db[1].id, Decimal('200'), 1),
+        (categories_db[0].id, Decimal('70'), 3),
+    ]
+    assert all(e.currency == CurrencyType.USD for e in expenses)
+
+
+@pytest.mark.asyncio
+async def test_get_expenses_by_month(db: AsyncSession):
+    # Arrange
+    user_id, categories_db, transactions = await _create_expenses(db=db)
+    request: ExpenseReportRequest = ExpenseReportRequest(month_from=date(2025, 2, 15), month_to=date(2025, 3, 1))
+
+    # Act
+    expenses: list[MonthExpenses] = await report_service.get_expenses_by_month(db=db,
+                                                                               request=request,
+                                                                               user_id=user_id)
+
+    # Assert
+    assert [(e.month, e.amount, e.transactions_count) for e in expenses] == [(date(2025, 2, 1), Decimal('210'), 2)]
+
+
+@pytest.mark.asyncio
+async def test_get_net_worth_by_month(db: AsyncSession):
+    # Arrange
+    user_id, categories_db, transactions = await _create_expenses(db=db)
+    request: NetWorthRequest = NetWorthRequest(date_from=date(2024, 12, 10),
+                                               date_to=date(2025, 3, 31),
+                                               resolution=NetWorthResolution.MONTH)
+
+    # Act
+    net_worth: list[NetWorthPoint] = await report_service.get_net_worth(db=db, request=request, user_id=user_id)
+
+    # Assert
+    assert [(point.date, point.amount) for point in net_worth] == [(date(2024, 12, 1), Decimal('0')),
+                                                                   (date(2025, 1, 1), Decimal('-260')),
+                                                                   (date(2025, 2, 1), Decimal('-470')),
+                                                                   (date(2025, 3, 1), Decimal('-470'))]
+    assert all(point.currency == CurrencyType.USD for point in net_worth)
+
+
+@pytest.mark.asyncio
+async def test_get_net_worth_by_day(db: AsyncSession):
+    # Arrange
+    user_id, categories_db, transactions = await _create_expenses(db=db)
+    request: NetWorthRequest = NetWorthRequest(date_from=date(2025, 1, 19),
+                                               date_to=date(2025, 1, 21),
+                                               resolution=NetWorthResolution.DAY)
+
+    # Act
+    net_worth: list[NetWorthPoint] = await report_service.get_net_worth(db=db, request=request, user_id=user_id)
+
+    # Assert
+    assert [(point.date, point.amount) for point in net_worth] == [(date(2025, 1, 19), Decimal('-20')),
+                                                                   (date(2025, 1, 20), Decimal('-60')),
+                                                                   (date(2025, 1, 21), Decimal('-60'))]
+
+
+@pytest.mark.asyncio
+async def test_get_net_worth_cached(db: AsyncSession):
+    # Arrange
+    user_id, categories_db, transactions = await _create_expenses(db=db)
+    request: NetWorthRequest = NetWorthRequest(date_from=date(2025, 1, 1),
+                                               date_to=date.today(),
+                                               resolution=NetWorthResolution.MONTH)
+    await report_service.get_net_worth(db=db, request=request, user_id=user_id)
+
+    transaction_processor: TransactionProcessor = TransactionProcessor.factory(db=db,
+                                                                               user_id=user_id,
+                                                                               transaction_type=TransactionType.EXPENSE)
+    expense_data: dict = transactions[0].model_dump(include={'source_amount', 'source_currency', 'destination_amount',
+                                                             'destination_currency', 'from_account_id', 'category_id',
+                                                             'location_id'})
+    await transaction_processor.create(data=ExpenseRequest(**expense_data, transaction_date=date.today()))
+    await db.commit()
+
+    # Act
+    with assert_query_count(1):
+        net_worth_open: list[NetWorthPoint] = await report_service.get_net_worth(db=db, request=request, user_id=user_id)
+
+    await transaction_processor.create(data=ExpenseRequest(**expense_data, transaction_date=date(2025, 1, 1)))
+    await db.commit()
+    net_worth_closed: list[NetWorthPoint] = await report_service.get_net_worth(db=db, request=request, user_id=user_id)
+
+    # Assert
+    assert net_worth_open[0].amount == Decimal('-260')
+    assert net_worth_open[-1].amount == Decimal('-490')
+    assert net_worth_closed[0].amount == Decimal('-280')
+    assert net_worth_closed[-1].amount == Decimal('-510')
+
+
+@pytest.mark.asyncio
+async def test_get_net_worth_cache_dropped_after_commit(db: AsyncSession):
+    # Arrange
+    user_id, categories_db, transactions = await _create_expenses(db=db)
+    request: NetWorthRequest = NetWorthRequest(date_from=date(2025, 1, 1),
+                                               date_to=date.today(),
+                                               resolution=NetWorthResolution.MONTH)
+    await report_service.get_net_worth(db=db, request=request, user_id=user_id)
+
+    transaction_processor: TransactionProcessor = TransactionProcessor.factory(db=db,
+                                                                               user_id=user_id,
+                                                                               transaction_type=TransactionType.EXPENSE)
+    expense_data: dict = transactions[0].model_dump(include={'source_amount', 'source_currency', 'destination_amount',
+                                                             'destination_currency', 'from_account_id', 'category_id',
+                                                             'location_id'})
+    cache_key: tuple[UUID, NetWorthResolution] = (user_id, NetWorthResolution.MONTH)
+
+    # Act
+    await transaction_processor.create(data=ExpenseRequest(**expense_data, transaction_date=date(2025, 1, 1)))
+    cached_before_rollback: bool = report_service.net_worth_cache.get(cache_key) is not None
+    await db.rollback()
+    cached_after_rollback: bool = report_service.net_worth_cache.get(cache_key) is not None
+
+    await transaction_processor.create(data=ExpenseRequest(**expense_data, transaction_date=date(2025, 1, 1)))
+    cached_before_commit: bool = report_service.net_worth_cache.get(cache_key) is not None
+    await db.commit()
+    cached_after_commit: bool = report_service.net_worth_cache.get(cache_key) is not None
+
+    # Assert
+    assert cached_before_rollback
+    assert cached_after_rollback
+    assert cached_before_commit
+    assert not cached_after_commit
@@ -1,21 +1,31 @@
-from datetime import date
+import asyncio
+import csv
+import io
+from datetime import date, timedelta
 from decimal import Decimal
 from uuid import UUID, uuid4
 
 import pytest
 from fastapi_pagination import Page
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi_pagination.cursor import CursorPage
+from sqlalchemy import func, select, Select, text, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncEngine, AsyncSession
 from starlette import status
 
 from app.configs.logging_settings import LogLevelType
 from app.crud.accounting.account import account_crud
 from app.crud.accounting.category import category_crud
+from app.crud.accounting.idempotency_key import idempotency_key_crud
 from app.crud.accounting.income_source import income_source_crud
 from app.crud.accounting.location import location_crud
+from app.crud.accounting.transaction import transaction_crud
 from app.crud.user.user import user_crud
+from app.exceptions.conflict_409 import IdempotencyKeyWithoutResponse
 from app.exceptions.not_fount_404 import EntityNotFound
+from app.exceptions.unprocessable_422 import UnprocessableException
 from app.models.accounting.account import Account as AccountModel
 from app.models.accounting.category import Category as CategoryModel
+from app.models.accounting.idempotency_key import IdempotencyKey as IdempotencyKeyModel
 from app.models.accounting.income_source import IncomeSource as IncomeSourceModel
 from app.models.accounting.location import Location as LocationModel
 from app.models.accounting.transaction import Transaction as TransactionModel
@@ -24,14 +34,17 @@ from app.schemas.accounting.account import AccountType
 from app.schemas.accounting.category import CategoryCreate, CategoryType
 from app.schemas.accounting.income_source import IncomeSourceCreate
 from app.schemas.accounting.location import LocationCreate
-from app.schemas.accounting.transaction import (ExpenseRequest, IncomeRequest, Transaction, TransactionRequest,
-                                                TransactionType, TransferRequest)
+from app.schemas.accounting.transaction import (ExpenseRequest, ExportFormatType, IncomeRequest, Transaction,
+                                                TransactionCursorRequest, TransactionExportRequest,
+                                                TransactionExportRow, TransactionRequest, TransactionType,
+                                                TransferRequest)
 from app.schemas.base import CurrencyType
 from app.schemas.error_response import ErrorCodeType
 from app.schemas.user.external_user import ProviderType
 from app.schemas.user.user import UserCreate
 from app.services.accounting import transaction_service
 from app.services.accounting.transaction_processor.base import TransactionProcessor
+from tests.helpers import assert_query_count, compile_asyncpg, explain
 
 
 @pytest.mark.asyncio
@@ -236,6 +249,431 @@ async def test_get_transactions(db: AsyncSession):
     assert transactions_transaction_type.items[0].transaction_type == TransactionType.TRANSFER
 
 
+@pytest.mark.asyncio
+async def test_get_transactions_cursor(db: AsyncSession):
+    # Arrange
+    user_create_data: UserCreate = UserCreate(username='test 1',
+                                              registration_provider=ProviderType.TELEGRAM,
+                                              base_currency=CurrencyType.USD)
+    user_db: UserModel = await user_crud.create(db=db, obj_in=user_create_data, commit=True)
+    account_create_data: dict = {'user_id': user_db.id,
+                                 'name': 'Checking USD',
+                                 'currency': CurrencyType.USD,
+                                 'account_type': AccountType.CHECKING,
+                                 'balance': Decimal('2000'),
+                                 'base_currency_rate': Decimal('1')}
+    account_db: AccountModel = await account_crud.create(db=db, obj_in=account_create_data, commit=True)
+    category_create_data: CategoryCreate = CategoryCreate(user_id=user_db.id, name='Food', type=CategoryType.GENERAL)
+    category_db: CategoryModel = await category_crud.create(db=db, obj_in=category_create_data, commit=True)
+    location_create_data: LocationCreate = LocationCreate(user_id=user_db.id, name='Some shop')
+    location_db: LocationModel = await location_crud.create(db=db, obj_in=location_create_data, commit=True)
+
+    transaction_dates: list[date] = [date(2025, 2, 1), date(2025, 2, 3), date(2025, 2, 3), date(2025, 2, 2),
+                                     date(2025, 2, 5)]
+    for transaction_date in transaction_dates:
+        expense_create_data: ExpenseRequest = ExpenseRequest(transaction_date=transaction_date,
+                                                             source_amount=Decimal('100'),
+                                                             source_currency=CurrencyType.USD,
+                                                             destination_amount=Decimal('11100'),
+                                                             destination_currency=CurrencyType.RSD,
+                                                             from_account_id=account_db.id,
+                                                             category_id=category_db.id,
+                                                             location_id=location_db.id)
+        transaction_processor: TransactionProcessor = TransactionProcessor.factory(db=db,
+                                                                                   user_id=user_db.id,
+                                                                                   transaction_type=expense_create_data.transaction_type)
+        await transaction_processor.create(data=expense_create_data)
+    await db.commit()
+
+    request_p1: TransactionCursorRequest = TransactionCursorRequest(size=2, date_from=date(2025, 1, 1))
+    request_offset: TransactionRequest = TransactionRequest(size=5, date_from=date(2025, 1, 1))
+
+    # Act
+    transactions_p1: CursorPage[Transaction] = await transaction_service.get_transactions_cursor(db=db,
+                                                                                                 request=request_p1,
+                                                                                                 user_id=user_db.id)
+    request_p2: TransactionCursorRequest = TransactionCursorRequest(size=2, date_from=date(2025, 1, 1),
+                                                                    cursor=transactions_p1.next_page)
+    transactions_p2: CursorPage[Transaction] = await transaction_service.get_transactions_cursor(db=db,
+                                                                                                 request=request_p2,
+                                                                                                 user_id=user_db.id)
+    request_p3: TransactionCursorRequest = TransactionCursorRequest(size=2, date_from=date(2025, 1, 1),
+                                                                    cursor=transactions_p2.next_page,
+                                                                    include_total=True)
+    transactions_p3: CursorPage[Transaction] = await transaction_service.get_transactions_cursor(db=db,
+                                                                                                 request=request_p3,
+                                                                                                 user_id=user_db.id)
+    transactions_offset: Page[Transaction] = await transaction_service.get_transactions(db=db,
+                                                                                        request=request_offset,
+                                                                                        user_id=user_db.id)
+
+    # Assert
+    assert transactions_p1.total is None
+    assert len(transactions_p1.items) == 2
+    assert transactions_p1.next_page is not None
+
+    assert len(transactions_p2.items) == 2
+    assert transactions_p2.next_page is not None
+
+    assert transactions_p3.total == 5
+    assert len(transactions_p3.items) == 1
+    assert transactions_p3.next_page is None
+
+    cursor_ids: list[UUID] = [t.id for t in transactions_p1.items + transactions_p2.items + transactions_p3.items]
+    assert cursor_ids == [t.id for t in transactions_offset.items]
+    assert [t.transaction_date for t in transactions_offset.items] == sorted(transaction_dates, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_get_transactions_expand(db: AsyncSession):
+    # Arrange
+    user_create_data: UserCreate = UserCreate(username='test',
+                                              registration_provider=ProviderType.TELEGRAM,
+                                              base_currency=CurrencyType.USD)
+    user_db: UserModel = await user_crud.create(db=db, obj_in=user_create_data, commit=True)
+    account_create_data: dict = {'user_id': user_db.id,
+                                 'name': 'Checking USD',
+                                 'currency': CurrencyType.USD,
+                                 'account_type': AccountType.CHECKING,
+                                 'balance': Decimal('2000'),
+                                 'base_currency_rate': Decimal('1')}
+    account_db: AccountModel = await account_crud.create(db=db, obj_in=account_create_data, commit=True)
+    category_create_data: CategoryCreate = CategoryCreate(user_id=user_db.id, name='Food', type=CategoryType.GENERAL)
+    category_db: CategoryModel = await category_crud.create(db=db, obj_in=category_create_data, commit=True)
+    location_create_data: LocationCreate = LocationCreate(user_id=user_db.id, name='Some shop')
+    location_db: LocationModel = await location_crud.create(db=db, obj_in=location_create_data, commit=True)
+
+    for i in range(3):
+        expense_create_data: ExpenseRequest = ExpenseRequest(transaction_date=date(2025, 4, 1 + i),
+                                                             source_amount=Decimal('10'),
+                                                             source_currency=CurrencyType.USD,
+                                                             destination_amount=Decimal('10'),
+                                                             destination_currency=CurrencyType.USD,
+                                                             from_account_id=account_db.id,
+                                                             category_id=category_db.id,
+                                                             location_id=location_db.id)
+        transaction_processor: TransactionProcessor = TransactionProcessor.factory(db=db,
+                                                                                   user_id=user_db.id,
+                                                                                   transaction_type=expense_create_data.transaction_type)
+        await transaction_processor.create(data=expense_create_data)
+    await db.commit()
+    db.expunge_all()
+
+    request_all: TransactionRequest = TransactionRequest(date_from=date(2025, 1, 1))
+    request_none: TransactionRequest = TransactionRequest(date_from=date(2025, 1, 1), expand='')
+    request_category: TransactionRequest = TransactionRequest(date_from=date(2025, 1, 1), expand='category')
+
+    # Act
+    with assert_query_count(2):
+        transactions_all: Page[Transaction] = await transaction_service.get_transactions(db=db,
+                                                                                         request=request_all,
+                                                                                         user_id=user_db.id)
+    db.expunge_all()
+    with assert_query_count(2):
+        transactions_none: Page[Transaction] = await transaction_service.get_transactions(db=db,
+                                                                                          request=request_none,
+                                                                                          user_id=user_db.id)
+    db.expunge_all()
+    with assert_query_count(2):
+        transactions_category: Page[Transaction] = await transaction_service.get_transactions(
+            db=db, request=request_category, user_id=user_db.id
+        )
+
+    # Assert
+    assert transactions_all.total == transactions_none.total == transactions_category.total == 3
+    assert all(t.from_account.id == account_db.id for t in transactions_all.items)
+    assert all(t.category.id == category_db.id for t in transactions_all.items)
+    assert all(t.location.id == location_db.id for t in transactions_all.items)
+
+    assert all(t.from_account is None and t.category is None and t.location is None for t in transactions_none.items)
+    assert all(t.from_account_id == account_db.id for t in transactions_none.items)
+    assert all(t.category_id == category_db.id for t in transactions_none.items)
+    assert len(transactions_none.model_dump_json()) < len(transactions_all.model_dump_json())
+
+    assert all(t.category.id == category_db.id and t.location is None for t in transactions_category.items)
+
+
+@pytest.mark.asyncio
+async def test_get_transactions_flat_rows_match_orm(db: AsyncSession):
+    # Arrange
+    user_create_data: UserCreate = UserCreate(username='test',
+                                              registration_provider=ProviderType.TELEGRAM,
+                                              base_currency=CurrencyType.USD)
+    user_db: UserModel = await user_crud.create(db=db, obj_in=user_create_data, commit=True)
+    account_checking_db: AccountModel = await account_crud.create(db=db,
+                                                                  obj_in={'user_id': user_db.id,
+                                                                          'name': 'Checking USD',
+                                                                          'currency': CurrencyType.USD,
+                                                                          'account_type': AccountType.CHECKING,
+                                                                          'balance': Decimal('2000'),
+                                                                          'base_currency_rate': Decimal('1')},
+                                                                  commit=True)
+    account_income_db: AccountModel = await account_crud.create(db=db,
+                                                                obj_in={'user_id': user_db.id,
+                                                                        'name': 'Income EUR',
+                                                                        'currency': CurrencyType.EUR,
+                                                                        'account_type': AccountType.INCOME},
+                                                                commit=True)
+    category_create_data: CategoryCreate = CategoryCreate(user_id=user_db.id, name='Food', type=CategoryType.GENERAL)
+    category_db: CategoryModel = await category_crud.create(db=db, obj_in=category_create_data, commit=True)
+    location_create_data: LocationCreate = LocationCreate(user_id=user_db.id, name='Some shop')
+    location_db: LocationModel = await location_crud.create(db=db, obj_in=location_create_data, commit=True)
+    income_source_create_data: IncomeSourceCreate = IncomeSourceCreate(user_id=user_db.id, name='Best Job')
+    income_source_db: IncomeSourceModel = await income_source_crud.create(db=db,
+                                                                          obj_in=income_source_create_data,
+                                                                          commit=True)
+
+    transactions_data: list[ExpenseRequest | IncomeRequest | TransferRequest] = [
+        ExpenseRequest(transaction_date=date(2025, 2, 1),
+                       source_amount=Decimal('100'),
+                       source_currency=CurrencyType.USD,
+                       destination_amount=Decimal('11100'),
+                       destination_currency=CurrencyType.RSD,
+                       from_account_id=account_checking_db.id,
+                       category_id=category_db.id,
+                       location_id=location_db.id),
+        IncomeRequest(transaction_date=date(2025, 2, 2),
+                      source_amount=Decimal('1050'),
+                      source_currency=CurrencyType.USD,
+                      destination_amount=Decimal('1000'),
+                      destination_currency=CurrencyType.EUR,
+                      to_account_id=account_income_db.id,
+                      income_source_id=income_source_db.id,
+                      income_period=date(2025, 1, 1)),
+        TransferRequest(transaction_date=date(2025, 2, 3),
+                        source_amount=Decimal('100'),
+                        source_currency=CurrencyType.EUR,
+                        destination_currency=CurrencyType.USD,
+                        destination_amount=Decimal('105'),
+                        from_account_id=account_income_db.id,
+                        to_account_id=account_checking_db.id,
+                        comment='test'),
+    ]
+    for transaction_data in transactions_data:
+        transaction_processor: TransactionProcessor = TransactionProcessor.factory(
+            db=db,
+            user_id=user_db.id,
+            transaction_type=transaction_data.transaction_type
+        )
+        await transaction_processor.create(data=transaction_data)
+    await db.commit()
+    db.expunge_all()
+
+    request: TransactionRequest = TransactionRequest(date_from=date(2025, 2, 1), date_to=date(2025, 2, 28))
+    request_cursor: TransactionCursorRequest = TransactionCursorRequest(date_from=date(2025, 2, 1),
+                                                                        date_to=date(2025, 2, 28))
+
+    # Act
+    transactions: Page[Transaction] = await transaction_service.get_transactions(db=db,
+                                                                                 request=request,
+                                                                                 user_id=user_db.id)
+    db.expunge_all()
+    transactions_cursor: CursorPage[Transaction] = await transaction_service.get_transactions_cursor(
+        db=db, request=request_cursor, user_id=user_db.id
+    )
+
+    # Assert
+    assert transactions.total == 3
+    # flat rows are mapped to the same objects the ORM path loads
+    assert transactions.items == transactions_cursor.items
+
+    expense, income, transfer = reversed(transactions.items)
+    assert expense.from_account.id == account_checking_db.id
+    assert expense.category.id == category_db.id
+    assert expense.location.id == location_db.id
+    assert income.to_account.id == account_income_db.id
+    assert income.income_source.id == income_source_db.id
+    assert income.income_period == date(2025, 1, 1)
+    assert transfer.from_account.id == account_income_db.id
+    assert transfer.to_account.id == account_checking_db.id
+
+
+@pytest.mark.asyncio
+async def test_get_transactions_comment_search(db: AsyncSession):
+    # Arrange
+    user_create_data: UserCreate = UserCreate(username='test',
+                                              registration_provider=ProviderType.TELEGRAM,
+                                              base_currency=CurrencyType.USD)
+    user_db: UserModel = await user_crud.create(db=db, obj_in=user_create_data, commit=True)
+    account_create_data: dict = {'user_id': user_db.id,
+                                 'name': 'Checking USD',
+                                 'currency': CurrencyType.USD,
+                                 'account_type': AccountType.CHECKING,
+                                 'balance': Decimal('2000'),
+                                 'base_currency_rate': Decimal('1')}
+    account_db: AccountModel = await account_crud.create(db=db, obj_in=account_create_data, commit=True)
+    category_create_data: CategoryCreate = CategoryCreate(user_id=user_db.id, name='Food', type=CategoryType.GENERAL)
+    category_db: CategoryModel = await category_crud.create(db=db, obj_in=category_create_data, commit=True)
+    location_create_data: LocationCreate = LocationCreate(user_id=user_db.id, name='Some shop')
+    location_db: LocationModel = await location_crud.create(db=db, obj_in=location_create_data, commit=True)
+
+    comments: list[str | None] = ['Coffee with Anna', 'Coffee beans, coffee filters', 'Lunch', None]
+    for i, comment in enumerate(comments):
+        expense_create_data: ExpenseRequest = ExpenseRequest(transaction_date=date(2025, 4, 1 + i),
+                                                             comment=comment,
+                                                             source_amount=Decimal('10') * (i + 1),
+                                                             source_currency=CurrencyType.USD,
+                                                             destination_amount=Decimal('10') * (i + 1),
+                                                             destination_currency=CurrencyType.USD,
+                                                             from_account_id=account_db.id,
+                                                             category_id=category_db.id,
+                                                             location_id=location_db.id)
+        transaction_processor: TransactionProcessor = TransactionProcessor.factory(db=db,
+                                                                                   user_id=user_db.id,
+                                                                                   transaction_type=expense_create_data.transaction_type)
+        await transaction_processor.create(data=expense_create_data)
+    await db.commit()
+
+    request: TransactionRequest = TransactionRequest(date_from=date(2025, 1, 1), comment_query='COFFEE')
+    request_amount: TransactionRequest = TransactionRequest(date_from=date(2025, 1, 1),
+                                                            comment_query='coffee',
+                                                            base_currency_amount_to=Decimal('10'))
+    request_not_found: TransactionRequest = TransactionRequest(date_from=date(2025, 1, 1), comment_query='coffee -anna')
+    request_cursor: TransactionCursorRequest = TransactionCursorRequest(date_from=date(2025, 1, 1),
+                                                                        comment_query='lunch')
+
+    # Act
+    transactions: Page[Transaction] = await transaction_service.get_transactions(db=db,
+                                                                                 request=request,
+                                                                                 user_id=user_db.id)
+    transactions_amount: Page[Transaction] = await transaction_service.get_transactions(db=db,
+                                                                                        request=request_amount,
+                                                                                        user_id=user_db.id)
+    transactions_excluded: Page[Transaction] = await transaction_service.get_transactions(db=db,
+                                                                                          request=request_not_found,
+                                                                                          user_id=user_db.id)
+    transactions_cursor: CursorPage[Transaction] = await transaction_service.get_transactions_cursor(
+        db=db, request=request_cursor, user_id=user_db.id
+    )
+
+    # Assert
+    assert transactions.total == 2
+    assert [t.comment for t in transactions.items] == ['Coffee beans, coffee filters', 'Coffee with Anna']
+    assert [t.comment_highlight for t in transactions.items] == ['<b>Coffee</b> beans, <b>coffee</b> filters',
+                                                                 '<b>Coffee</b> with Anna']
+
+    assert [t.comment for t in transactions_amount.items] == ['Coffee with Anna']
+    assert [t.comment for t in transactions_excluded.items] == ['Coffee beans, coffee filters']
+
+    assert [t.comment for t in transactions_cursor.items] == ['Lunch']
+    assert transactions_cursor.items[0].comment_highlight is None
+
+
+@pytest.mark.asyncio
+async def test_get_transactions_comment_search_query_plan(db: AsyncSession):
+    # Arrange
+    user_id: UUID = uuid4()
+    await db.execute(text("INSERT INTO transactions (user_id, transaction_date, base_currency_amount, source_amount, "
+                          "source_currency, destination_amount, destination_currency, transaction_type, comment) "
+                          "SELECT :user_id, DATE '2025-01-01' + i % 365, 10, 10, 'USD', 10, 'USD', 'EXPENSE', "
+                          "CASE WHEN i % 1000 = 0 THEN 'Coffee' ELSE 'Lunch ' || i END "
+                          "FROM generate_series(1, 10000) AS i"),
+                     {'user_id': user_id})
+    await db.execute(text('ANALYZE transactions'))
+    request: TransactionRequest = TransactionRequest(date_from=date(2025, 1, 1), comment_query='coffee')
+    query: Select = transaction_crud._build_flat_transactions_query(request=request,
+                                                                    user_id=user_id).limit(request.size)
+
+    # Act
+    plan: str = await explain(db=db, query=query)
+
+    # Assert
+    assert 'Bitmap Index Scan on ix_transactions_comment_tsv' in plan
+
+
+@pytest.mark.asyncio
+async def test_get_transactions_query_plan(db: AsyncSession):
+    # Arrange
+    user_id: UUID = uuid4()
+    request: TransactionRequest = TransactionRequest(date_from=date(2025, 1, 1), date_to=date(2025, 12, 31))
+    query: Select = transaction_crud._build_flat_transactions_query(request=request,
+                                                                    user_id=user_id).limit(request.size)
+    # an empty table would be seq scanned anyway
+    await db.execute(text('SET LOCAL enable_seqscan = off'))
+
+    # Act
+    sql, parameters = compile_asyncpg(query)
+    plan: str = await explain(db=db, query=query)
+
+    # Assert
+    # statuses are inline, so the planner can match the partial index, the other values are bound
+    assert "transactions.status IN ('ACTIVE')" in sql
+    assert 'transactions.user_id = $1' in sql
+    assert str(user_id) not in sql
+    assert parameters[0] == user_id
+    assert date(2025, 1, 1) in parameters
+    assert date(2025, 12, 31) in parameters
+
+    assert 'Index Scan using ix_transactions_user_id_transaction_date_active on transactions' in plan
+    assert 'Sort' not in plan
+
+
+@pytest.mark.asyncio
+async def test_export_transactions(db: AsyncSession):
+    # Arrange
+    user_create_data: UserCreate = UserCreate(username='test',
+                                              registration_provider=ProviderType.TELEGRAM,
+                                              base_currency=CurrencyType.USD)
+    user_db: UserModel = await user_crud.create(db=db, obj_in=user_create_data, commit=True)
+    user_id: UUID = user_db.id
+
+    account_create_data: dict = {'user_id': user_id,
+                                 'name': 'Income USD',
+                                 'currency': CurrencyType.USD,
+                                 'account_type': AccountType.INCOME}
+    account_db: AccountModel = await account_crud.create(db=db, obj_in=account_create_data, commit=True)
+    income_source_create_data: IncomeSourceCreate = IncomeSourceCreate(user_id=user_id, name='Best Job')
+    income_source_db: IncomeSourceModel = await income_source_crud.create(db=db,
+                                                                          obj_in=income_source_create_data, commit=True)
+    transactions: list[Transaction] = []
+    for i in range(1, 4):
+        income_create_data: IncomeRequest = IncomeRequest(transaction_date=date(2025, 2, i),
+                                                          source_amount=Decimal('10') * i,
+                                                          source_currency=CurrencyType.USD,
+                                                          destination_amount=Decimal('10') * i,
+                                                          destination_currency=CurrencyType.USD,
+                                                          to_account_id=account_db.id,
+                                                          income_source_id=income_source_db.id,
+                                                          income_period=date(2025, 1, 1),
+                                                          comment='salary, part "1"')
+        transaction_processor: TransactionProcessor = TransactionProcessor.factory(db=db,
+                                                                                   user_id=user_id,
+                                                                                   transaction_type=income_create_data.transaction_type)
+        transactions.append(await transaction_processor.create(data=income_create_data))
+    await db.commit()
+
+    ndjson_request: TransactionExportRequest = TransactionExportRequest(date_from=date(2025, 1, 1),
+                                                                        date_to=date(2025, 12, 31),
+                                                                        export_format=ExportFormatType.NDJSON)
+    csv_request: TransactionExportRequest = TransactionExportRequest(date_from=date(2025, 1, 1),
+                                                                     date_to=date(2025, 12, 31),
+                                                                     export_format=ExportFormatType.CSV)
+
+    # Act
+    ndjson_export: str = ''.join([chunk async for chunk in transaction_service.export_transactions(
+        db=db, request=ndjson_request, user_id=user_id
+    )])
+    csv_export: str = ''.join([chunk async for chunk in transaction_service.export_transactions(
+        db=db, request=csv_request, user_id=user_id
+    )])
+
+    # Assert
+    ndjson_rows: list[TransactionExportRow] = [TransactionExportRow.model_validate_json(line)
+                                               for line in ndjson_export.splitlines()]
+    assert [row.id for row in ndjson_rows] == [t.id for t in reversed(transactions)]
+    assert ndjson_rows[0].source_amount == Decimal('30')
+    assert ndjson_rows[0].to_account_id == account_db.id
+    assert ndjson_rows[0].from_account_id is None
+    assert ndjson_rows[0].income_source_id == income_source_db.id
+    assert ndjson_rows[0].comment == 'salary, part "1"'
+
+    csv_rows: list[dict] = list(csv.DictReader(io.StringIO(csv_export)))
+    assert [UUID(row['id']) for row in csv_rows] == [row.id for row in ndjson_rows]
+    assert csv_rows[0]['transaction_type'] == TransactionType.INCOME.value
+    assert csv_rows[0]['comment'] == 'salary, part "1"'
+    assert csv_rows[0]['category_id'] == ''
+
+
 @pytest.mark.asyncio
 async def test_get_transaction_ok(db: AsyncSession):
     # Arrange
@@ -268,9 +706,10 @@ async def test_get_transaction_ok(db: AsyncSession):
     await db.commit()
 
     # Act
-    transaction: Transaction = await transaction_service.get_transaction(db=db,
-                                                                         transaction_id=transaction_before.id,
-                                                                         user_id=user_db.id)
+    with assert_query_count(3):
+        transaction: Transaction = await transaction_service.get_transaction(db=db,
+                                                                             transaction_id=transaction_before.id,
+                                                                             user_id=user_db.id)
 
     # Assert
     assert transaction.id == transaction_before.id
@@ -343,3 +782,366 @@ async def test_get_transaction_not_found_wrong_user(db: AsyncSession):
     assert exc.value.log_message == f'{TransactionModel.__name__} not found by {search_params}'
     assert exc.value.log_level == LogLevelType.ERROR
     assert exc.value.error_code == ErrorCodeType.ENTITY_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_create_transactions_ok(db: AsyncSession, db_transaction: AsyncSession):
+    # Arrange
+    user_create_data: UserCreate = UserCreate(username='test',
+                                              registration_provider=ProviderType.TELEGRAM,
+                                              base_currency=CurrencyType.USD)
+    user_db: UserModel = await user_crud.create(db=db, obj_in=user_create_data, commit=True)
+    user_id: UUID = user_db.id
+
+    account_create_data: dict = {'user_id': user_id,
+                                 'name': 'Income USD',
+                                 'currency': CurrencyType.USD,
+                                 'account_type': AccountType.INCOME}
+    account_income_db: AccountModel = await account_crud.create(db=db, obj_in=account_create_data, commit=True)
+    account_create_data: dict = {'user_id': user_id,
+                                 'name': 'Checking EUR',
+                                 'currency': CurrencyType.EUR,
+                                 'account_type': AccountType.CHECKING,
+                                 'balance': Decimal('100'),
+                                 'base_currency_rate': Decimal('0.9')}
+    account_checking_db: AccountModel = await account_crud.create(db=db, obj_in=account_create_data, commit=True)
+
+    income_source_db: IncomeSourceModel = await income_source_crud.create(
+        db=db, obj_in=IncomeSourceCreate(user_id=user_id, name='Best Job'), commit=True
+    )
+    category_db: CategoryModel = await category_crud.create(
+        db=db, obj_in=CategoryCreate(user_id=user_id, name='Food', type=CategoryType.GENERAL), commit=True
+    )
+    location_db: LocationModel = await location_crud.create(
+        db=db, obj_in=LocationCreate(user_id=user_id, name='Some shop'), commit=True
+    )
+
+    expense_create_data: list[ExpenseRequest] = [
+        ExpenseRequest(transaction_date=date(2025, 2, 1),
+                       source_amount=Decimal('9'),
+                       source_currency=CurrencyType.EUR,
+                       destination_amount=Decimal('9'),
+                       destination_currency=CurrencyType.EUR,
+                       from_account_id=account_checking_db.id,
+                       category_id=category_db.id,
+                       location_id=location_db.id)
+        for _ in range(3)
+    ]
+    income_create_data: list[IncomeRequest] = [
+        IncomeRequest(transaction_date=date(2025, 2, 1),
+                      source_amount=Decimal('50'),
+                      source_currency=CurrencyType.USD,
+                      destination_amount=Decimal('50'),
+                      destination_currency=CurrencyType.USD,
+                      to_account_id=account_income_db.id,
+                      income_source_id=income_source_db.id,
+                      income_period=date(2025, 1, 1))
+        for _ in range(2)
+    ]
+    transfer_create_data: TransferRequest = TransferRequest(transaction_date=date(2025, 2, 1),
+                                                            source_amount=Decimal('100'),
+                                                            source_currency=CurrencyType.USD,
+                                                            destination_amount=Decimal('90'),
+                                                            destination_currency=CurrencyType.EUR,
+                                                            from_account_id=account_income_db.id,
+                                                            to_account_id=account_checking_db.id)
+    create_data: list = [expense_create_data[0], transfer_create_data, *income_create_data, *expense_create_data[1:]]
+
+    # Act
+    transactions: list[Transaction] = await transaction_service.create_transactions(db=db_transaction,
+                                                                                    create_data=create_data,
+                                                                                    user_id=user_id)
+    await db_transaction.commit()
+
+    # Assert
+    assert [t.transaction_type for t in transactions] == [t.transaction_type for t in create_data]
+    assert len({t.id for t in transactions}) == len(create_data)
+    assert all(t.user_id == user_id for t in transactions)
+    assert transactions[0].base_currency_amount == Decimal('10')
+    assert transactions[1].base_currency_amount == Decimal('100')
+
+    assert transactions[0].from_account.id == account_checking_db.id
+    assert transactions[0].from_account.balance == Decimal('163')
+    assert transactions[0].to_account is None
+    assert transactions[0].category.id == category_db.id
+    assert transactions[0].location.id == location_db.id
+    assert transactions[1].from_account.id == account_income_db.id
+    assert transactions[1].to_account.id == account_checking_db.id
+    assert transactions[2].to_account.id == account_income_db.id
+    assert transactions[2].income_source.id == income_source_db.id
+
+    transactions_db: list[TransactionModel] = await transaction_crud.get_batch(db=db, user_id=user_id)
+    assert len(transactions_db) == len(create_data)
+
+    await db.refresh(account_income_db)
+    assert account_income_db.balance == Decimal('0')
+    assert account_income_db.base_currency_rate == Decimal('1')
+
+    await db.refresh(account_checking_db)
+    assert account_checking_db.balance == Decimal('163')
+    assert account_checking_db.base_currency_rate == Decimal('0.9')
+
+
+@pytest.mark.asyncio
+async def test_create_transactions_reference_not_found(db: AsyncSession, db_transaction: AsyncSession):
+    # Arrange
+    user_create_data: UserCreate = UserCreate(username='test',
+                                              registration_provider=ProviderType.TELEGRAM,
+                                              base_currency=CurrencyType.USD)
+    user_db: UserModel = await user_crud.create(db=db, obj_in=user_create_data, commit=True)
+    user_id: UUID = user_db.id
+
+    account_create_data: dict = {'user_id': user_id,
+                                 'name': 'Income USD',
+                                 'currency': CurrencyType.USD,
+                                 'account_type': AccountType.INCOME}
+    account_db: AccountModel = await account_crud.create(db=db, obj_in=account_create_data, commit=True)
+    income_source_id: UUID = uuid4()
+    create_data: list[IncomeRequest] = [IncomeRequest(transaction_date=date(2025, 2, 1),
+                                                      source_amount=Decimal('50'),
+                                                      source_currency=CurrencyType.USD,
+                                                      destination_amount=Decimal('50'),
+                                                      destination_currency=CurrencyType.USD,
+                                                      to_account_id=account_db.id,
+                                                      income_source_id=income_source_id,
+                                                      income_period=date(2025, 1, 1))]
+
+    # Act
+    with pytest.raises(EntityNotFound) as exc:
+        await transaction_service.create_transactions(db=db_transaction, create_data=create_data, user_id=user_id)
+
+    # Assert
+    assert exc.value.status_code == status.HTTP_404_NOT_FOUND
+    search_params = {'id': income_source_id, 'user_id': user_id}
+    assert exc.value.log_message == f'{IncomeSourceModel.__name__} not found by {search_params}'
+
+
+@pytest.mark.asyncio
+async def test_create_transactions_concurrent_ok(db: AsyncSession, engine: AsyncEngine):
+    # Arrange
+    user_create_data: UserCreate = UserCreate(username='test',
+                                              registration_provider=ProviderType.TELEGRAM,
+                                              base_currency=CurrencyType.USD)
+    user_db: UserModel = await user_crud.create(db=db, obj_in=user_create_data, commit=True)
+    accounts_db: list[AccountModel] = []
+    for name in ['Income USD 1', 'Income USD 2']:
+        account_create_data: dict = {'user_id': user_db.id,
+                                     'name': name,
+                                     'currency': CurrencyType.USD,
+                                     'account_type': AccountType.INCOME,
+                                     'balance': Decimal('100'),
+                                     'base_currency_rate': Decimal('1')}
+        accounts_db.append(await account_crud.create(db=db, obj_in=account_create_data, commit=True))
+
+    income_source_db: IncomeSourceModel = await income_source_crud.create(
+        db=db, obj_in=IncomeSourceCreate(user_id=user_db.id, name='Best Job'), commit=True
+    )
+
+    def batch_data(to_account_db: AccountModel, from_account_db: AccountModel) -> list:
+        return [IncomeRequest(transaction_date=date(2025, 2, 10),
+                              source_amount=Decimal('2'),
+                              source_currency=CurrencyType.USD,
+                              destination_amount=Decimal('2'),
+                              destination_currency=CurrencyType.USD,
+                              to_account_id=to_account_db.id,
+                              income_source_id=income_source_db.id,
+                              income_period=date(2025, 1, 1)),
+                TransferRequest(transaction_date=date(2025, 2, 10),
+                                source_amount=Decimal('1'),
+                                source_currency=CurrencyType.USD,
+                                destination_amount=Decimal('1'),
+                                destination_currency=CurrencyType.USD,
+                                from_account_id=from_account_db.id,
+                                to_account_id=to_account_db.id)]
+
+    session_maker = async_sessionmaker(engine, autocommit=False, autoflush=False, expire_on_commit=False)
+
+    async def create(to_account_db: AccountModel, from_account_db: AccountModel) -> None:
+        async with session_maker() as session:
+            await transaction_service.create_transactions(db=session,
+                                                          create_data=batch_data(to_account_db, from_account_db),
+                                                          user_id=user_db.id)
+            await session.commit()
+
+    # Act
+    # phase by phase the opposite batches would lock the income account first and wait for each other
+    await asyncio.gather(*[create(accounts_db[0], accounts_db[1]) for _ in range(5)],
+                         *[create(accounts_db[1], accounts_db[0]) for _ in range(5)])
+
+    # Assert
+    for account_db in accounts_db:
+        await db.refresh(account_db)
+        assert account_db.balance == Decimal('110')
+
+    transactions: list[TransactionModel] = (await db.scalars(select(TransactionModel)
+                                                             .where(TransactionModel.user_id == user_db.id))).all()
+    assert len(transactions) == 20
+
+
+@pytest.mark.asyncio
+async def test_create_transaction_idempotency_key(db: AsyncSession):
+    # Arrange
+    user_create_data: UserCreate = UserCreate(username='test',
+                                              registration_provider=ProviderType.TELEGRAM,
+                                              base_currency=CurrencyType.USD)
+    user_db: UserModel = await user_crud.create(db=db, obj_in=user_create_data, commit=True)
+    account_create_data: dict = {'user_id': user_db.id,
+                                 'name': 'Checking USD',
+                                 'currency': CurrencyType.USD,
+                                 'account_type': AccountType.CHECKING,
+                                 'base_currency_rate': Decimal('1')}
+    account_db: AccountModel = await account_crud.create(db=db, obj_in=account_create_data, commit=True)
+    category_create_data: CategoryCreate = CategoryCreate(user_id=user_db.id, name='Food', type=CategoryType.GENERAL)
+    category_db: CategoryModel = await category_crud.create(db=db, obj_in=category_create_data, commit=True)
+    location_create_data: LocationCreate = LocationCreate(user_id=user_db.id, name='Some shop')
+    location_db: LocationModel = await location_crud.create(db=db, obj_in=location_create_data, commit=True)
+    expense_create_data: ExpenseRequest = ExpenseRequest(transaction_date=date(2025, 2, 10),
+                                                         source_amount=Decimal('10'),
+                                                         source_currency=CurrencyType.USD,
+                                                         destination_amount=Decimal('10'),
+                                                         destination_currency=CurrencyType.USD,
+                                                         from_account_id=account_db.id,
+                                                         category_id=category_db.id,
+                                                         location_id=location_db.id)
+    other_create_data: ExpenseRequest = expense_create_data.model_copy(update={'source_amount': Decimal('20')})
+
+    # Act
+    transaction: Transaction = await transaction_service.create_transaction(db=db,
+                                                                            create_data=expense_create_data,
+                                                                            user_id=user_db.id,
+                                                                            idempotency_key='key-1')
+    await db.commit()
+    transaction_replayed: Transaction = await transaction_service.create_transaction(db=db,
+                                                                                     create_data=expense_create_data,
+                                                                                     user_id=user_db.id,
+                                                                                     idempotency_key='key-1')
+    await db.commit()
+    with assert_query_count(0):
+        transaction_cached: Transaction = await transaction_service.create_transaction(db=db,
+                                                                                       create_data=expense_create_data,
+                                                                                       user_id=user_db.id,
+                                                                                       idempotency_key='key-1')
+    with pytest.raises(UnprocessableException) as exc:
+        await transaction_service.create_transaction(db=db,
+                                                     create_data=other_create_data,
+                                                     user_id=user_db.id,
+                                                     idempotency_key='key-1')
+
+    # Assert
+    assert transaction_replayed == transaction_cached == transaction
+
+    await db.refresh(account_db)
+    assert account_db.balance == Decimal('-10')
+    transactions: list[TransactionModel] = (await db.scalars(select(TransactionModel))).all()
+    assert len(transactions) == 1
+
+    assert exc.value.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert exc.value.error_code == ErrorCodeType.IDEMPOTENCY_KEY_REUSED
+
+
+@pytest.mark.asyncio
+async def test_create_transaction_idempotency_key_without_response(db: AsyncSession):
+    # Arrange
+    user_id: UUID = uuid4()
+    await idempotency_key_crud.claim(db=db, user_id=user_id, key='key-1', request_hash='hash', expire_seconds=60)
+    await db.commit()
+    income_create_data: IncomeRequest = IncomeRequest(transaction_date=date(2025, 2, 10),
+                                                      source_amount=Decimal('100'),
+                                                      source_currency=CurrencyType.USD,
+                                                      destination_amount=Decimal('100'),
+                                                      destination_currency=CurrencyType.USD,
+                                                      to_account_id=uuid4(),
+                                                      income_source_id=uuid4(),
+                                                      income_period=date(2025, 1, 1))
+
+    # Act
+    with pytest.raises(IdempotencyKeyWithoutResponse) as exc:
+        await transaction_service.create_transaction(db=db,
+                                                     create_data=income_create_data,
+                                                     user_id=user_id,
+                                                     idempotency_key='key-1')
+
+    # Assert
+    assert exc.value.status_code == status.HTTP_409_CONFLICT
+    assert exc.value.error_code == ErrorCodeType.IDEMPOTENCY_KEY_WITHOUT_RESPONSE
+
+
+@pytest.mark.asyncio
+async def test_claim_idempotency_key_expired(db: AsyncSession):
+    # Arrange
+    user_id: UUID = uuid4()
+    await idempotency_key_crud.claim(db=db, user_id=user_id, key='key-1', request_hash='hash', expire_seconds=60)
+    await idempotency_key_crud.claim(db=db, user_id=user_id, key='key-2', request_hash='hash', expire_seconds=60)
+    await db.execute(update(IdempotencyKeyModel)
+                     .where(IdempotencyKeyModel.key == 'key-1')
+                     .values(created_at=func.now() - timedelta(seconds=120)))
+    await db.commit()
+
+    # Act
+    claimed_expired: bool = await idempotency_key_crud.claim(db=db,
+                                                             user_id=user_id,
+                                                             key='key-1',
+                                                             request_hash='hash',
+                                                             expire_seconds=60)
+    claimed_fresh: bool = await idempotency_key_crud.claim(db=db,
+                                                           user_id=user_id,
+                                                           key='key-2',
+                                                           request_hash='hash',
+                                                           expire_seconds=60)
+
+    # Assert
+    assert claimed_expired is True
+    assert claimed_fresh is False
+
+
+@pytest.mark.asyncio
+async def test_create_transaction_idempotency_key_concurrent(db: AsyncSession, engine: AsyncEngine):
+    # Arrange
+    user_create_data: UserCreate = UserCreate(username='test',
+                                              registration_provider=ProviderType.TELEGRAM,
+                                              base_currency=CurrencyType.USD)
+    user_db: UserModel = await user_crud.create(db=db, obj_in=user_create_data, commit=True)
+    account_create_data: dict = {'user_id': user_db.id,
+                                 'name': 'Income USD',
+                                 'currency': CurrencyType.USD,
+                                 'account_type': AccountType.INCOME}
+    account_db: AccountModel = await account_crud.create(db=db, obj_in=account_create_data, commit=True)
+    income_source_create_data: IncomeSourceCreate = IncomeSourceCreate(user_id=user_db.id, name='Best Job')
+    income_source_db: IncomeSourceModel = await income_source_crud.create(db=db,
+                                                                          obj_in=income_source_create_data, commit=True)
+    income_create_data: IncomeRequest = IncomeRequest(transaction_date=date(2025, 2, 10),
+                                                      source_amount=Decimal('100'),
+                                                      source_currency=CurrencyType.USD,
+                                                      destination_amount=Decimal('100'),
+                                                      destination_currency=CurrencyType.USD,
+                                                      to_account_id=account_db.id,
+                                                      income_source_id=income_source_db.id,
+                                                      income_period=date(2025, 1, 1))
+    session_maker = async_sessionmaker(engine, autocommit=False, autoflush=False, expire_on_commit=False)
+    first_db: AsyncSession = session_maker()
+    duplicate_db: AsyncSession = session_maker()
+
+    # Act
+    transaction: Transaction = await transaction_service.create_transaction(db=first_db,
+                                                                            create_data=income_create_data,
+                                                                            user_id=user_db.id,
+                                                                            idempotency_key='key-1')
+    duplicate = asyncio.create_task(transaction_service.create_transaction(db=duplicate_db,
+                                                                           create_data=income_create_data,
+                                                                           user_id=user_db.id,
+                                                                           idempotency_key='key-1'))
+    # the duplicate waits on the key row until the first request commits
+    await asyncio.sleep(0.2)
+    duplicate_done: bool = duplicate.done()
+    await first_db.commit()
+    transaction_duplicate: Transaction = await duplicate
+    await duplicate_db.commit()
+    await first_db.close()
+    await duplicate_db.close()
+
+    # Assert
+    assert duplicate_done is False
+    assert transaction_duplicate == transaction
+
+    transactions: list[TransactionModel] = (await db.scalars(select(TransactionModel))).all()
+    assert len(transactions) == 1
@@ -1,3 +1,4 @@
+import asyncio
 from copy import copy
 from datetime import date
 from decimal import Decimal
@@ -5,7 +6,7 @@ from uuid import UUID, uuid4
 
 import pytest
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncEngine, AsyncSession
 from starlette import status
 
 from app.configs.logging_settings import LogLevelType
@@ -13,7 +14,6 @@ from app.crud.accounting.account import account_crud
 from app.crud.accounting.category import category_crud
 from app.crud.accounting.location import location_crud
 from app.crud.user.user import user_crud
-from app.exceptions.conflict_409 import IntegrityException
 from app.exceptions.forbidden_403 import (AccountTypeMismatchException, CurrencyMismatchException,
                                           NoAccountBaseCurrencyRate)
 from app.exceptions.not_fount_404 import EntityNotFound
@@ -30,6 +30,7 @@ from app.schemas.error_response import ErrorCodeType
 from app.schemas.user.external_user import ProviderType
 from app.schemas.user.user import User as UserModel, UserCreate
 from app.services.accounting.transaction_processor.base import TransactionProcessor
+from tests.helpers import assert_query_count
 
 
 @pytest.mark.asyncio
@@ -72,7 +73,8 @@ async def test_create_expense_ok(db: AsyncSession, db_transaction: AsyncSession)
     transaction_processor: TransactionProcessor = TransactionProcessor.factory(db=db_transaction,
                                                                                user_id=user_id,
                                                                                transaction_type=expense_create_data.transaction_type)
-    transaction: Transaction = await transaction_processor.create(data=expense_create_data)
+    with assert_query_count(12):
+        transaction: Transaction = await transaction_processor.create(data=expense_create_data)
     await db_transaction.commit()
 
     # Assert
@@ -326,7 +328,7 @@ async def test_create_expense_account_type_mismatch(db: AsyncSession, db_transac
 
 
 @pytest.mark.asyncio
-async def test_create_expense_integrity_error(db: AsyncSession, db_transaction: AsyncSession):
+async def test_create_expense_category_of_other_user(db: AsyncSession, db_transaction: AsyncSession):
     # Arrange
     user_create_data: UserCreate = UserCreate(username='test',
                                               registration_provider=ProviderType.TELEGRAM,
@@ -347,31 +349,35 @@ async def test_create_expense_integrity_error(db: AsyncSession, db_transaction:
                                                           name='Some shop')
     location_db: LocationModel = await location_crud.create(db=db, obj_in=location_create_data, commit=True)
 
-    category_id: UUID = uuid4()
+    other_user_create_data: UserCreate = UserCreate(username='other',
+                                                    registration_provider=ProviderType.TELEGRAM,
+                                                    base_currency=CurrencyType.USD)
+    other_user_db: UserModel = await user_crud.create(db=db, obj_in=other_user_create_data, commit=True)
+    category_create_data: CategoryCreate = CategoryCreate(user_id=other_user_db.id,
+                                                          name='Food',
+                                                          type=CategoryType.GENERAL)
+    category_db: CategoryModel = await category_crud.create(db=db, obj_in=category_create_data, commit=True)
     expense_create_data: ExpenseRequest = ExpenseRequest(transaction_date=date(2025, 2, 10),
                                                          source_amount=Decimal('1'),
                                                          source_currency=CurrencyType.USD,
                                                          destination_amount=Decimal('111'),
                                                          destination_currency=CurrencyType.RSD,
                                                          from_account_id=account_db.id,
-                                                         category_id=category_id,
+                                                         category_id=category_db.id,
                                                          location_id=location_db.id)
 
     # Act
     transaction_processor: TransactionProcessor = TransactionProcessor.factory(db=db_transaction,
                                                                                user_id=user_id,
                                                                                transaction_type=expense_create_data.transaction_type)
-    with pytest.raises(IntegrityException) as exc:
+    with pytest.raises(EntityNotFound) as exc:
         await transaction_processor.create(data=expense_create_data)
 
     # Assert
-    assert exc.value.status_code == status.HTTP_409_CONFLICT
-    assert exc.value.message == 'Entity integrity error'
-    assert exc.value.log_message == (f'Transaction integrity error: DETAIL:  Key (category_id)='
-                                     f'({category_id}) is not present in table "categories".')
-    assert exc.value.logger is not None
-    assert exc.value.log_level == LogLevelType.ERROR
-    assert exc.value.error_code == ErrorCodeType.INTEGRITY_ERROR
+    assert exc.value.status_code == status.HTTP_404_NOT_FOUND
+    search_params = {'id': category_db.id, 'user_id': user_id}
+    assert exc.value.log_message == f'{CategoryModel.__name__} not found by {search_params}'
+    assert exc.value.error_code == ErrorCodeType.ENTITY_NOT_FOUND
 
     transactions: list[TransactionModel] = (await db.scalars(select(TransactionModel))).all()
     assert len(transactions) == 0
@@ -380,6 +386,65 @@ async def test_create_expense_integrity_error(db: AsyncSession, db_transaction:
     assert account_db_after.base_currency_rate == base_currency_rate_before
 
 
+@pytest.mark.asyncio
+async def test_create_expense_concurrent_ok(db: AsyncSession, engine: AsyncEngine):
+    # Arrange
+    user_create_data: UserCreate = UserCreate(username='test',
+                                              registration_provider=ProviderType.TELEGRAM,
+                                              base_currency=CurrencyType.USD)
+    user_db: UserModel = await user_crud.create(db=db, obj_in=user_create_data, commit=True)
+    user_id: UUID = user_db.id
+
+    account_create_data: dict = {'user_id': user_id,
+                                 'name': 'Checking USD',
+                                 'currency': CurrencyType.USD,
+                                 'account_type': AccountType.CHECKING,
+                                 'base_currency_rate': Decimal('1')}
+    account_db: AccountModel = await account_crud.create(db=db, obj_in=account_create_data, commit=True)
+
+    category_create_data: CategoryCreate = CategoryCreate(user_id=user_id,
+                                                          name='Food',
+                                                          type=CategoryType.GENERAL)
+    category_db: CategoryModel = await category_crud.create(db=db, obj_in=category_create_data, commit=True)
+
+    location_create_data: LocationCreate = LocationCreate(user_id=user_id,
+                                                          name='Some shop')
+    location_db: LocationModel = await location_crud.create(db=db, obj_in=location_create_data, commit=True)
+
+    expense_create_data: ExpenseRequest = ExpenseRequest(transaction_date=date(2025, 2, 10),
+                                                         source_amount=Decimal('1'),
+                                                         source_currency=CurrencyType.USD,
+                                                         destination_amount=Decimal('111'),
+                                                         destination_currency=CurrencyType.RSD,
+                                                         from_account_id=account_db.id,
+                                                         category_id=category_db.id,
+                                                         location_id=location_db.id)
+    session_maker = async_sessionmaker(engine, autocommit=False, autoflush=False, expire_on_commit=False)
+    sessions: list[AsyncSession] = [session_maker() for _ in range(2)]
+    processors: list[TransactionProcessor] = [TransactionProcessor.factory(db=session,
+                                                                           user_id=user_id,
+                                                                           transaction_type=TransactionType.EXPENSE)
+                                              for session in sessions]
+    # both sessions load the account before any of them writes
+    for processor in processors:
+        await processor._prepare_transaction(data=expense_create_data)
+
+    async def create(processor: TransactionProcessor) -> None:
+        await processor.create(data=expense_create_data)
+        await processor.db.commit()
+        await processor.db.close()
+
+    # Act
+    await asyncio.gather(*[create(processor) for processor in processors])
+
+    # Assert
+    await db.refresh(account_db)
+    assert account_db.balance == Decimal('-2')
+
+    transactions: list[TransactionModel] = (await db.scalars(select(TransactionModel))).all()
+    assert len(transactions) == 2
+
+
 @pytest.mark.asyncio
 async def test_delete_ok(db: AsyncSession, db_transaction: AsyncSession):
     # Arrange
@@ -12,7 +12,6 @@ from app.configs.logging_settings import LogLevelType
 from app.crud.accounting.account import account_crud
 from app.crud.accounting.income_source import income_source_crud
 from app.crud.user.user import user_crud
-from app.exceptions.conflict_409 import IntegrityException
 from app.exceptions.forbidden_403 import AccountTypeMismatchException, CurrencyMismatchException
 from app.exceptions.not_fount_404 import EntityNotFound
 from app.models.accounting.account import Account as AccountModel
@@ -392,7 +391,7 @@ async def test_create_income_account_type_mismatch(db: AsyncSession, db_transact
 
 
 @pytest.mark.asyncio
-async def test_create_income_integrity_error(db: AsyncSession, db_transaction: AsyncSession):
+async def test_create_income_income_source_not_found(db: AsyncSession, db_transaction: AsyncSession):
     # Arrange
     user_create_data: UserCreate = UserCreate(username='test',
                                               registration_provider=ProviderType.TELEGRAM,
@@ -421,18 +420,15 @@ async def test_create_income_integrity_error(db: AsyncSession, db_transaction: A
     transaction_processor: TransactionProcessor = TransactionProcessor.factory(db=db_transaction,
                                                                                user_id=user_id,
                                                                                transaction_type=income_create_data.transaction_type)
-    with pytest.raises(IntegrityException) as exc:
+    with pytest.raises(EntityNotFound) as exc:
         await transaction_processor.create(data=income_create_data)
         await db_transaction.commit()
 
     # Assert
-    assert exc.value.status_code == status.HTTP_409_CONFLICT
-    assert exc.value.message == 'Entity integrity error'
-    assert exc.value.log_message == (f'Transaction integrity error: DETAIL:  Key (income_source_id)='
-                                     f'({income_source_id}) is not present in table "income_sources".')
-    assert exc.value.logger is not None
-    assert exc.value.log_level == LogLevelType.ERROR
-    assert exc.value.error_code == ErrorCodeType.INTEGRITY_ERROR
+    assert exc.value.status_code == status.HTTP_404_NOT_FOUND
+    search_params = {'id': income_source_id, 'user_id': user_id}
+    assert exc.value.log_message == f'{IncomeSourceModel.__name__} not found by {search_params}'
+    assert exc.value.error_code == ErrorCodeType.ENTITY_NOT_FOUND
 
     transactions: list[TransactionModel] = (await db.execute(select(TransactionModel))).scalars().all()
     assert len(transactions) == 0
@@ -1,13 +1,17 @@
+import asyncio
 from copy import copy
 from datetime import date
 from decimal import Decimal
+from uuid import UUID, uuid4
 
 import pytest
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncEngine, AsyncSession
 from starlette import status
 
 from app.configs.logging_settings import LogLevelType
+from app.configs.settings import settings
 from app.crud.accounting.account import account_crud
 from app.crud.user.user import user_crud
 from app.exceptions.forbidden_403 import NoAccountBaseCurrencyRate
@@ -22,6 +26,7 @@ from app.schemas.error_response import ErrorCodeType
 from app.schemas.user.external_user import ProviderType
 from app.schemas.user.user import UserCreate
 from app.services.accounting.transaction_processor.base import TransactionProcessor
+from tests.helpers import assert_query_count
 
 
 @pytest.mark.asyncio
@@ -60,7 +65,8 @@ async def test_create_transfer_base_to_base_ok(db: AsyncSession, db_transaction:
     transaction_processor: TransactionProcessor = TransactionProcessor.factory(db=db_transaction,
                                                                                user_id=user_db.id,
                                                                                transaction_type=transfer_create_data.transaction_type)
-    transaction: Transaction = await transaction_processor.create(data=transfer_create_data)
+    with assert_query_count(10):
+        transaction: Transaction = await transaction_processor.create(data=transfer_create_data)
     await db_transaction.commit()
 
     # Assert
@@ -501,3 +507,115 @@ async def test_delete_other_to_other_ok(db: AsyncSession, db_transaction: AsyncS
     account_db_to_after: AccountModel = await account_crud.get(db=db, id=account_to_db.id)
     assert account_db_to_after.balance == Decimal('11100') == account_to_balance_before
     assert account_db_to_after.base_currency_rate == Decimal('111.0000') == base_currency_to_rate_before
+
+
+@pytest.mark.asyncio
+async def test_transfer_opposite_concurrent_ok(db: AsyncSession, engine: AsyncEngine):
+    # Arrange
+    user_create_data: UserCreate = UserCreate(username='test',
+                                              registration_provider=ProviderType.TELEGRAM,
+                                              base_currency=CurrencyType.USD)
+    user_db: UserModel = await user_crud.create(db=db, obj_in=user_create_data, commit=True)
+    accounts_db: list[AccountModel] = []
+    for name in ['Checking USD 1', 'Checking USD 2']:
+        account_create_data: dict = {'user_id': user_db.id,
+                                     'name': name,
+                                     'currency': CurrencyType.USD,
+                                     'account_type': AccountType.CHECKING,
+                                     'balance': Decimal('100'),
+                                     'base_currency_rate': Decimal('1')}
+        accounts_db.append(await account_crud.create(db=db, obj_in=account_create_data, commit=True))
+
+    def transfer_data(from_account_db: AccountModel, to_account_db: AccountModel) -> TransferRequest:
+        return TransferRequest(transaction_date=date(2025, 2, 10),
+                               source_amount=Decimal('1'),
+                               source_currency=CurrencyType.USD,
+                               destination_currency=CurrencyType.USD,
+                               from_account_id=from_account_db.id,
+                               to_account_id=to_account_db.id)
+
+    transaction_processor: TransactionProcessor = TransactionProcessor.factory(db=db,
+                                                                               user_id=user_db.id,
+                                                                               transaction_type=TransactionType.TRANSFER)
+    transactions_to_delete: list[Transaction] = [
+        await transaction_processor.create(data=transfer_data(accounts_db[1], accounts_db[0])) for _ in range(5)
+    ]
+    await db.commit()
+
+    session_maker = async_sessionmaker(engine, autocommit=False, autoflush=False, expire_on_commit=False)
+
+    async def create(from_account_db: AccountModel, to_account_db: AccountModel) -> None:
+        async with session_maker() as session:
+            processor: TransactionProcessor = TransactionProcessor.factory(db=session,
+                                                                           user_id=user_db.id,
+                                                                           transaction_type=TransactionType.TRANSFER)
+            await processor.create(data=transfer_data(from_account_db, to_account_db))
+            await session.commit()
+
+    async def delete(transaction_id: UUID) -> None:
+        async with session_maker() as session:
+            processor: TransactionProcessor = TransactionProcessor.factory(db=session,
+                                                                           user_id=user_db.id,
+                                                                           transaction_type=TransactionType.TRANSFER)
+            await processor.delete(transaction_id=transaction_id)
+            await session.commit()
+
+    # Act
+    # deletes of 2 -> 1 transfers lock the accounts in the opposite order of their updates
+    await asyncio.gather(*[create(accounts_db[0], accounts_db[1]) for _ in range(5)],
+                         *[create(accounts_db[1], accounts_db[0]) for _ in range(5)],
+                         *[delete(transaction.id) for transaction in transactions_to_delete])
+
+    # Assert
+    for account_db in accounts_db:
+        await db.refresh(account_db)
+        assert account_db.balance == Decimal('100')
+
+    transactions: list[TransactionModel] = (await db.scalars(select(TransactionModel)
+                                                             .where(TransactionModel.status == EntityStatusType.ACTIVE))).all()
+    assert len(transactions) == 10
+
+
+@pytest.mark.asyncio
+async def test_retry_on_conflict(db: AsyncSession, monkeypatch: pytest.MonkeyPatch):
+    # Arrange
+    class DeadlockDetected(Exception):
+        sqlstate = '40P01'
+
+    class CheckViolation(Exception):
+        sqlstate = '23514'
+
+    monkeypatch.setattr(settings, 'lock_retry_backoff_seconds', 0)
+    transaction_processor: TransactionProcessor = TransactionProcessor.factory(db=db,
+                                                                               user_id=uuid4(),
+                                                                               transaction_type=TransactionType.TRANSFER)
+    attempts: list[int] = []
+
+    async def deadlock_once() -> str:
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise DBAPIError('UPDATE accounts', None, DeadlockDetected())
+        return 'done'
+
+    async def deadlock_always() -> str:
+        raise DBAPIError('UPDATE accounts', None, DeadlockDetected())
+
+    async def check_violation() -> str:
+        attempts.append(1)
+        raise DBAPIError('UPDATE accounts', None, CheckViolation())
+
+    # Act
+    result: str = await transaction_processor._retry_on_conflict(deadlock_once)
+    retried_attempts: int = len(attempts)
+    with pytest.raises(DBAPIError) as deadlock_exc:
+        await transaction_processor._retry_on_conflict(deadlock_always)
+    attempts.clear()
+    with pytest.raises(DBAPIError) as check_exc:
+        await transaction_processor._retry_on_conflict(check_violation)
+
+    # Assert
+    assert result == 'done'
+    assert retried_attempts == 2
+    assert isinstance(deadlock_exc.value.orig, DeadlockDetected)
+    assert isinstance(check_exc.value.orig, CheckViolation)
+    assert len(attempts) == 1
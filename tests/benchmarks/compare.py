@@ -0,0 +1,29 @@
+"""
+Compares two benchmark result files: python -m tests.benchmarks.compare old.json new.json
+"""
+import json
+import sys
+
+
+def compare(old_path: str, new_path: str, metric: str = 'median_ms') -> list[str]:
+    with open(old_path) as old_file, open(new_path) as new_file:
+        old: dict = json.load(old_file)
+        new: dict = json.load(new_file)
+
+    old_results: dict[tuple, dict] = {(r['operation'], r['rows']): r for r in old['results']}
+    lines: list[str] = [f'{old["commit"]} -> {new["commit"]} ({metric})']
+    for result in new['results']:
+        key: tuple = (result['operation'], result['rows'])
+        if key not in old_results:
+            lines.append(f'{key[0]:<40} {key[1]:>9} {"":>10} {result[metric]:>10.2f}')
+            continue
+
+        before: float = old_results[key][metric]
+        change: float = (result[metric] - before) / before * 100 if before else 0
+        lines.append(f'{key[0]:<40} {key[1]:>9} {before:>10.2f} {result[metric]:>10.2f} {change:>+8.1f}%')
+
+    return lines
+
+
+if __name__ == '__main__':
+    print('\n'.join(compare(*sys.argv[1:4])))
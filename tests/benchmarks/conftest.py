@@ -0,0 +1,75 @@
+import json
+import math
+import os
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable
+
+import pytest
+
+BENCHMARK_SIZES: list[int] = [int(size) for size in os.environ.get('BENCHMARK_SIZES', '1000,100000,1000000').split(',')]
+BENCHMARK_ITERATIONS: int = int(os.environ.get('BENCHMARK_ITERATIONS', '50'))
+BENCHMARK_OUTPUT: str = os.environ.get('BENCHMARK_OUTPUT', 'benchmark_results.json')
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    if os.environ.get('BENCHMARK') is not None:
+        return
+
+    skip = pytest.mark.skip(reason='Benchmarks run only with BENCHMARK=1')
+    for item in items:
+        if 'benchmarks' in item.nodeid:
+            item.add_marker(skip)
+
+
+class BenchmarkRecorder:
+    def __init__(self):
+        self.results: list[dict[str, Any]] = []
+
+    async def measure(self,
+                      operation: str,
+                      rows: int,
+                      func: Callable[[int], Awaitable[Any]],
+                      iterations: int = BENCHMARK_ITERATIONS) -> None:
+        """
+        Calls `func(i)` `iterations` times and records the latency distribution in milliseconds
+        """
+        timings: list[float] = []
+        for i in range(iterations):
+            started_at: float = time.perf_counter()
+            await func(i)
+            timings.append((time.perf_counter() - started_at) * 1000)
+
+        timings.sort()
+        self.results.append({'operation': operation,
+                             'rows': rows,
+                             'iterations': iterations,
+                             'mean_ms': round(statistics.mean(timings), 3),
+                             'median_ms': round(statistics.median(timings), 3),
+                             # nearest rank, also defined for a single iteration
+                             'p95_ms': round(timings[max(0, math.ceil(len(timings) * 0.95) - 1)], 3),
+                             'min_ms': round(timings[0], 3),
+                             'max_ms': round(timings[-1], 3),
+                             'ops_per_second': round(1000 * iterations / sum(timings), 1)})
+
+    def dump(self, path: str) -> None:
+        try:
+            commit: str | None = subprocess.run(['git', 'rev-parse', 'HEAD'],
+                                                capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+
+        with open(path, 'w') as file:
+            json.dump({'commit': commit, 'created_at': datetime.now().isoformat(), 'results': self.results},
+                      file, indent=2)
+
+
+@pytest.fixture(scope='session')
+def benchmark_recorder() -> BenchmarkRecorder:
+    recorder = BenchmarkRecorder()
+    yield recorder
+
+    if len(recorder.results) > 0:
+        recorder.dump(BENCHMARK_OUTPUT)
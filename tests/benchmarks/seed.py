@@ -0,0 +1,130 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Iterator
+from uuid import UUID, uuid4
+
+from sqlalchemy import insert, Table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.accounting.account import Account
+from app.models.accounting.category import Category
+from app.models.accounting.income_source import IncomeSource
+from app.models.accounting.location import Location
+from app.models.accounting.transaction import ExpenseTransaction, IncomeTransaction, Transaction
+from app.models.user.user import User
+from app.schemas.accounting.account import AccountType
+from app.schemas.accounting.category import CategoryType
+from app.schemas.accounting.transaction import TransactionType
+from app.schemas.base import CurrencyType
+from app.schemas.user.external_user import ProviderType
+
+CHUNK_SIZE = 5000
+
+
+class SeededUser:
+    def __init__(self, user_id: UUID):
+        self.id = user_id
+        self.income_account_id: UUID | None = None
+        self.checking_account_ids: list[UUID] = []
+        self.category_id: UUID | None = None
+        self.location_id: UUID | None = None
+        self.income_source_id: UUID | None = None
+        self.expense_ids: list[UUID] = []
+
+
+async def _insert(db: AsyncSession, table: Table, rows: list[dict[str, Any]]) -> None:
+    for i in range(0, len(rows), CHUNK_SIZE):
+        await db.execute(insert(table), rows[i:i + CHUNK_SIZE])
+
+
+def _transactions(user: SeededUser, account_id: UUID, count: int, rnd: random.Random) -> Iterator[tuple[dict, dict]]:
+    today: date = date.today()
+    is_income: bool = account_id == user.income_account_id
+    for _ in range(count):
+        amount: Decimal = Decimal(rnd.randint(100, 100000)) / 100
+        transaction_id: UUID = uuid4()
+        parent: dict[str, Any] = {'id': transaction_id,
+                                  'user_id': user.id,
+                                  'transaction_date': today - timedelta(days=rnd.randint(0, 364)),
+                                  'base_currency_amount': amount,
+                                  'source_amount': amount,
+                                  'source_currency': CurrencyType.USD,
+                                  'destination_amount': amount,
+                                  'destination_currency': CurrencyType.USD,
+                                  'transaction_type': TransactionType.INCOME if is_income else TransactionType.EXPENSE}
+        if is_income:
+            child: dict[str, Any] = {'id': transaction_id,
+                                     'to_account_id': account_id,
+                                     'income_source_id': user.income_source_id,
+                                     'income_period': today.replace(day=1)}
+        else:
+            child: dict[str, Any] = {'id': transaction_id,
+                                     'from_account_id': account_id,
+                                     'category_id': user.category_id,
+                                     'location_id': user.location_id}
+        yield parent, child
+
+
+async def seed(db: AsyncSession,
+               users: int,
+               accounts_per_user: int,
+               transactions_per_account: int,
+               random_seed: int = 0) -> list[SeededUser]:
+    """
+    Inserts `users` users with one income and `accounts_per_user - 1` checking USD accounts each.
+    Every account gets `transactions_per_account` incomes or expenses over the last year.
+    Rows are inserted directly, account balances are not recalculated.
+    """
+    rnd = random.Random(random_seed)
+    seeded_users: list[SeededUser] = [SeededUser(user_id=uuid4()) for _ in range(users)]
+
+    user_rows, account_rows, category_rows, location_rows, income_source_rows = [], [], [], [], []
+    for i, user in enumerate(seeded_users):
+        user_rows.append({'id': user.id,
+                          'username': f'benchmark_{i}',
+                          'registration_provider': ProviderType.TEST,
+                          'base_currency': CurrencyType.USD})
+        for j in range(accounts_per_user):
+            account_id: UUID = uuid4()
+            account_type: AccountType = AccountType.INCOME if j == 0 else AccountType.CHECKING
+            account_rows.append({'id': account_id,
+                                 'user_id': user.id,
+                                 'name': f'Account {j}',
+                                 'currency': CurrencyType.USD,
+                                 'account_type': account_type,
+                                 'balance': Decimal('1000000000'),
+                                 'base_currency_rate': Decimal('1')})
+            if j == 0:
+                user.income_account_id = account_id
+            else:
+                user.checking_account_ids.append(account_id)
+
+        user.category_id, user.location_id, user.income_source_id = uuid4(), uuid4(), uuid4()
+        category_rows.append({'id': user.category_id, 'user_id': user.id, 'name': 'Food', 'type': CategoryType.GENERAL})
+        location_rows.append({'id': user.location_id, 'user_id': user.id, 'name': 'Some shop'})
+        income_source_rows.append({'id': user.income_source_id, 'user_id': user.id, 'name': 'Best Job'})
+
+    await _insert(db=db, table=User.__table__, rows=user_rows)
+    await _insert(db=db, table=Account.__table__, rows=account_rows)
+    await _insert(db=db, table=Category.__table__, rows=category_rows)
+    await _insert(db=db, table=Location.__table__, rows=location_rows)
+    await _insert(db=db, table=IncomeSource.__table__, rows=income_source_rows)
+
+    for user in seeded_users:
+        parent_rows, income_rows, expense_rows = [], [], []
+        for account_id in [user.income_account_id, *user.checking_account_ids]:
+            for parent, child in _transactions(user=user, account_id=account_id, count=transactions_per_account, rnd=rnd):
+                parent_rows.append(parent)
+                if parent['transaction_type'] == TransactionType.INCOME:
+                    income_rows.append(child)
+                else:
+                    expense_rows.append(child)
+                    user.expense_ids.append(child['id'])
+
+        await _insert(db=db, table=Transaction.__table__, rows=parent_rows)
+        await _insert(db=db, table=IncomeTransaction.__table__, rows=income_rows)
+        await _insert(db=db, table=ExpenseTransaction.__table__, rows=expense_rows)
+
+    await db.commit()
+    return seeded_users
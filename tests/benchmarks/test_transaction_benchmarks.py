@@ -0,0 +1,93 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi_pagination import Page
+from fastapi_pagination.ext.sqlalchemy import paginate
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.accounting.transaction import transaction_crud
+from app.schemas.accounting.transaction import (ExpenseRequest, IncomeRequest, Transaction, TransactionRequest,
+                                                TransactionType, TransferRequest)
+from app.schemas.base import CurrencyType
+from app.services.accounting import transaction_service
+from app.services.accounting.transaction_processor.base import TransactionProcessor
+from tests.benchmarks.conftest import BENCHMARK_SIZES, BenchmarkRecorder
+from tests.benchmarks.seed import seed, SeededUser
+
+ACCOUNTS_PER_USER = 4
+TRANSACTIONS_PER_USER = 1000
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('rows', BENCHMARK_SIZES)
+async def test_transaction_hot_paths(db: AsyncSession, benchmark_recorder: BenchmarkRecorder, rows: int):
+    users_count: int = max(1, rows // TRANSACTIONS_PER_USER)
+    users: list[SeededUser] = await seed(db=db,
+                                         users=users_count,
+                                         accounts_per_user=ACCOUNTS_PER_USER,
+                                         transactions_per_account=rows // users_count // ACCOUNTS_PER_USER)
+
+    def user(i: int) -> SeededUser:
+        return users[i % len(users)]
+
+    async def create_expense(i: int) -> None:
+        data = ExpenseRequest(transaction_date=date.today(),
+                              source_amount=Decimal('10'),
+                              source_currency=CurrencyType.USD,
+                              destination_amount=Decimal('10'),
+                              destination_currency=CurrencyType.USD,
+                              from_account_id=user(i).checking_account_ids[0],
+                              category_id=user(i).category_id,
+                              location_id=user(i).location_id)
+        await TransactionProcessor.factory(db=db, user_id=user(i).id, transaction_type=TransactionType.EXPENSE) \
+            .create(data=data)
+        await db.commit()
+
+    async def create_income(i: int) -> None:
+        data = IncomeRequest(transaction_date=date.today(),
+                             source_amount=Decimal('10'),
+                             source_currency=CurrencyType.USD,
+                             destination_amount=Decimal('10'),
+                             destination_currency=CurrencyType.USD,
+                             to_account_id=user(i).income_account_id,
+                             income_source_id=user(i).income_source_id,
+                             income_period=date.today())
+        await TransactionProcessor.factory(db=db, user_id=user(i).id, transaction_type=TransactionType.INCOME) \
+            .create(data=data)
+        await db.commit()
+
+    async def create_transfer(i: int) -> None:
+        data = TransferRequest(transaction_date=date.today(),
+                               source_amount=Decimal('10'),
+                               source_currency=CurrencyType.USD,
+                               destination_amount=Decimal('10'),
+                               destination_currency=CurrencyType.USD,
+                               from_account_id=user(i).checking_account_ids[0],
+                               to_account_id=user(i).checking_account_ids[1])
+        await TransactionProcessor.factory(db=db, user_id=user(i).id, transaction_type=TransactionType.TRANSFER) \
+            .create(data=data)
+        await db.commit()
+
+    async def delete_expense(i: int) -> None:
+        transaction_id = user(i).expense_ids[i // len(users)]
+        await TransactionProcessor.factory(db=db, user_id=user(i).id, transaction_type=TransactionType.EXPENSE) \
+            .delete(transaction_id=transaction_id)
+        await db.commit()
+
+    async def get_transactions(i: int) -> None:
+        request = TransactionRequest(date_from=date.today() - timedelta(days=365), date_to=date.today())
+        await transaction_service.get_transactions(db=db, request=request, user_id=user(i).id)
+
+    async def get_transactions_orm(i: int) -> None:
+        # polymorphic ORM objects with one SELECT IN per relationship, the path replaced by the flat projection
+        request = TransactionRequest(date_from=date.today() - timedelta(days=365), date_to=date.today())
+        query = transaction_crud._build_transactions_query(request=request, user_id=user(i).id, rank_by_comment=True)
+        Page[Transaction].model_validate(await paginate(db, query, request))
+
+    await benchmark_recorder.measure('Expense.create', rows, create_expense)
+    await benchmark_recorder.measure('Income.create', rows, create_income)
+    await benchmark_recorder.measure('Transfer.create', rows, create_transfer)
+    await benchmark_recorder.measure('TransactionProcessor.delete', rows, delete_expense)
+    await benchmark_recorder.measure('transaction_service.get_transactions', rows, get_transactions)
+    await benchmark_recorder.measure('transaction_service.get_transactions (ORM)', rows, get_transactions_orm)
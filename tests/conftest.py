@@ -1,6 +1,7 @@
 import pytest_asyncio
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
+from app.db.query_counter import install_query_counter
 from app.models.base import Base
 
 
@@ -8,6 +9,7 @@ from app.models.base import Base
 async def engine(postgresql):
     connection = f'postgresql+asyncpg://{postgresql.info.user}:@{postgresql.info.host}:{postgresql.info.port}/{postgresql.info.dbname}'
     engine = create_async_engine(connection)
+    install_query_counter(engine)
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -0,0 +1,37 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import Select
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.sql.compiler import SQLCompiler
+
+from app.db.query_counter import count_queries, QueryStats
+
+
+@contextmanager
+def assert_query_count(expected: int) -> Iterator[QueryStats]:
+    """
+    Pins the number of SQL statements executed inside the block
+    """
+    with count_queries() as query_stats:
+        yield query_stats
+
+    statements: str = '\n'.join(f'{count} x {statement}' for statement, count in query_stats.statements.items())
+    assert query_stats.count == expected, f'Expected {expected} queries, got {query_stats.count}:\n{statements}'
+
+
+def compile_asyncpg(query: Select) -> tuple[str, tuple]:
+    """
+    SQL and positional parameters the way asyncpg gets them: `literal_execute` parameters inline, the rest bound
+    """
+    compiled: SQLCompiler = query.compile(dialect=asyncpg.dialect(), compile_kwargs={'render_postcompile': True})
+    parameters: tuple = tuple(compiled.params[name] for name in compiled.positiontup)
+    return str(compiled), parameters
+
+
+async def explain(db: AsyncSession, query: Select) -> str:
+    sql, parameters = compile_asyncpg(query)
+    connection: AsyncConnection = await db.connection()
+    plan: str = '\n'.join(row[0] for row in await connection.exec_driver_sql(f'EXPLAIN {sql}', parameters))
+    return plan
@@ -0,0 +1,83 @@
+from datetime import date
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, Response
+from fastapi.responses import PlainTextResponse
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel
+
+from app.api.routes import ModelRoute
+
+
+class Item(BaseModel):
+    id: UUID  # noqa: A003
+    amount: Decimal
+    day: date
+    comment: str | None = None
+
+
+ITEMS: list[Item] = [Item(id=uuid4(), amount=Decimal('10.50'), day=date(2025, 2, 1)),
+                     Item(id=uuid4(), amount=Decimal('1'), day=date(2025, 2, 2), comment='Coffee')]
+
+
+def _set_header(response: Response) -> None:
+    response.headers['ETag'] = 'W/"1"'
+
+
+def _build_app(route_class: type) -> FastAPI:
+    router = APIRouter(route_class=route_class)
+
+    @router.get('/items', dependencies=[Depends(_set_header)])
+    async def get_items(limit: int = 2) -> list[Item]:
+        return ITEMS[:limit]
+
+    @router.post('/items', status_code=201)
+    async def create_item(item: Item) -> Item:
+        return item
+
+    @router.get('/text', dependencies=[Depends(_set_header)])
+    async def get_text() -> PlainTextResponse:
+        return PlainTextResponse('text', headers={'ETag': 'W/"2"'})
+
+    @router.get('/not_modified', dependencies=[Depends(_set_header)])
+    async def get_not_modified() -> Response:
+        return Response(status_code=304)
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_model_route_matches_default_route():
+    # Arrange
+    model_app: FastAPI = _build_app(route_class=ModelRoute)
+    default_app: FastAPI = _build_app(route_class=APIRouter().route_class)
+
+    # Act
+    async with (AsyncClient(transport=ASGITransport(app=model_app), base_url='http://test') as model_client,
+                AsyncClient(transport=ASGITransport(app=default_app), base_url='http://test') as default_client):
+        items_response = await model_client.get('/items', params={'limit': 2})
+        items_default_response = await default_client.get('/items', params={'limit': 2})
+        create_response = await model_client.post('/items', content=ITEMS[1].model_dump_json())
+        text_response = await model_client.get('/text')
+        not_modified_response = await model_client.get('/not_modified')
+
+    # Assert
+    assert items_response.status_code == 200
+    assert items_response.json() == items_default_response.json()
+    assert items_response.headers['content-type'] == 'application/json'
+    assert items_response.headers['etag'] == 'W/"1"'
+
+    assert create_response.status_code == 201
+    assert Item.model_validate_json(create_response.content) == ITEMS[1]
+
+    assert text_response.text == 'text'
+    assert text_response.headers.get_list('etag') == ['W/"2"']
+
+    assert not_modified_response.status_code == 304
+    assert not_modified_response.headers['etag'] == 'W/"1"'
+
+    assert model_app.openapi()['paths'] == default_app.openapi()['paths']
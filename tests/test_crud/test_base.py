@@ -0,0 +1,37 @@
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.accounting.account import account_crud
+from app.models.accounting.account import Account as AccountModel
+from app.schemas.accounting.account import AccountCreate, AccountType
+from app.schemas.base import CurrencyType
+
+
+@pytest.mark.asyncio
+async def test_create_batch_different_unset_fields(db: AsyncSession):
+    # Arrange
+    user_id = uuid4()
+    defaults_data: AccountCreate = AccountCreate(user_id=user_id,
+                                                 name='Checking USD',
+                                                 currency=CurrencyType.USD,
+                                                 account_type=AccountType.CHECKING)
+    balance_data: dict = {'user_id': user_id,
+                          'name': 'Income USD',
+                          'currency': CurrencyType.USD,
+                          'account_type': AccountType.INCOME,
+                          'balance': Decimal('100')}
+
+    # Act
+    accounts_set_later: list[AccountModel] = await account_crud.create_batch(db=db,
+                                                                             objs_in=[defaults_data, balance_data])
+    accounts_set_first: list[AccountModel] = await account_crud.create_batch(
+        db=db, objs_in=[{**balance_data, 'name': 'Savings USD'}, defaults_data.model_copy(update={'name': 'Cash USD'})]
+    )
+
+    # Assert
+    assert [account.balance for account in accounts_set_later] == [Decimal('0'), Decimal('100')]
+    assert [account.balance for account in accounts_set_first] == [Decimal('100'), Decimal('0')]
+    assert all(account.base_currency_rate == Decimal('0') for account in accounts_set_later + accounts_set_first)
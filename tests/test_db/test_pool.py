@@ -0,0 +1,36 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.db.pool import PoolMonitor, warm_up_pool
+
+
+@pytest.mark.asyncio
+async def test_warm_up_pool(postgresql):
+    # Arrange
+    connection = f'postgresql+asyncpg://{postgresql.info.user}:@{postgresql.info.host}:{postgresql.info.port}/{postgresql.info.dbname}'
+    engine: AsyncEngine = create_async_engine(connection,
+                                              pool_size=3,
+                                              max_overflow=0,
+                                              connect_args={'prepared_statement_cache_size': 10,
+                                                            'statement_cache_size': 10,
+                                                            'server_settings': {'statement_timeout': '1500'}})
+    pool_monitor: PoolMonitor = PoolMonitor(engine)
+
+    # Act
+    await warm_up_pool(engine=engine, connections=3)
+    async with engine.connect() as connection:
+        statement_timeout: str = await connection.scalar(text('SHOW statement_timeout'))
+        stats_during_checkout: dict[str, int] = pool_monitor.stats()
+
+    # Assert
+    stats: dict[str, int] = pool_monitor.stats()
+    assert statement_timeout == '1500ms'
+    assert stats_during_checkout['checked_out'] == 1
+    assert stats['connects'] == 3
+    assert stats['checkouts'] == 4
+    assert stats['max_checked_out'] == 3
+    assert stats['checked_in'] == 3
+    assert stats['checked_out'] == 0
+
+    await engine.dispose()
@@ -0,0 +1,59 @@
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from pytest_mock import MockerFixture
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.api.middlewares import QueryCounterMiddleware
+from app.configs.settings import settings
+from app.db.query_counter import count_queries
+
+
+@pytest.mark.asyncio
+async def test_query_counter_middleware(db: AsyncSession, mocker: MockerFixture):
+    # Arrange
+    app = FastAPI()
+    app.add_middleware(QueryCounterMiddleware)
+
+    async def get_test_db() -> AsyncSession:
+        yield db
+
+    @app.get('/queries/{count}')
+    async def run_queries(count: int, session: AsyncSession = Depends(get_test_db)) -> int:
+        for _ in range(count):
+            await session.execute(text('SELECT 1'))
+        return count
+
+    mocker.patch.object(settings, 'query_count_warning_threshold', 2)
+    logger_mock = mocker.patch('app.api.middlewares.logger')
+
+    # Act
+    async with AsyncClient(transport=ASGITransport(app=app), base_url='http://test') as client:
+        response_below = await client.get('/queries/2')
+        response_above = await client.get('/queries/3')
+
+    # Assert
+    assert response_below.headers['Server-Timing'].startswith('db;desc="2 queries";dur=')
+    assert response_above.headers['Server-Timing'].startswith('db;desc="3 queries";dur=')
+    logger_mock.warning.assert_called_once()
+    assert logger_mock.warning.call_args.args[0].startswith('GET /queries/3 executed 3 queries')
+    assert logger_mock.warning.call_args.args[0].endswith('1 statements were repeated 3 times')
+
+
+@pytest.mark.asyncio
+async def test_query_counter_failed_statement(db: AsyncSession):
+    # Arrange
+    connection: AsyncConnection = await db.connection()
+
+    # Act
+    with count_queries() as query_stats:
+        with pytest.raises(DBAPIError):
+            await db.execute(text('SELECT 1 / 0'))
+        query_start: list[float] = list(connection.sync_connection.info['query_start'])
+        await db.rollback()
+
+    # Assert
+    assert query_start == []
+    assert query_stats.count == 0
@@ -0,0 +1,54 @@
+from unittest.mock import patch
+
+from app.utils.cache import LRUTTLCache
+
+
+def test_get_set():
+    cache: LRUTTLCache[str, int] = LRUTTLCache(maxsize=2, ttl=60)
+
+    cache.set('a', 1)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.stats() == {'size': 1, 'maxsize': 2, 'hits': 1, 'misses': 1}
+
+
+def test_lru_eviction():
+    cache: LRUTTLCache[str, int] = LRUTTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+
+    cache.set('c', 3)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+
+def test_ttl_expiration():
+    cache: LRUTTLCache[str, int] = LRUTTLCache(maxsize=10, ttl=60)
+    with patch('app.utils.cache.time.monotonic', return_value=1000):
+        cache.set('a', 1)
+        cache.set('b', 2, ttl=10)
+        cache.set('c', 3, ttl=0)
+
+    with patch('app.utils.cache.time.monotonic', return_value=1030):
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        assert cache.get('c') is None
+
+    with patch('app.utils.cache.time.monotonic', return_value=1061):
+        assert cache.get('a') is None
+
+    assert cache.stats()['size'] == 0
+
+
+def test_pop():
+    cache: LRUTTLCache[str, int] = LRUTTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+
+    cache.pop('a')
+    cache.pop('b')
+
+    assert cache.get('a') is None
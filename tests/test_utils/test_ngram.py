@@ -0,0 +1,13 @@
+from app.utils.ngram import similarity, word_trigrams
+
+
+def test_word_trigrams():
+    assert word_trigrams('Cat') == {'  c', ' ca', 'cat', 'at '}
+    assert word_trigrams('a-b') == {'  a', ' a ', '  b', ' b '}
+
+
+def test_similarity():
+    assert similarity('Food', 'food') == 1
+    assert similarity('Fast food', 'food') == 5 / 9
+    assert similarity('Cat', 'dog') == 0
+    assert similarity('', '') == 0
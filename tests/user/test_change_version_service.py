@@ -0,0 +1,69 @@
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.accounting.category import Category, CategoryCreateRequest, CategoryType, CategoryUpdate
+from app.services.accounting import category_service
+from app.services.user import change_version_service
+
+
+@pytest.mark.asyncio
+async def test_increment(db: AsyncSession):
+    # Arrange
+    user_id: UUID = uuid4()
+    other_user_id: UUID = uuid4()
+
+    # Act
+    version_initial: int = await change_version_service.get_version(db=db, user_id=user_id)
+    await change_version_service.increment(db=db, user_ids=[user_id, other_user_id, user_id])
+    await change_version_service.increment(db=db, user_ids=[user_id])
+    await db.commit()
+
+    # Assert
+    assert version_initial == 0
+    assert await change_version_service.get_version(db=db, user_id=user_id) == 2
+    assert await change_version_service.get_version(db=db, user_id=other_user_id) == 1
+
+
+@pytest.mark.asyncio
+async def test_services_increment_version(db: AsyncSession):
+    # Arrange
+    user_id: UUID = uuid4()
+    create_data: CategoryCreateRequest = CategoryCreateRequest(name='Category 1', type=CategoryType.GENERAL)
+
+    # Act
+    category: Category = await category_service.create_category(db=db, create_data=create_data, user_id=user_id)
+    version_created: int = await change_version_service.get_version(db=db, user_id=user_id)
+    await category_service.update_category(db=db,
+                                           category_id=category.id,
+                                           update_data=CategoryUpdate(name='Category 2', type=CategoryType.GENERAL),
+                                           user_id=user_id)
+    version_updated: int = await change_version_service.get_version(db=db, user_id=user_id)
+
+    # Assert
+    assert version_created == 1
+    assert version_updated == 2
+
+
+def test_etag():
+    # Arrange
+    user_id: UUID = uuid4()
+
+    # Act
+    etag: str = change_version_service.build_etag(user_id=user_id, version=1, key='/accounting/accounts?[]')
+    etag_same: str = change_version_service.build_etag(user_id=user_id, version=1, key='/accounting/accounts?[]')
+    etag_changed: str = change_version_service.build_etag(user_id=user_id, version=2, key='/accounting/accounts?[]')
+    etag_other_key: str = change_version_service.build_etag(user_id=user_id, version=1, key='/accounting/locations?[]')
+
+    # Assert
+    assert etag.startswith('W/"')
+    assert etag == etag_same
+    assert etag != etag_changed
+    assert etag != etag_other_key
+
+    assert change_version_service.etag_matches(etag=etag, if_none_match=etag)
+    assert change_version_service.etag_matches(etag=etag, if_none_match=f'{etag_changed}, {etag.removeprefix("W/")}')
+    assert change_version_service.etag_matches(etag=etag, if_none_match='*')
+    assert not change_version_service.etag_matches(etag=etag, if_none_match=etag_changed)
+    assert not change_version_service.etag_matches(etag=etag, if_none_match=None)
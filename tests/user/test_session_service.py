@@ -1,10 +1,12 @@
 from datetime import datetime, timedelta
+from uuid import uuid4
 
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.user.session import user_session_crud
 from app.crud.user.user import user_crud
+from app.exceptions.unauthorized_401 import SessionExpiredException
 from app.models.user.session import Session as SessionModel
 from app.models.user.user import User as UserModel
 from app.schemas.base import CurrencyType
@@ -37,3 +39,67 @@ async def test_revoke_session_ok(db: AsyncSession):
 
     assert user_session_revoked.expires_at <= datetime.now()
     assert user_session_revoked.expires_at <= user_session_db.expires_at
+
+
+@pytest.mark.asyncio
+async def test_get_user_id_cached(db: AsyncSession):
+    # Arrange
+    user_create = UserCreate(username='test',
+                             registration_provider=ProviderType.TELEGRAM,
+                             base_currency=CurrencyType.USD)
+    user_db: UserModel = await user_crud.create(db=db, obj_in=user_create, commit=True)
+    user_session_create = UserSessionCreate(user_id=user_db.id,
+                                            expires_at=datetime.now() + timedelta(days=7),
+                                            provider=ProviderType.TELEGRAM)
+    user_session_db: SessionModel = await user_session_crud.create(db=db, obj_in=user_session_create,
+                                                                   commit=True)
+    stats_before: dict[str, int] = session_service.session_cache.stats()
+
+    # Act
+    user_id_first = await session_service.get_user_id(db=db, token=user_session_db.id)
+    user_id_second = await session_service.get_user_id(db=db, token=user_session_db.id)
+
+    # Assert
+    assert user_id_first == user_db.id
+    assert user_id_second == user_db.id
+    stats: dict[str, int] = session_service.session_cache.stats()
+    assert stats['misses'] - stats_before['misses'] == 1
+    assert stats['hits'] - stats_before['hits'] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_user_id_revoked(db: AsyncSession):
+    # Arrange
+    user_create = UserCreate(username='test',
+                             registration_provider=ProviderType.TELEGRAM,
+                             base_currency=CurrencyType.USD)
+    user_db: UserModel = await user_crud.create(db=db, obj_in=user_create, commit=True)
+    user_session_create = UserSessionCreate(user_id=user_db.id,
+                                            expires_at=datetime.now() + timedelta(days=7),
+                                            provider=ProviderType.TELEGRAM)
+    user_session_db: SessionModel = await user_session_crud.create(db=db, obj_in=user_session_create,
+                                                                   commit=True)
+    await session_service.get_user_id(db=db, token=user_session_db.id)
+
+    # Act
+    await session_service.revoke_session(db=db, token=user_session_db.id)
+    user_id_before_commit = session_service.session_cache.get(user_session_db.id)
+    await db.commit()
+
+    # Assert
+    assert user_id_before_commit == user_db.id
+    with pytest.raises(SessionExpiredException):
+        await session_service.get_user_id(db=db, token=user_session_db.id)
+
+
+@pytest.mark.asyncio
+async def test_get_user_id_not_found(db: AsyncSession):
+    # Arrange
+    token = uuid4()
+
+    # Act
+    with pytest.raises(SessionExpiredException) as exc:
+        await session_service.get_user_id(db=db, token=token)
+
+    # Assert
+    assert exc.value.log_message == f'Session with token `{token}` expired'
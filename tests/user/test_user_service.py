@@ -1,12 +1,18 @@
+from uuid import UUID, uuid4
+
 import pytest
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.user.user import user_crud
 from app.models.user.user import User as UserModel
 from app.schemas.base import CurrencyType
 from app.schemas.user.external_user import ProviderType
-from app.schemas.user.user import UserCreate
+from app.exceptions.not_fount_404 import EntityNotFound
+from app.schemas.user.user import UserCreate, UserProfile
+from app.services.user import user_service
 from app.services.user.user_service import get_user_base_currency
+from tests.helpers import assert_query_count
 
 
 @pytest.mark.asyncio
@@ -23,3 +29,58 @@ async def test_get_user_base_currency(db: AsyncSession):
 
     # Assert
     assert base_currency == CurrencyType.USD
+
+
+@pytest.mark.asyncio
+async def test_get_user_profile_cached(db: AsyncSession):
+    # Arrange
+    user_create_data: UserCreate = UserCreate(username='test',
+                                              registration_provider=ProviderType.TELEGRAM,
+                                              base_currency=CurrencyType.USD)
+    user_db: UserModel = await user_crud.create(db=db, obj_in=user_create_data, commit=True)
+
+    # Act
+    with assert_query_count(1):
+        profile_first: UserProfile = await user_service.get_user_profile(db=db, user_id=user_db.id)
+        profile_second: UserProfile = await user_service.get_user_profile(db=db, user_id=user_db.id)
+
+    # Assert
+    assert profile_first == profile_second
+    assert profile_first.id == user_db.id
+    assert profile_first.username == user_create_data.username
+    assert profile_first.base_currency == CurrencyType.USD
+
+
+@pytest.mark.asyncio
+async def test_invalidate_user_profile(db: AsyncSession):
+    # Arrange
+    user_create_data: UserCreate = UserCreate(username='test',
+                                              registration_provider=ProviderType.TELEGRAM,
+                                              base_currency=CurrencyType.USD)
+    user_db: UserModel = await user_crud.create(db=db, obj_in=user_create_data, commit=True)
+    await get_user_base_currency(db=db, user_id=user_db.id)
+    await db.execute(update(UserModel).where(UserModel.id == user_db.id).values(base_currency=CurrencyType.EUR))
+    await db.commit()
+    base_currency_stale: CurrencyType = await get_user_base_currency(db=db, user_id=user_db.id)
+
+    # Act
+    user_service.invalidate_user_profile(user_db.id)
+    base_currency: CurrencyType = await get_user_base_currency(db=db, user_id=user_db.id)
+
+    # Assert
+    assert base_currency_stale == CurrencyType.USD
+    assert base_currency == CurrencyType.EUR
+
+
+@pytest.mark.asyncio
+async def test_get_user_profile_not_found(db: AsyncSession):
+    # Arrange
+    user_id: UUID = uuid4()
+
+    # Act
+    with pytest.raises(EntityNotFound) as exc:
+        await user_service.get_user_profile(db=db, user_id=user_id)
+
+    # Assert
+    search_params: dict = {'id': user_id}
+    assert exc.value.log_message == f'{UserModel.__name__} not found by {search_params}'